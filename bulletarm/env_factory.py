@@ -26,7 +26,7 @@ def getEnvFn(env_type):
   else:
     raise ValueError('Invalid environment type passed to factory. No env for {}'.format(env_type))
 
-def createEnvs(num_processes, env_type, env_config={}, planner_config={}):
+def createEnvs(num_processes, env_type, env_config={}, planner_config={}, runner_config={}):
   '''
   Wrapper function to create either a single env the the main process or some
   number of envs each in their own seperate process.
@@ -36,6 +36,7 @@ def createEnvs(num_processes, env_type, env_config={}, planner_config={}):
     env_type (str): The type of environment to create
     env_config (dict): Intialization arguments for the env
     planner_config (dict): Intialization arguments for the planner
+    runner_config (dict): Intialization arguments for the MultiRunner. Ignored for a single env.
 
   Returns:
     EnvRunner: SingleRunner or MultiRunner containing the environment
@@ -43,7 +44,7 @@ def createEnvs(num_processes, env_type, env_config={}, planner_config={}):
   if num_processes == 0:
     return createSingleProcessEnv(env_type, env_config, planner_config)
   else:
-    return createMultiprocessEnvs(num_processes, env_type, env_config, planner_config)
+    return createMultiprocessEnvs(num_processes, env_type, env_config, planner_config, runner_config)
 
 def createSingleProcessEnv(env_type, env_config={}, planner_config={}):
   '''
@@ -70,7 +71,7 @@ def createSingleProcessEnv(env_type, env_config={}, planner_config={}):
   planner = getPlannerFn(env_type, planner_config)(env)
   return SingleRunner(env, planner)
 
-def createMultiprocessEnvs(num_processes, env_type, env_config={}, planner_config={}):
+def createMultiprocessEnvs(num_processes, env_type, env_config={}, planner_config={}, runner_config={}):
   '''
   Create a number of environments on different processes to run in parralel
 
@@ -79,10 +80,17 @@ def createMultiprocessEnvs(num_processes, env_type, env_config={}, planner_confi
     env_type (str): The type of environment to create
     env_config (dict): Intialization arguments for the env
     planner_config (dict): Intialization arguments for the planner
+    runner_config (dict): Intialization arguments for the MultiRunner, e.g. {'shared_memory': True, 'envs_per_worker': 2, 'reset_ahead': True}
 
   Returns:
     MultiRunner: MultiRunner containing all environments
   '''
+  # The spare copies of reset_ahead would open a second GUI connection in the worker
+  if runner_config.get('reset_ahead', False):
+    configs = env_config if env_type == 'multi_task' else [env_config]
+    if any(config.get('render', False) for config in configs):
+      raise ValueError('The reset_ahead runner does not support rendering.')
+
   # Clone env config and set seeds for the different processes
   env_configs = [copy.deepcopy(env_config) for _ in range(num_processes)]
   for i, env_config in enumerate(env_configs):
@@ -100,4 +108,4 @@ def createMultiprocessEnvs(num_processes, env_type, env_config={}, planner_confi
     return _thunk
   envs = [getEnv(env_configs[i]) for i in range(num_processes)]
   planners = [getPlannerFn(env_type, planner_config) for i in range(num_processes)]
-  return MultiRunner(envs, planners)
+  return MultiRunner(envs, planners, **runner_config)
@@ -7,8 +7,6 @@ import pickle
 import copy
 import numpy as np
 import numpy.random as npr
-from scipy.ndimage import median_filter
-import skimage.transform as sk_transform
 
 import pybullet as pb
 import pybullet_data
@@ -22,9 +20,15 @@ from bulletarm.pybullet.robots.ur5_robotiq import UR5_Robotiq
 from bulletarm.pybullet.robots.kuka import Kuka
 from bulletarm.pybullet.robots.panda import Panda
 from bulletarm.pybullet.utils.sensor import Sensor
+from bulletarm.pybullet.utils.object_pool import ObjectPool
+from bulletarm.pybullet.utils.heightmap_rasterizer import HeightmapRasterizer
+from bulletarm.pybullet.utils.in_hand_projection import InHandProjector
+from bulletarm.pybullet.utils.patch_extraction import PatchExtractor
+from bulletarm.pybullet.utils.shape_cache import clearShapeCache
 from bulletarm.pybullet.objects.pybullet_object import PybulletObject
 import bulletarm.pybullet.utils.object_generation as pb_obj_generation
 from bulletarm.pybullet.utils.constants import NoValidPositionException
+from bulletarm.pybullet.utils import pybullet_util
 
 class BaseEnv:
   '''
@@ -50,6 +54,8 @@ class BaseEnv:
     self.heightmap_size = config['obs_size']
     self.in_hand_size = config['in_hand_size']
     self.in_hand_mode = config['in_hand_mode']
+    self.patch_extractor = PatchExtractor(self.in_hand_size)
+    self.in_hand_projector = InHandProjector(self.in_hand_size) if self.in_hand_mode.find('proj') > -1 else None
     self.heightmap_shape = (self.heightmap_size, self.heightmap_size, 1)
     self.heightmap_resolution = self.workspace_size / self.heightmap_size
 
@@ -94,7 +100,9 @@ class BaseEnv:
       #     cameraTargetPosition=[0, 0, 0])
     else:
       self.client = pb.connect(pb.DIRECT)
-    pb.setAdditionalSearchPath(pybullet_data.getDataPath())
+    # All pybullet calls are routed to this env's physics client so that several envs can share a process
+    self.client_id = self.client
+    pb.setAdditionalSearchPath(pybullet_data.getDataPath(), physicsClientId=self.client_id)
 
     # Environment specific variables
     self.dynamic = not config['fast_mode']
@@ -102,13 +110,13 @@ class BaseEnv:
 
     # Setup robot
     if config['robot'] == 'ur5':
-      self.robot = UR5_Simple()
+      self.robot = UR5_Simple(client_id=self.client_id)
     elif config['robot'] == 'ur5_robotiq':
-      self.robot = UR5_Robotiq()
+      self.robot = UR5_Robotiq(client_id=self.client_id)
     elif config['robot'] == 'kuka':
-      self.robot = Kuka()
+      self.robot = Kuka(client_id=self.client_id)
     elif config['robot'] == 'panda':
-      self.robot = Panda()
+      self.robot = Panda(client_id=self.client_id)
     else:
       raise NotImplementedError
 
@@ -148,7 +156,15 @@ class BaseEnv:
     cam_pos = [self.workspace[0].mean(), self.workspace[1].mean(), 10]
     target_pos = [self.workspace[0].mean(), self.workspace[1].mean(), 0]
     cam_up_vector = [-1, 0, 0]
-    self.sensor = Sensor(cam_pos, cam_up_vector, target_pos, ws_size, cam_pos[2] - 1, cam_pos[2])
+    self.sensor = Sensor(cam_pos, cam_up_vector, target_pos, ws_size, cam_pos[2] - 1, cam_pos[2],
+                         client_id=self.client_id)
+    assert config['heightmap_backend'] in ['camera', 'analytic']
+    self.heightmap_rasterizer = None
+    if config['heightmap_backend'] == 'analytic':
+      self.heightmap_rasterizer = HeightmapRasterizer(self.workspace, self.heightmap_size, cam_pos[2],
+                                                      client_id=self.client_id)
+    assert config['obs_dtype'] in ['float64', 'float32', 'float16', 'uint16', 'uint8']
+    self.obs_dtype = config['obs_dtype']
 
     # Rest pose for arm
     rot = pb.getQuaternionFromEuler([0, np.pi, 0])
@@ -169,6 +185,14 @@ class BaseEnv:
     self.reward_type = config['reward_type']
     self.object_type = config['object_type']
     self.hard_reset_freq = config['hard_reset_freq']
+    self.scene_template = config['scene_template']
+    self.object_pool = ObjectPool(self.client_id) if config['object_pool'] else None
+    assert config['settle_mode'] in ['fixed', 'adaptive']
+    self.settle_mode = config['settle_mode']
+    self.settle_velocity_threshold = config['settle_velocity_threshold']
+    self.settle_chunk = config['settle_chunk']
+    self.settle_max_steps = config['settle_max_steps']
+    self.body_sleeping = config['body_sleeping']
     self.min_object_distance = config['min_object_distance']
     self.min_boarder_padding = config['min_boarder_padding']
     self.deconstruct_init_offset = config['deconstruct_init_offset']
@@ -183,6 +207,16 @@ class BaseEnv:
       raise NotImplementedError
 
     self.robot.adjust_gripper_after_lift = config['adjust_gripper_after_lift']
+    self.robot.motion_chunk = config['motion_chunk']
+    self.robot.ik_cache_size = config['ik_cache_size']
+    self.robot.ik_cache_resolution = config['ik_cache_resolution']
+    self.robot.ik_cache_joint_tolerance = config['ik_cache_joint_tolerance']
+    self.robot.gripper_max_it = config['gripper_max_steps']
+    self.robot.gripper_chunk = config['gripper_chunk']
+    self.robot.gripper_force_th = config['gripper_force_threshold']
+    assert config['primitive_mode'] in ['dynamic', 'kinematic']
+    assert config['primitive_mode'] == 'dynamic' or not config['simulate_grasp']
+    self.robot.primitive_mode = config['primitive_mode']
     if config['robot'] == 'kuka':
       self.robot.adjust_gripper_offset = config['kuka_adjust_gripper_offset']
 
@@ -194,41 +228,50 @@ class BaseEnv:
     self.last_obj = None
     self.state = {}
     self.pb_state = None
+    self.template_state = None
+    self.template_num_bodies = 0
+    self.pose_snapshot = None
+    self.pose_snapshot_key = None
 
   def initialize(self):
     '''
     Initialize the pybullet world.
     '''
-    pb.resetSimulation()
+    pb.resetSimulation(physicsClientId=self.client_id)
+    pybullet_util.markWorldChanged(self.client_id)
+    clearShapeCache(self.client_id)
+    self.template_state = None
+    if self.object_pool is not None:
+      self.object_pool.clear()
     pb.setPhysicsEngineParameter(numSubSteps=0,
                                  numSolverIterations=self.num_solver_iterations,
                                  solverResidualThreshold=self.solver_residual_threshold,
-                                 constraintSolverType=pb.CONSTRAINT_SOLVER_LCP_SI)
-    pb.setTimeStep(self._timestep)
-    pb.setGravity(0, 0, -10)
+                                 constraintSolverType=pb.CONSTRAINT_SOLVER_LCP_SI, physicsClientId=self.client_id)
+    pb.setTimeStep(self._timestep, physicsClientId=self.client_id)
+    pb.setGravity(0, 0, -10, physicsClientId=self.client_id)
 
     # TODO: These might have to be in the config depending on how they effect the solver_residual_threshold
     if self.white_plane:
-      self.table_id = pb.loadURDF(os.path.join(constants.URDF_PATH, 'white_plane.urdf'), [0,0,0])
+      self.table_id = pb.loadURDF(os.path.join(constants.URDF_PATH, 'white_plane.urdf'), [0,0,0], physicsClientId=self.client_id)
     else:
-      self.table_id = pb.loadURDF('plane.urdf', [0, 0, 0])
+      self.table_id = pb.loadURDF('plane.urdf', [0, 0, 0], physicsClientId=self.client_id)
     if self.trans_plane:
-      pb.changeVisualShape(self.table_id, -1, rgbaColor=[0, 0, 0, 0])
-    pb.changeDynamics(self.table_id, -1, linearDamping=0.04, angularDamping=0.04, restitution=0, contactStiffness=3000, contactDamping=100)
+      pb.changeVisualShape(self.table_id, -1, rgbaColor=[0, 0, 0, 0], physicsClientId=self.client_id)
+    pb.changeDynamics(self.table_id, -1, linearDamping=0.04, angularDamping=0.04, restitution=0, contactStiffness=3000, contactDamping=100, physicsClientId=self.client_id)
 
     if self.black_workspace:
-      ws_visual = pb.createVisualShape(pb.GEOM_BOX, halfExtents=[self.workspace_size/2, self.workspace_size/2, 0.001], rgbaColor=[0.2, 0.2, 0.2, 1])
+      ws_visual = pb.createVisualShape(pb.GEOM_BOX, halfExtents=[self.workspace_size/2, self.workspace_size/2, 0.001], rgbaColor=[0.2, 0.2, 0.2, 1], physicsClientId=self.client_id)
       ws_id = pb.createMultiBody(baseMass=0,
                                  baseVisualShapeIndex=ws_visual,
                                  basePosition=[self.workspace[0].mean(), self.workspace[1].mean(), 0],
-                                 baseOrientation=[0, 0, 0, 1])
+                                 baseOrientation=[0, 0, 0, 1], physicsClientId=self.client_id)
 
     # Load the UR5 and set it to the home positions
     self.robot.initialize()
     if self.trans_robot:
       for i in range(-1, 9):
-        pb.changeVisualShape(self.robot.id, i, rgbaColor=[1, 1, 1, 0])
-      pb.changeVisualShape(self.robot.id, 11, rgbaColor=[1, 1, 1, 0])
+        pb.changeVisualShape(self.robot.id, i, rgbaColor=[1, 1, 1, 0], physicsClientId=self.client_id)
+      pb.changeVisualShape(self.robot.id, 11, rgbaColor=[1, 1, 1, 0], physicsClientId=self.client_id)
     # Reset episode vars
     self.objects = list()
     self.object_types = {}
@@ -238,7 +281,7 @@ class BaseEnv:
     self.last_action = None
 
     # Step simulation
-    pb.stepSimulation()
+    pybullet_util.stepSimulation(self.client_id)
 
   def resetPybulletWorkspace(self):
     '''
@@ -246,13 +289,23 @@ class BaseEnv:
     '''
     # soft reset has bug in older pybullet versions. 2.7,1 works good
     self.episode_count += 1
+    self.robot.detachObj()
     if self.episode_count % self.hard_reset_freq == 0:
       self.initialize()
       self.episode_count = 0
+      if self.scene_template:
+        self._saveSceneTemplate()
     else:
       for o in self.objects:
-        pb.removeBody(o.object_id)
-      self.robot.reset()
+        if self.object_pool is None or not self.object_pool.release(o):
+          pb.removeBody(o.object_id, physicsClientId=self.client_id)
+      if self.scene_template and self._restoreSceneTemplate():
+        self.robot.restoreHome()
+      else:
+        self.robot.reset()
+        # Newly parked pool bodies change the world, so the template is taken again once the robot is home
+        if self.scene_template and self.object_pool is not None:
+          self._saveSceneTemplate()
       self.objects = list()
       self.object_types = {}
       self.heightmap = None
@@ -270,7 +323,33 @@ class BaseEnv:
       else:
         break
 
-    pb.stepSimulation()
+    pybullet_util.stepSimulation(self.client_id)
+
+  def _saveSceneTemplate(self):
+    '''
+    Snapshot the current world, which should only contain the robot and the static equipment, so that it
+    can be restored by the following resets.
+    '''
+    self.template_state = pb.saveState(physicsClientId=self.client_id)
+    self.template_num_bodies = pb.getNumBodies(physicsClientId=self.client_id)
+
+  def _restoreSceneTemplate(self):
+    '''
+    Restore the scene template. The template can only be restored if the world contains the same bodies
+    as when it was saved. The robot motor commands are not part of the template and need to be resent.
+
+    Returns:
+      bool: True if the template was restored, False otherwise
+    '''
+    if self.template_state is None or pb.getNumBodies(physicsClientId=self.client_id) != self.template_num_bodies:
+      return False
+    try:
+      pb.restoreState(self.template_state, physicsClientId=self.client_id)
+    except pb.error:
+      self.template_state = None
+      return False
+    pybullet_util.markWorldChanged(self.client_id)
+    return True
 
   def reset(self):
     '''
@@ -294,7 +373,7 @@ class BaseEnv:
       - done: Bool flag indicating if the episode is done
     '''
     self.takeAction(action)
-    self.wait(100)
+    self.settle(100)
     obs = self._getObservation(action)
     done = self._checkTermination()
     reward = 1.0 if done else 0.0
@@ -336,8 +415,8 @@ class BaseEnv:
       raise ValueError('Bad motion primative supplied for action.')
 
   def isSimValid(self):
-    for obj in self.objects:
-      p = obj.getPosition()
+    positions = self.getObjectPoseSnapshot()[:, :3]
+    for obj, p in zip(self.objects, positions):
       if not self.check_random_obj_valid and self.object_types[obj] == constants.RANDOM:
         continue
       if self._isObjectHeld(obj):
@@ -367,7 +446,37 @@ class BaseEnv:
     return True
 
   def wait(self, iteration):
-    [pb.stepSimulation() for _ in range(iteration)]
+    [pybullet_util.stepSimulation(self.client_id) for _ in range(iteration)]
+
+  def settle(self, max_iteration):
+    '''
+    Step the simulation until the objects come to rest. In the 'fixed' settle mode this is wait(max_iteration). In the
+    'adaptive' mode the simulation is stepped in chunks of settle_chunk steps and stops as soon as the linear and
+    angular velocities of all objects are below settle_velocity_threshold. The object held by the gripper sways with
+    the arm and is left out.
+
+    Args:
+      max_iteration (int): The maximum number of simulation steps, overridden by the settle_max_steps config
+
+    Returns:
+      int: The number of simulation steps
+    '''
+    if self.settle_max_steps is not None:
+      max_iteration = self.settle_max_steps
+    if self.settle_mode == 'fixed':
+      self.wait(max_iteration)
+      return max_iteration
+
+    iteration = 0
+    while iteration < max_iteration:
+      chunk = min(self.settle_chunk, max_iteration - iteration)
+      self.wait(chunk)
+      iteration += chunk
+      velocities = np.array([pb.getBaseVelocity(obj.object_id, physicsClientId=self.client_id)
+                             for obj in self.objects if not self._isObjectHeld(obj)]).reshape(-1)
+      if np.all(np.abs(velocities) < self.settle_velocity_threshold):
+        break
+    return iteration
 
   def didBlockFall(self):
     if self.last_action is None:
@@ -396,57 +505,99 @@ class BaseEnv:
       motion_primative, x, y, z, rot = self._decodeAction(action)
       in_hand_img = self.getInHandImage(old_heightmap, x, y, z, rot, self.heightmap)
 
-    return self._isHolding(), in_hand_img, self.heightmap.reshape([1, self.heightmap_size, self.heightmap_size])
+    return self._isHolding(), in_hand_img, \
+           self._castObservation(self.heightmap.reshape([1, self.heightmap_size, self.heightmap_size]))
+
+  def _castObservation(self, obs):
+    '''
+    Convert a pixel observation to obs_dtype. The integer dtypes store the heights in units of
+    constants.OBS_DTYPE_SCALE: heights below 0 are stored as 0, heights above 0.4m (uint8) or 0.65m (uint16) saturate.
+
+    Args:
+      obs (numpy.array): The float observation
+
+    Returns:
+      numpy.array: The observation in obs_dtype
+    '''
+    if self.obs_dtype in constants.OBS_DTYPE_SCALE:
+      scale = constants.OBS_DTYPE_SCALE[self.obs_dtype]
+      max_value = np.iinfo(self.obs_dtype).max
+      return np.clip(np.round(obs / scale), 0, max_value).astype(self.obs_dtype)
+    return obs.astype(self.obs_dtype, copy=False)
 
   def _getHeightmap(self):
+    if self.heightmap_rasterizer is not None and \
+       self.heightmap_rasterizer.canRasterize(self.objects, ignore_ids=[self.table_id]):
+      return self.heightmap_rasterizer.getHeightmap(self.objects)
     return self.sensor.getHeightmap(self.heightmap_size)
 
   def _getValidPositions(self, border_padding, min_distance, existing_positions, num_shapes, sample_range=None):
-    existing_positions_copy = copy.deepcopy(existing_positions)
-    sample_range = copy.deepcopy(sample_range)
+    '''
+    Sample xy positions within the valid space which are further than min_distance from the existing positions
+    and from each other.
+
+    Up to 100 candidates are drawn at once for each shape and checked against all the existing positions in a
+    single distance computation. The first valid candidate is kept and the random state is rewound so only the
+    draws up to that candidate are consumed, i.e. the result is the same as drawing the candidates one by one.
+
+    Args:
+      border_padding (float): Distance from the edge of the valid space the positions must keep
+      min_distance (float): Minimum distance between the positions
+      existing_positions (list[list[float]]): The xy positions to keep away from
+      num_shapes (int): The number of positions to sample
+      sample_range (list[list[float]]): Optional xy range to sample the positions from. Defaults to None.
+
+    Returns:
+      list[list[float]]: The sampled positions
+
+    Raises:
+      NoValidPositionException: If no valid position was found for one of the shapes
+    '''
+    num_tries = 100
+    valid_space = self.getValidSpace()
+    x_extents = valid_space[0][1] - valid_space[0][0]
+    y_extents = valid_space[1][1] - valid_space[1][0]
+    if sample_range:
+      sample_range = copy.deepcopy(sample_range)
+      sample_range[0][0] = max(sample_range[0][0], valid_space[0][0]+border_padding/2)
+      sample_range[0][1] = min(sample_range[0][1], valid_space[0][1]-border_padding/2)
+      sample_range[1][0] = max(sample_range[1][0], valid_space[1][0]+border_padding/2)
+      sample_range[1][1] = min(sample_range[1][1], valid_space[1][1]-border_padding/2)
+
+    existing = np.array(existing_positions, dtype=float).reshape(-1, 2)
     valid_positions = list()
     for i in range(num_shapes):
-      # Generate random drop config
-      x_extents = self.getValidSpace()[0][1] - self.getValidSpace()[0][0]
-      y_extents = self.getValidSpace()[1][1] - self.getValidSpace()[1][0]
-
-      is_position_valid = False
-      for j in range(100):
-        if is_position_valid:
-          break
-        if sample_range:
-          sample_range[0][0] = max(sample_range[0][0], self.getValidSpace()[0][0]+border_padding/2)
-          sample_range[0][1] = min(sample_range[0][1], self.getValidSpace()[0][1]-border_padding/2)
-          sample_range[1][0] = max(sample_range[1][0], self.getValidSpace()[1][0]+border_padding/2)
-          sample_range[1][1] = min(sample_range[1][1], self.getValidSpace()[1][1]-border_padding/2)
-          position = [(sample_range[0][1] - sample_range[0][0]) * npr.random_sample() + sample_range[0][0],
-                      (sample_range[1][1] - sample_range[1][0]) * npr.random_sample() + sample_range[1][0]]
-        else:
-          position = [(x_extents - border_padding) * npr.random_sample() + self.getValidSpace()[0][0] + border_padding / 2,
-                      (y_extents - border_padding) * npr.random_sample() + self.getValidSpace()[1][0] +  border_padding / 2]
-
-        if self.pos_candidate is not None:
-          position[0] = self.pos_candidate[0][np.abs(self.pos_candidate[0] - position[0]).argmin()]
-          position[1] = self.pos_candidate[1][np.abs(self.pos_candidate[1] - position[1]).argmin()]
-          if not (self.getValidSpace()[0][0]+border_padding/2 < position[0] < self.getValidSpace()[0][1]-border_padding/2 and
-                  self.getValidSpace()[1][0]+border_padding/2 < position[1] < self.getValidSpace()[1][1]-border_padding/2):
-            continue
-
-        if existing_positions_copy:
-          distances = np.array(list(map(lambda p: np.linalg.norm(np.array(p)-position), existing_positions_copy)))
-          is_position_valid = np.all(distances > min_distance)
-          # is_position_valid = np.all(np.sum(np.abs(np.array(positions) - np.array(position[:-1])), axis=1) > min_distance)
-        else:
-          is_position_valid = True
-      if is_position_valid:
-        existing_positions_copy.append(position)
-        valid_positions.append(position)
+      rng_state = npr.get_state()
+      samples = npr.random_sample((num_tries, 2))
+      if sample_range:
+        candidates = np.stack([(sample_range[0][1] - sample_range[0][0]) * samples[:, 0] + sample_range[0][0],
+                               (sample_range[1][1] - sample_range[1][0]) * samples[:, 1] + sample_range[1][0]], 1)
       else:
-        break
-    if len(valid_positions) == num_shapes:
-      return valid_positions
-    else:
-      raise NoValidPositionException
+        candidates = np.stack([(x_extents - border_padding) * samples[:, 0] + valid_space[0][0] + border_padding / 2,
+                               (y_extents - border_padding) * samples[:, 1] + valid_space[1][0] + border_padding / 2], 1)
+
+      is_valid = np.ones(num_tries, dtype=bool)
+      if self.pos_candidate is not None:
+        for axis in range(2):
+          snap_idx = np.abs(self.pos_candidate[axis][None, :] - candidates[:, axis:axis+1]).argmin(1)
+          candidates[:, axis] = self.pos_candidate[axis][snap_idx]
+          is_valid &= (valid_space[axis][0]+border_padding/2 < candidates[:, axis]) & \
+                      (candidates[:, axis] < valid_space[axis][1]-border_padding/2)
+
+      if existing.shape[0]:
+        distances = np.linalg.norm(existing[None, :, :] - candidates[:, None, :], axis=2)
+        is_valid &= np.all(distances > min_distance, axis=1)
+
+      if not is_valid.any():
+        raise NoValidPositionException
+      first_valid = is_valid.argmax()
+      npr.set_state(rng_state)
+      npr.random_sample((first_valid + 1, 2))
+
+      position = candidates[first_valid].tolist()
+      existing = np.concatenate((existing, candidates[first_valid:first_valid+1]))
+      valid_positions.append(position)
+    return valid_positions
 
   def _getValidOrientation(self, random_orientation):
     if random_orientation:
@@ -549,57 +700,74 @@ class BaseEnv:
       if not scale:
         scale = npr.choice(np.arange(self.block_scale_range[0], self.block_scale_range[1]+0.01, 0.02))
 
+      # Reuse a parked body if the pool has one for this shape, model and scale
+      obj_model_id, pool_key = model_id, None
+      if self.object_pool is not None and shape_type in pb_obj_generation.POOLED_SHAPES:
+        obj_model_id, pool_key = pb_obj_generation.getPoolKey(shape_type, scale, model_id, z_scale)
+        handle = self.object_pool.acquire(pool_key, position, orientation)
+        if handle is not None:
+          shape_handles.append(handle)
+          continue
+      # model_id is not used by the random shapes unless their model was resolved for the pool
+      index = obj_model_id if pool_key is not None else -1
+
       if shape_type == constants.CUBE:
-        handle = pb_obj_generation.generateCube(position, orientation, scale)
+        handle = pb_obj_generation.generateCube(position, orientation, scale, client_id=self.client_id)
       elif shape_type == constants.BRICK:
-        handle = pb_obj_generation.generateBrick(position, orientation, scale)
+        handle = pb_obj_generation.generateBrick(position, orientation, scale, client_id=self.client_id)
       elif shape_type == constants.TRIANGLE:
-        handle = pb_obj_generation.generateTriangle(position, orientation, scale)
+        handle = pb_obj_generation.generateTriangle(position, orientation, scale, client_id=self.client_id)
       elif shape_type == constants.ROOF:
-        handle = pb_obj_generation.generateRoof(position, orientation, scale)
+        handle = pb_obj_generation.generateRoof(position, orientation, scale, client_id=self.client_id)
       elif shape_type == constants.CYLINDER:
-        handle = pb_obj_generation.generateCylinder(position, orientation, scale)
+        handle = pb_obj_generation.generateCylinder(position, orientation, scale, client_id=self.client_id)
       elif shape_type == constants.RANDOM:
-        handle = pb_obj_generation.generateRandomObj(position, orientation, scale, z_scale)
+        handle = pb_obj_generation.generateRandomObj(position, orientation, scale, z_scale, client_id=self.client_id, index=index)
       elif shape_type == constants.CUP:
-        handle = pb_obj_generation.generateCup(position, orientation, scale)
+        handle = pb_obj_generation.generateCup(position, orientation, scale, client_id=self.client_id)
       elif shape_type == constants.BOWL:
-        handle = pb_obj_generation.generateBowl(position, orientation, scale)
+        handle = pb_obj_generation.generateBowl(position, orientation, scale, client_id=self.client_id)
       elif shape_type == constants.PLATE:
-        handle = pb_obj_generation.generatePlate(position, orientation, scale, model_id)
+        handle = pb_obj_generation.generatePlate(position, orientation, scale, obj_model_id, client_id=self.client_id)
       elif shape_type == constants.RANDOM_BLOCK:
-        handle = pb_obj_generation.generateRandomBlock(position, orientation, scale)
+        handle = pb_obj_generation.generateRandomBlock(position, orientation, scale, client_id=self.client_id, index=index)
       elif shape_type == constants.RANDOM_HOUSEHOLD:
-        handle = pb_obj_generation.generateRandomHouseHoldObj(position, orientation, scale)
+        handle = pb_obj_generation.generateRandomHouseHoldObj(position, orientation, scale, client_id=self.client_id, index=index)
       elif shape_type == constants.SPOON:
-        handle = pb_obj_generation.generateSpoon(position, orientation, scale)
+        handle = pb_obj_generation.generateSpoon(position, orientation, scale, client_id=self.client_id)
       elif shape_type == constants.BOTTLE:
-        handle = pb_obj_generation.generateBottle(position, orientation, scale)
+        handle = pb_obj_generation.generateBottle(position, orientation, scale, client_id=self.client_id)
       elif shape_type == constants.BOX:
-        handle = pb_obj_generation.generateBox(position, orientation, scale)
+        handle = pb_obj_generation.generateBox(position, orientation, scale, client_id=self.client_id)
       elif shape_type == constants.TEST_TUBE:
-        handle = pb_obj_generation.generateTestTube(position, orientation, scale, model_id=None)
+        handle = pb_obj_generation.generateTestTube(position, orientation, scale, model_id=None, client_id=self.client_id)
       elif shape_type == constants.SWAB:
-        handle = pb_obj_generation.generateSwab(position, orientation, scale, model_id=None)
+        handle = pb_obj_generation.generateSwab(position, orientation, scale, model_id=None, client_id=self.client_id)
       elif shape_type == constants.FLAT_BLOCK:
-        handle = pb_obj_generation.generateFlatBlock(position, orientation, scale)
+        handle = pb_obj_generation.generateFlatBlock(position, orientation, scale, client_id=self.client_id)
       elif shape_type == constants.RANDOM_HOUSEHOLD200:
-        handle = pb_obj_generation.generateRandomHouseHoldObj200(position, orientation, scale, model_id)
+        handle = pb_obj_generation.generateRandomHouseHoldObj200(position, orientation, scale, obj_model_id, client_id=self.client_id)
       elif shape_type == constants.GRASP_NET_OBJ:
-        handle = pb_obj_generation.generateGraspNetObject(position, orientation, scale, model_id)
+        handle = pb_obj_generation.generateGraspNetObject(position, orientation, scale, obj_model_id, client_id=self.client_id)
 
       else:
         raise NotImplementedError
 
       if self.physics_mode == 'slow':
-        pb.changeDynamics(handle.object_id, -1, linearDamping=0.04, angularDamping=0.04, restitution=0, contactStiffness=3000, contactDamping=100)
+        pb.changeDynamics(handle.object_id, -1, linearDamping=0.04, angularDamping=0.04, restitution=0, contactStiffness=3000, contactDamping=100, physicsClientId=self.client_id)
+      if self.body_sleeping:
+        pb.changeDynamics(handle.object_id, -1,
+                          activationState=pb.ACTIVATION_STATE_ENABLE_SLEEPING | pb.ACTIVATION_STATE_WAKE_UP,
+                          physicsClientId=self.client_id)
+      if pool_key is not None:
+        self.object_pool.register(handle, pool_key)
       shape_handles.append(handle)
     self.objects.extend(shape_handles)
 
     for h in shape_handles:
       self.object_types[h] = shape_type
 
-    self.wait(50)
+    self.settle(50)
     return shape_handles
 
   def getObjects(self):
@@ -610,26 +778,49 @@ class BaseEnv:
       objs.append(obj)
     return objs
 
+  def getObjectPoseSnapshot(self, objects=None):
+    '''
+    Get the poses of the objects. The poses of all the objects in the env are fetched at once and cached until
+    the simulation is stepped, objects are teleported or the object list changes, so the helpers querying poses
+    several times per step only hit pybullet once.
+
+    Args:
+      objects (list[PybulletObject]): The objects to get the poses of. Defaults to all the objects in the env.
+
+    Returns:
+      numpy.array: (N, 7) array of [x, y, z, qx, qy, qz, qw]. The orientations are the ones returned by the
+                   objects' getPose, e.g. canonicalized for the blocks.
+    '''
+    key = (pybullet_util.getWorldVersion(self.client_id), list(map(id, self.objects)))
+    if self.pose_snapshot is None or self.pose_snapshot_key != key:
+      self.pose_snapshot = np.array([sum(obj.getPose(), []) for obj in self.objects], dtype=float).reshape(-1, 7)
+      # Keep the objects alive so their python ids in the key can not be reused
+      self.pose_snapshot_objects = list(self.objects)
+      self.pose_snapshot_rows = {id(obj): i for i, obj in enumerate(self.objects)}
+      self.pose_snapshot_key = key
+    if objects is None:
+      return self.pose_snapshot
+
+    rows = self.pose_snapshot_rows
+    return np.array([self.pose_snapshot[rows[id(obj)]] if id(obj) in rows else sum(obj.getPose(), [])
+                     for obj in objects], dtype=float).reshape(-1, 7)
+
   def getObjectPoses(self, objects=None):
     if objects is None: objects = self.objects
 
+    objects = [obj for obj in objects if not self._isObjectHeld(obj)]
     obj_poses = list()
-    for obj in objects:
-      if self._isObjectHeld(obj):
-        continue
-      pos, rot = obj.getPose()
-      rot = self.convertQuaternionToEuler(rot)
+    for pose in self.getObjectPoseSnapshot(objects):
+      rot = self.convertQuaternionToEuler(pose[3:])
 
-      obj_poses.append(pos + rot)
+      obj_poses.append(pose[:3].tolist() + rot)
     return np.array(obj_poses)
 
   def getObjectPositions(self, omit_hold=True):
-    obj_positions = list()
-    for obj in self.objects:
-      if omit_hold and self._isObjectHeld(obj):
-        continue
-      obj_positions.append(obj.getPosition())
-    return np.array(obj_positions)
+    obj_positions = self.getObjectPoseSnapshot()[:, :3]
+    if omit_hold:
+      obj_positions = obj_positions[[not self._isObjectHeld(obj) for obj in self.objects]]
+    return obj_positions
 
   def _getHoldingObj(self):
     return self.robot.holding_obj
@@ -651,7 +842,11 @@ class BaseEnv:
 
   def _removeObject(self, obj):
     if obj in self.objects:
-      pb.removeBody(obj.object_id)
+      if self._isObjectHeld(obj):
+        self.robot.detachObj()
+      pb.removeBody(obj.object_id, physicsClientId=self.client_id)
+      if self.object_pool is not None:
+        self.object_pool.forget(obj)
       # self._moveObjectOutWorkspace(obj)
       self.objects.remove(obj)
       self.robot.openGripper()
@@ -706,7 +901,10 @@ class BaseEnv:
       if self._isObjectHeld(obj):
         return False
 
-    objects = sorted(objects, key=lambda o: o.getZPosition())
+    positions = self.getObjectPoseSnapshot(objects)[:, :3]
+    order = sorted(range(len(objects)), key=lambda i: positions[i][2])
+    objects = [objects[i] for i in order]
+    positions = positions[order]
     for i, obj in enumerate(objects):
       if i == 0:
         continue
@@ -714,7 +912,7 @@ class BaseEnv:
       if not obj.isTouching(objects[i-1]) or obj.isTouching(PybulletObject(-1, self.table_id)):
         return False
       # the xy positions of the blocks much be close. Otherwise the adjacent blocks will be considered as a stack
-      if not np.allclose(np.array(obj.getXYPosition()), np.array(objects[i-1].getXYPosition()), atol=self.max_block_size/2):
+      if not np.allclose(positions[i][:2], positions[i-1][:2], atol=self.max_block_size/2):
         return False
     return True
 
@@ -772,13 +970,12 @@ class BaseEnv:
     return angle < np.pi / 12
 
   def _checkObjUpright(self, obj, threshold=np.pi/9):
-    triangle_rot = obj.getRotation()
+    triangle_rot = self.getObjectPoseSnapshot([obj])[0, 3:]
     triangle_rot = pb.getEulerFromQuaternion(triangle_rot)
     return abs(triangle_rot[0]) < threshold and abs(triangle_rot[1]) < threshold
 
   def _checkOnTop(self, bottom_obj, top_obj):
-    bottom_position = bottom_obj.getPosition()
-    top_position = top_obj.getPosition()
+    bottom_position, top_position = self.getObjectPoseSnapshot([bottom_obj, top_obj])[:, :3]
     if top_position[-1] - bottom_position[-1] < 0.5 * self.block_scale_range[0] * self.block_original_size:
       return False
     return top_obj.isTouching(bottom_obj)
@@ -1021,73 +1218,25 @@ class BaseEnv:
 
   def getInHandImage(self, heightmap, x, y, z, rot, next_heightmap):
     (rx, ry, rz) = rot
-    # Pad heightmaps for grasps near the edges of the workspace
-    heightmap = np.pad(heightmap, int(self.in_hand_size / 2), 'constant', constant_values=0.0)
-    next_heightmap = np.pad(next_heightmap, int(self.in_hand_size / 2), 'constant', constant_values=0.0)
-
     x, y = self._getPixelsFromPos(x, y)
-    x = x + int(self.in_hand_size / 2)
-    y = y + int(self.in_hand_size / 2)
 
-    # Get the corners of the crop
-    x_min = int(x - self.in_hand_size / 2)
-    x_max = int(x + self.in_hand_size / 2)
-    y_min = int(y - self.in_hand_size / 2)
-    y_max = int(y + self.in_hand_size / 2)
-
-    # Crop both heightmaps
-    crop = heightmap[x_min:x_max, y_min:y_max]
+    # Crop both heightmaps, the crops are zero outside of the heightmaps for grasps near the edges of the workspace
+    if self.in_hand_mode.find('sub') > -1:
+      next_max = np.max(self.patch_extractor.crop(next_heightmap, x, y))
+    crop = self.patch_extractor.crop(heightmap, x, y)
     if self.in_hand_mode.find('sub') > -1:
-      next_crop = next_heightmap[x_min:x_max, y_min:y_max]
-
       # Adjust the in-hand image to remove background objects
-      next_max = np.max(next_crop)
       crop[crop >= next_max] -= next_max
 
     if self.in_hand_mode.find('proj') > -1:
       return self.getInHandOccupancyGridProj(crop, z, rot)
     else:
       # end_effector rotate counter clockwise along z, so in hand img rotate clockwise
-      crop = sk_transform.rotate(crop, np.rad2deg(-rz))
+      crop = self.patch_extractor.rotate(crop, np.rad2deg(-rz))
       return crop.reshape((1, self.in_hand_size, self.in_hand_size))
 
   def getInHandOccupancyGridProj(self, crop, z, rot):
-    rx, ry, rz = rot
-    # crop = zoom(crop, 2)
-    crop = np.round(crop, 5)
-    size = self.in_hand_size
-
-    zs = np.array([z+(-size/2+i)*(self.heightmap_resolution) for i in range(size)])
-    zs = zs.reshape((1, 1, -1))
-    zs = zs.repeat(size, 0).repeat(size, 1)
-    c = crop.reshape(size, size, 1).repeat(size, 2)
-    ori_occupancy = c > zs
-
-    # transform into points
-    point = np.argwhere(ori_occupancy)
-    if point.shape[0] == 0:
-      return np.zeros((3, size, size))
-
-    # center
-    ori_point = point - size/2
-    R = transformations.euler_matrix(rx, ry, rz)[:3, :3].T
-    points = []
-    batch_size = 4096
-    for i in range(int(np.ceil(ori_point.shape[0]/batch_size))):
-      points.append(R.dot(ori_point[batch_size*i:batch_size*(i+1)].T))
-    point = np.concatenate(points, 1)
-    # point = R.dot(ori_point.T)
-    point = point + size/2
-    point = np.round(point).astype(int)
-    point = point.T[(np.logical_and(0 < point.T, point.T < size)).all(1)].T
-
-    occupancy = np.zeros((size, size, size))
-    occupancy[point[0], point[1], point[2]] = 1
-    occupancy = median_filter(occupancy, size=2)
-    occupancy = np.ceil(occupancy)
-
-    projection = np.stack((occupancy.sum(0), occupancy.sum(1), occupancy.sum(2)))
-    return projection
+    return self.in_hand_projector.project(crop, z, rot, self.heightmap_resolution)
 
   def getEmptyInHand(self):
     if self.in_hand_mode.find('proj') > -1:
@@ -1133,17 +1282,18 @@ class BaseEnv:
     np.random.set_state(state['random_state'])
 
   def saveState(self):
-    self.pb_state = pb.saveState()
+    self.pb_state = pb.saveState(physicsClientId=self.client_id)
     self.state = self.getStateDict()
 
   def restoreState(self):
-    pb.restoreState(self.pb_state)
+    pb.restoreState(self.pb_state, physicsClientId=self.client_id)
+    pybullet_util.markWorldChanged(self.client_id)
     self.restoreStateDict(self.state)
 
   def saveEnvToFile(self, path):
     bullet_file = os.path.join(path, 'env.bullet')
     pickle_file = os.path.join(path, 'env.pickle')
-    pb.saveBullet(bullet_file)
+    pb.saveBullet(bullet_file, physicsClientId=self.client_id)
     state = self.getStateDict()
     with open(pickle_file, 'wb') as f:
       pickle.dump(state, f)
@@ -1151,7 +1301,8 @@ class BaseEnv:
   def loadEnvFromFile(self, path):
     bullet_file = os.path.join(path, 'env.bullet')
     pickle_file = os.path.join(path, 'env.pickle')
-    pb.restoreState(fileName=bullet_file)
+    pb.restoreState(fileName=bullet_file, physicsClientId=self.client_id)
+    pybullet_util.markWorldChanged(self.client_id)
     with open(pickle_file, 'rb') as f:
       state = pickle.load(f)
     self.restoreStateDict(state)
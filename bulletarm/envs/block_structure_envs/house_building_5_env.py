@@ -20,7 +20,7 @@ class HouseBuilding5Env(BaseEnv):
   def step(self, action):
     pre_n = self.getNStackedPairs()
     self.takeAction(action)
-    self.wait(100)
+    self.settle(100)
     obs = self._getObservation(action)
     done = self._checkTermination()
     if self.reward_type == 'dense':
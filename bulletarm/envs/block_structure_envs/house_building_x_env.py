@@ -36,7 +36,7 @@ class HouseBuildingXEnv(BaseEnv):
         self.previous_candidates = [obj.get_place_candidate_dict() for obj in self.check_goal_labels]
 
     self.takeAction(action)
-    self.wait(100)
+    self.settle(100)
     obs = self._getObservation(action)
     done = self._checkTermination()
     reward = 1.0 if done else 0.0
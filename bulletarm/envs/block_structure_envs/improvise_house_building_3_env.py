@@ -41,7 +41,7 @@ class ImproviseHouseBuilding3Env(BaseEnv):
         brick_xscale = np.random.uniform(0.5, 0.7)
         brick_yscale = np.random.uniform(0.5, 0.7)
         brick_zscale = np.random.uniform(0.4, 0.7)
-        handle = object_generation.generateRandomBrick(pos, rot, brick_xscale, brick_yscale, brick_zscale)
+        handle = object_generation.generateRandomBrick(pos, rot, brick_xscale, brick_yscale, brick_zscale, client_id=self.client_id)
         self.objects.append(handle)
         self.object_types[handle] = constants.BRICK
 
@@ -26,7 +26,7 @@ class BumpyBase:
 
   def resetBumps(self):
     for i in self.bump_ids:
-      pb.removeBody(i)
+      pb.removeBody(i, physicsClientId=self.client_id)
     self.bump_ids = []
 
     self.bump_rs = [np.random.random() * self.bump_max_angle for _ in range(9)]
@@ -44,29 +44,29 @@ class BumpyBase:
 
     obj_pattern = os.path.join(constants.URDF_PATH, 'pyramid/pyramid.obj')
     for i in range(9):
-      bump_visual_shape = pb.createVisualShape(shapeType=pb.GEOM_MESH, fileName=obj_pattern, meshScale=[self.bump_ext, self.bump_ext, np.tan(self.bump_rs[i])*self.bump_ext*0.5])
-      bump_collision_shape = pb.createCollisionShape(shapeType=pb.GEOM_MESH, fileName=obj_pattern, meshScale=[self.bump_ext, self.bump_ext, np.tan(self.bump_rs[i])*self.bump_ext*0.5])
+      bump_visual_shape = pb.createVisualShape(shapeType=pb.GEOM_MESH, fileName=obj_pattern, meshScale=[self.bump_ext, self.bump_ext, np.tan(self.bump_rs[i])*self.bump_ext*0.5], physicsClientId=self.client_id)
+      bump_collision_shape = pb.createCollisionShape(shapeType=pb.GEOM_MESH, fileName=obj_pattern, meshScale=[self.bump_ext, self.bump_ext, np.tan(self.bump_rs[i])*self.bump_ext*0.5], physicsClientId=self.client_id)
       bump_id = pb.createMultiBody(baseMass=0,
                                    baseInertialFramePosition=[0, 0, 0],
                                    baseCollisionShapeIndex=bump_collision_shape,
                                    baseVisualShapeIndex=bump_visual_shape,
                                    basePosition=[bump_poses[i, 0], bump_poses[i, 1], 0],
-                                   baseOrientation=pb.getQuaternionFromEuler((0, 0, bump_rz)))
+                                   baseOrientation=pb.getQuaternionFromEuler((0, 0, bump_rz)), physicsClientId=self.client_id)
       pb.changeDynamics(bump_id, -1, lateralFriction=100, linearDamping=0.04, angularDamping=0.04, restitution=0,
-                        contactStiffness=3000, contactDamping=100)
+                        contactStiffness=3000, contactDamping=100, physicsClientId=self.client_id)
       self.bump_ids.append(bump_id)
 
   def resetPlatform(self, pos, rz, size):
     if self.platform_id != -1:
-      pb.removeBody(self.platform_id)
-    pf_visual_shape = pb.createVisualShape(shapeType=pb.GEOM_BOX, halfExtents=[size[0]/2, size[1]/2, self.bump_offset/2])
-    pf_collision_shape = pb.createCollisionShape(shapeType=pb.GEOM_BOX, halfExtents=[size[0]/2, size[1]/2, self.bump_offset/2])
+      pb.removeBody(self.platform_id, physicsClientId=self.client_id)
+    pf_visual_shape = pb.createVisualShape(shapeType=pb.GEOM_BOX, halfExtents=[size[0]/2, size[1]/2, self.bump_offset/2], physicsClientId=self.client_id)
+    pf_collision_shape = pb.createCollisionShape(shapeType=pb.GEOM_BOX, halfExtents=[size[0]/2, size[1]/2, self.bump_offset/2], physicsClientId=self.client_id)
     self.platform_id = pb.createMultiBody(baseMass=0,
                                  baseInertialFramePosition=[0, 0, 0],
                                  baseCollisionShapeIndex=pf_collision_shape,
                                  baseVisualShapeIndex=pf_visual_shape,
                                  basePosition=[pos[0], pos[1], self.bump_offset/2],
-                                 baseOrientation=pb.getQuaternionFromEuler((0, 0, rz)))
+                                 baseOrientation=pb.getQuaternionFromEuler((0, 0, rz)), physicsClientId=self.client_id)
 
   def isObjOnPlatform(self, obj):
     return obj.isTouchingId(self.platform_id)
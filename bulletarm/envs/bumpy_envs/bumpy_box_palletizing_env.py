@@ -7,6 +7,7 @@ from bulletarm.pybullet.utils.constants import NoValidPositionException
 from bulletarm.envs.realistic_envs.box_palletizing_env import BoxPalletizingEnv
 from bulletarm.envs.bumpy_envs.bumpy_base import BumpyBase
 from bulletarm.planners.box_palletizing_planner import BoxPalletizingPlanner
+from bulletarm.pybullet.utils import pybullet_util
 
 class BumpyBoxPalletizingEnv(BoxPalletizingEnv, BumpyBase):
   def __init__(self, config):
@@ -29,17 +30,17 @@ class BumpyBoxPalletizingEnv(BoxPalletizingEnv, BumpyBase):
     super().generateOneBox()
     self._changeBoxDynamics(self.objects[-1])
     for _ in range(100):
-      pb.stepSimulation()
+      pybullet_util.stepSimulation(self.client_id)
 
   def reset(self):
     while True:
       if self.pallet is not None:
-        pb.removeBody(self.pallet.object_id)
+        pb.removeBody(self.pallet.object_id, physicsClientId=self.client_id)
       self.resetPybulletWorkspace()
       BumpyBase.resetBumps(self)
       self.resetPallet()
       pb.changeDynamics(self.pallet.object_id, -1, linearDamping=0.04, angularDamping=0.04, restitution=0,
-                        contactStiffness=3000, contactDamping=100)
+                        contactStiffness=3000, contactDamping=100, physicsClientId=self.client_id)
       BumpyBase.resetPlatform(self, self.pallet_pos, self.pallet_rz, self.pallet_size)
 
       try:
@@ -50,7 +51,7 @@ class BumpyBoxPalletizingEnv(BoxPalletizingEnv, BumpyBase):
       else:
         break
     for _ in range(100):
-      pb.stepSimulation()
+      pybullet_util.stepSimulation(self.client_id)
     return self._getObservation()
 
   def getObjEachLevel(self):
@@ -72,7 +73,7 @@ class BumpyBoxPalletizingEnv(BoxPalletizingEnv, BumpyBase):
 
   def _changeBoxDynamics(self, box):
     pb.changeDynamics(box.object_id, -1, linearDamping=0.04, angularDamping=0.04, restitution=0,
-                      contactStiffness=3000, contactDamping=100)
+                      contactStiffness=3000, contactDamping=100, physicsClientId=self.client_id)
 
 def createBumpyBoxPalletizingEnv(config):
   return BumpyBoxPalletizingEnv(config)
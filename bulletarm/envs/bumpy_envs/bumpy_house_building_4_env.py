@@ -7,6 +7,7 @@ from bulletarm.pybullet.utils.constants import NoValidPositionException
 from bulletarm.envs.block_structure_envs.house_building_4_env import HouseBuilding4Env
 from bulletarm.envs.bumpy_envs.bumpy_base import BumpyBase
 from bulletarm.planners.bumpy_house_building_4_planner import BumpyHouseBuilding4Planner
+from bulletarm.pybullet.utils import pybullet_util
 
 class BumpyHouseBuilding4Env(HouseBuilding4Env, BumpyBase):
   def __init__(self, config):
@@ -34,7 +35,7 @@ class BumpyHouseBuilding4Env(HouseBuilding4Env, BumpyBase):
         self._generateShapes(constants.BRICK, 1, random_orientation=self.random_orientation)
         self._generateShapes(constants.CUBE, 4, random_orientation=self.random_orientation)
         for _ in range(100):
-          pb.stepSimulation()
+          pybullet_util.stepSimulation(self.client_id)
         if not self.isSimValid():
           continue
       except NoValidPositionException as e:
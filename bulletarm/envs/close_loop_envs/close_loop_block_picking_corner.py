@@ -19,7 +19,7 @@ class CloseLoopBlockPickingCornerEnv(CloseLoopEnv):
     if 'object_scale_range' not in config:
       config['object_scale_range'] = [1.2, 1.2]
     super().__init__(config)
-    self.corner = Corner()
+    self.corner = Corner(client_id=self.client_id)
     self.corner_rz = 0
     self.corner_pos = [self.workspace[0].mean(), self.workspace[1].mean(), 0]
 
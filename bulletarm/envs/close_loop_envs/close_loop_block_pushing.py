@@ -55,12 +55,12 @@ class CloseLoopBlockPushingEnv(CloseLoopEnv):
       else:
         break
     if self.goal_id is not None:
-      pb.removeBody(self.goal_id)
-    goal_visual = pb.createVisualShape(pb.GEOM_BOX, halfExtents=[self.goal_size/2, self.goal_size/2, 0.0025], rgbaColor=[0, 0, 1, 1])
+      pb.removeBody(self.goal_id, physicsClientId=self.client_id)
+    goal_visual = pb.createVisualShape(pb.GEOM_BOX, halfExtents=[self.goal_size/2, self.goal_size/2, 0.0025], rgbaColor=[0, 0, 1, 1], physicsClientId=self.client_id)
     self.goal_id = pb.createMultiBody(baseMass=0,
                                       baseVisualShapeIndex=goal_visual,
                                       basePosition=[*self.goal_pos, 0],
-                                      baseOrientation=transformations.quaternion_from_euler(0, 0, 0), )
+                                      baseOrientation=transformations.quaternion_from_euler(0, 0, 0), physicsClientId=self.client_id, )
 
     return self._getObservation()
 
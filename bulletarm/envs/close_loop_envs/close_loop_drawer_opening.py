@@ -16,7 +16,7 @@ class CloseLoopDrawerOpeningEnv(CloseLoopEnv):
   '''
   def __init__(self, config):
     super().__init__(config)
-    self.drawer = Drawer()
+    self.drawer = Drawer(client_id=self.client_id)
     self.drawer_rot = 0
 
   def initialize(self):
@@ -2,12 +2,21 @@ import pybullet as pb
 import numpy as np
 from bulletarm.envs.base_env import BaseEnv
 from bulletarm.pybullet.utils import transformations
+from bulletarm.pybullet.utils import constants
 from bulletarm.pybullet.utils.renderer import Renderer
 from bulletarm.pybullet.utils.ortho_sensor import OrthographicSensor
 from bulletarm.pybullet.utils.sensor import Sensor
 from bulletarm.pybullet.equipments.tray import Tray
 from scipy.ndimage import rotate
 import cv2
+from collections import OrderedDict
+
+# Gripper masks shared by the envs of the process, keyed by (heightmap size, finger half size, opening, rotation bin)
+_gripper_masks = OrderedDict()
+# The maximum number of cached gripper masks
+GRIPPER_MASK_CACHE_SIZE = 1024
+# The rotation of the gripper masks is quantized to this step in degrees
+GRIPPER_MASK_ROTATION_STEP = 0.5
 
 class CloseLoopEnv(BaseEnv):
   def __init__(self, config):
@@ -31,6 +40,10 @@ class CloseLoopEnv(BaseEnv):
       config['view_scale'] = 1.5
     if 'close_loop_tray' not in config:
       config['close_loop_tray'] = False
+    if 'hole_filling' not in config:
+      config['hole_filling'] = 'edt'
+    if 'incremental_render' not in config:
+      config['incremental_render'] = False
     super().__init__(config)
     self.view_type = config['view_type']
     self.obs_type = config['obs_type']
@@ -44,7 +57,15 @@ class CloseLoopEnv(BaseEnv):
                               'camera_side_rgbd_90', 'camera_side_rgbd_undis', 'camera_side_rgbd_60_undis',
                               'camera_side_rgbd_reflect', 'camera_center_xyz_reflect',
                               'camera_side_rgbd_random_reflect', 'camera_fix_rgbd', 'render_center_side']
+    # the integer obs dtypes quantize non-negative heights, so they are only available for the views of absolute heights.
+    # The depths relative to the gripper can be negative, the holes of the views rendered without interpolation are
+    # filled with -0.1 and the rgb channels need a float dtype
+    assert self.obs_dtype not in constants.OBS_DTYPE_SCALE or \
+           self.view_type in ['render_fix', 'render_center_height', 'camera_fix_height', 'camera_center_xyr_height',
+                              'camera_center_xyz_height', 'camera_center_xy_height', 'camera_center_z_height']
     self.view_scale = config['view_scale']
+    self.hole_filling = config['hole_filling']
+    self.incremental_render = config['incremental_render']
     self.robot_type = config['robot']
     if config['robot'] == 'kuka':
       self.robot.home_positions = [-0.4446, 0.0837, -2.6123, 1.8883, -0.0457, -1.1810, 0.0699, 0., 0., 0., 0., 0., 0., 0., 0.]
@@ -54,7 +75,7 @@ class CloseLoopEnv(BaseEnv):
     self.bin_size = self.workspace_size - 0.05
     self.tray = None
     if self.has_tray:
-      self.tray = Tray()
+      self.tray = Tray(client_id=self.client_id)
 
     # if self.view_type.find('center') > -1:
     #   self.ws_size *= 1.5
@@ -80,21 +101,23 @@ class CloseLoopEnv(BaseEnv):
     cam_pos = [self.workspace[0].mean(), self.workspace[1].mean(), 0.29]
     target_pos = [self.workspace[0].mean(), self.workspace[1].mean(), 0]
     cam_up_vector = [-1, 0, 0]
-    self.sensor = OrthographicSensor(cam_pos, cam_up_vector, target_pos, self.obs_size_m, 0.1, 1)
+    self.sensor = OrthographicSensor(cam_pos, cam_up_vector, target_pos, self.obs_size_m, 0.1, 1, client_id=self.client_id)
     self.sensor.setCamMatrix(cam_pos, cam_up_vector, target_pos)
     if self.view_type == 'render_center_side':
       cam_pos = [1, self.workspace[1].mean(), 0.6]
       target_pos = [self.workspace[0].mean(), self.workspace[1].mean(), 0]
       cam_up_vector = [-1, 0, 0]
-      sensor = Sensor(cam_pos, cam_up_vector, target_pos, 0.7, 0.1, 3)
+      sensor = Sensor(cam_pos, cam_up_vector, target_pos, 0.7, 0.1, 3, client_id=self.client_id)
       sensor.fov = 40
       sensor.proj_matrix = pb.computeProjectionMatrixFOV(sensor.fov, 1, sensor.near, sensor.far)
-      self.renderer = Renderer(self.workspace, [sensor])
+      self.renderer = Renderer(self.workspace, [sensor], client_id=self.client_id, hole_filling=self.hole_filling,
+                               incremental=self.incremental_render)
       self.renderer.run_interpolate = False
       self.renderer.max_crop_z = 0.1
     else:
-      self.renderer = Renderer(self.workspace)
-    self.pers_sensor = Sensor(cam_pos, cam_up_vector, target_pos, self.obs_size_m, cam_pos[2] - 1, cam_pos[2])
+      self.renderer = Renderer(self.workspace, client_id=self.client_id, hole_filling=self.hole_filling,
+                               incremental=self.incremental_render)
+    self.pers_sensor = Sensor(cam_pos, cam_up_vector, target_pos, self.obs_size_m, cam_pos[2] - 1, cam_pos[2], client_id=self.client_id)
 
   def _getValidOrientation(self, random_orientation):
     if random_orientation:
@@ -106,6 +129,8 @@ class CloseLoopEnv(BaseEnv):
   def resetPybulletWorkspace(self):
     self.renderer.clearPoints()
     super().resetPybulletWorkspace()
+    # the gripper is painted on the observation, the robot is left out of the incrementally updated point cloud
+    self.renderer.ignore_body_ids = [self.robot.id]
     self.robot.moveTo([self.workspace[0].mean(), self.workspace[1].mean(), 0.2], transformations.quaternion_from_euler(0, 0, 0))
     self.simulate_pos = self.robot._getEndEffectorPosition()
     self.simulate_rot = transformations.euler_from_quaternion(self.robot._getEndEffectorRotation())
@@ -135,7 +160,7 @@ class CloseLoopEnv(BaseEnv):
     self.robot.controlGripper(p)
     self.robot.adjustGripperCommand()
     self.setRobotHoldingObj()
-    self.renderer.clearPoints()
+    self.renderer.updatePoints()
     obs = self._getObservation(action)
     valid = self.isSimValid()
     if valid:
@@ -157,13 +182,18 @@ class CloseLoopEnv(BaseEnv):
 
   def setRobotHoldingObjWithRotConstraint(self):
     self.robot.holding_obj = None
+    body_ids, _, _ = self.robot.getContacts()
+    contact_ids, contact_counts = np.unique(body_ids, return_counts=True)
+    contact_ids = set(contact_ids[contact_counts >= 2].tolist())
+    gripper_rot = transformations.euler_from_quaternion(self.robot._getEndEffectorRotation())[-1]
     for obj in self.objects:
+      if obj.object_id not in contact_ids:
+        continue
       obj_rot = transformations.euler_from_quaternion(obj.getRotation())[-1]
-      gripper_rot = transformations.euler_from_quaternion(self.robot._getEndEffectorRotation())[-1]
       angle_diff = abs(gripper_rot - obj_rot)
       angle_diff = min(angle_diff, abs(angle_diff - np.pi))
       angle_diff = min(angle_diff, abs(angle_diff - np.pi / 2))
-      if len(pb.getContactPoints(self.robot.id, obj.object_id)) >= 2 and angle_diff < np.pi / 12:
+      if angle_diff < np.pi / 12:
         self.robot.holding_obj = obj
         break
 
@@ -194,11 +224,10 @@ class CloseLoopEnv(BaseEnv):
     if objects is None: objects = self.objects
 
     obj_poses = list()
-    for obj in objects:
-      pos, rot = obj.getPose()
-      rot = self.convertQuaternionToEuler(rot)
+    for pose in self.getObjectPoseSnapshot(objects):
+      rot = self.convertQuaternionToEuler(pose[3:])
 
-      obj_poses.append(pos + rot)
+      obj_poses.append(pose[:3].tolist() + rot)
     return np.array(obj_poses)
 
   def _getVecObservation(self):
@@ -235,16 +264,16 @@ class CloseLoopEnv(BaseEnv):
       # draw gripper if view is centered at the gripper
       if self.view_type in ['camera_center_xyz', 'camera_center_xyz_height', 'render_center', 'render_center_height',
                             'render_center_side']:
-        gripper_img = self.getGripperImg()
+        gripper_mask = self._getGripperMask()
         if self.view_type.find('height') > -1:
           gripper_pos = self.robot._getEndEffectorPosition()
-          heightmap[gripper_img == 1] = gripper_pos[2]
+          heightmap[gripper_mask] = gripper_pos[2]
         else:
-          heightmap[gripper_img == 1] = 0
+          heightmap[gripper_mask] = 0
       # add channel dimension if view is depth only
       if self.view_type.find('rgb') == -1:
         heightmap = heightmap.reshape([1, self.heightmap_size, self.heightmap_size])
-      return self._isHolding(), None, heightmap
+      return self._isHolding(), None, self._castObservation(heightmap)
     else:
       obs = self._getVecObservation()
       return self._isHolding(), None, obs
@@ -267,16 +296,16 @@ class CloseLoopEnv(BaseEnv):
     self.simulate_rot = [0, 0, gripper_rz]
     # obs = self.renderer.getTopDownDepth(self.obs_size_m, self.heightmap_size, pos, 0)
     obs = self._getHeightmap(gripper_pos=self.simulate_pos, gripper_rz=gripper_rz)
-    gripper_img = self.getGripperImg(p, gripper_rz)
+    gripper_mask = self._getGripperMask(p, gripper_rz)
     if self.view_type.find('height') > -1:
-      obs[gripper_img == 1] = self.simulate_pos[2]
+      obs[gripper_mask] = self.simulate_pos[2]
     else:
-      obs[gripper_img == 1] = 0
+      obs[gripper_mask] = 0
     # gripper_img = gripper_img.reshape([1, self.heightmap_size, self.heightmap_size])
     # obs[gripper_img==1] = 0
     obs = obs.reshape([1, self.heightmap_size, self.heightmap_size])
 
-    return self._isHolding(), None, obs
+    return self._isHolding(), None, self._castObservation(obs)
 
   def resetSimPose(self):
     self.simulate_pos = np.array(self.robot._getEndEffectorPosition())
@@ -287,11 +316,18 @@ class CloseLoopEnv(BaseEnv):
     return not self._isHolding() and self.simulate_pos[2] > self.simulate_z_threshold
 
   def getGripperImg(self, gripper_state=None, gripper_rz=None):
+    return self._getGripperMask(gripper_state, gripper_rz).astype(float)
+
+  def _getGripperMask(self, gripper_state=None, gripper_rz=None):
+    '''
+    Get the read-only boolean mask of the gripper fingers in the heightmap. A mask only depends on the opening of the
+    fingers in pixels and on the rotation, quantized to GRIPPER_MASK_ROTATION_STEP degrees, so the masks are cached
+    and shared between the envs of the process instead of being rotated at every observation.
+    '''
     if gripper_state is None:
       gripper_state = self.robot.getGripperOpenRatio()
     if gripper_rz is None:
       gripper_rz = transformations.euler_from_quaternion(self.robot._getEndEffectorRotation())[2]
-    im = np.zeros((self.heightmap_size, self.heightmap_size))
     gripper_half_size = 5 * self.workspace_size / self.obs_size_m
     gripper_half_size = round(gripper_half_size/128*self.heightmap_size)
     if self.robot_type in ['panda', 'ur5', 'ur5_robotiq']:
@@ -301,11 +337,31 @@ class CloseLoopEnv(BaseEnv):
     else:
       raise NotImplementedError
     d = int(gripper_max_open/128*self.heightmap_size * gripper_state)
+    rotation_bin = int(np.round(np.rad2deg(gripper_rz) / GRIPPER_MASK_ROTATION_STEP))
+    key = (self.heightmap_size, gripper_half_size, d, rotation_bin)
+    if key in _gripper_masks:
+      _gripper_masks.move_to_end(key)
+      return _gripper_masks[key]
+
+    im = np.zeros((self.heightmap_size, self.heightmap_size))
     anchor = self.heightmap_size//2
     im[int(anchor - d // 2 - gripper_half_size):int(anchor - d // 2 + gripper_half_size), int(anchor - gripper_half_size):int(anchor + gripper_half_size)] = 1
     im[int(anchor + d // 2 - gripper_half_size):int(anchor + d // 2 + gripper_half_size), int(anchor - gripper_half_size):int(anchor + gripper_half_size)] = 1
-    im = rotate(im, np.rad2deg(gripper_rz), reshape=False, order=0)
-    return im
+    im = rotate(im, rotation_bin * GRIPPER_MASK_ROTATION_STEP, reshape=False, order=0)
+    mask = im == 1
+    mask.setflags(write=False)
+    _gripper_masks[key] = mask
+    if len(_gripper_masks) > GRIPPER_MASK_CACHE_SIZE:
+      _gripper_masks.popitem(last=False)
+    return mask
+
+  def _getRGBDImg(self):
+    '''
+    Get the (4, heightmap_size, heightmap_size) RGB-D image of the sensor from a single render.
+    '''
+    images = self.sensor.capture(self.heightmap_size, ('rgb', 'depth'))
+    depth_img = images['depth'].reshape(1, self.heightmap_size, self.heightmap_size)
+    return np.concatenate([images['rgb'], depth_img])
 
   def _getHeightmap(self, gripper_pos=None, gripper_rz=None):
     gripper_z_offset = 0.04 # panda
@@ -398,15 +454,13 @@ class CloseLoopEnv(BaseEnv):
         depth = heightmap
       return depth
     elif self.view_type in ['camera_fix', 'camera_fix_height', 'camera_fix_rgbd']:
-      heightmap = self.sensor.getHeightmap(self.heightmap_size)
       if self.view_type == 'camera_fix':
+        heightmap = self.sensor.getHeightmap(self.heightmap_size)
         depth = -heightmap + gripper_pos[2]
       elif self.view_type == 'camera_fix_height':
-        depth = heightmap
+        depth = self.sensor.getHeightmap(self.heightmap_size)
       elif self.view_type == 'camera_fix_rgbd':
-        rgb_img = self.sensor.getRGBImg(self.heightmap_size)
-        depth_img = self.sensor.getDepthImg(self.heightmap_size).reshape(1, self.heightmap_size, self.heightmap_size)
-        depth = np.concatenate([rgb_img, depth_img])
+        depth = self._getRGBDImg()
       else:
         raise NotImplementedError
       return depth
@@ -415,32 +469,24 @@ class CloseLoopEnv(BaseEnv):
       cam_pos = [1, self.workspace[1].mean(), 0.6]
       target_pos = [self.workspace[0].mean(), self.workspace[1].mean(), 0]
       cam_up_vector = [-1, 0, 0]
-      self.sensor = Sensor(cam_pos, cam_up_vector, target_pos, 0.7, 0.1, 3)
+      self.sensor = Sensor(cam_pos, cam_up_vector, target_pos, 0.7, 0.1, 3, client_id=self.client_id)
       self.sensor.fov = 40
       self.sensor.proj_matrix = pb.computeProjectionMatrixFOV(self.sensor.fov, 1, self.sensor.near, self.sensor.far)
       if self.view_type == 'camera_side':
         depth = self.sensor.getDepthImg(self.heightmap_size)
       elif self.view_type == 'camera_side_rgbd':
-        rgb_img = self.sensor.getRGBImg(self.heightmap_size)
-        depth_img = self.sensor.getDepthImg(self.heightmap_size).reshape(1, self.heightmap_size, self.heightmap_size)
-        depth = np.concatenate([rgb_img, depth_img])
+        depth = self._getRGBDImg()
       elif self.view_type == 'camera_side_rgbd_reflect':
-        rgb_img = self.sensor.getRGBImg(self.heightmap_size)
-        depth_img = self.sensor.getDepthImg(self.heightmap_size).reshape(1, self.heightmap_size, self.heightmap_size)
-        depth = np.concatenate([rgb_img, depth_img])
+        depth = self._getRGBDImg()
         depth = depth[:, :, ::-1]
       elif self.view_type == 'camera_side_rgbd_random_reflect':
-        rgb_img = self.sensor.getRGBImg(self.heightmap_size)
-        depth_img = self.sensor.getDepthImg(self.heightmap_size).reshape(1, self.heightmap_size, self.heightmap_size)
-        depth = np.concatenate([rgb_img, depth_img])
+        depth = self._getRGBDImg()
         if np.random.random() > 0.5:
           depth = depth[:, :, ::-1]
         if np.random.random() > 0.5:
           depth = depth[:, ::-1, :]
       elif self.view_type == 'camera_side_rgbd_undis':
-        rgb_img = self.sensor.getRGBImg(self.heightmap_size)
-        depth_img = self.sensor.getDepthImg(self.heightmap_size).reshape(1, self.heightmap_size, self.heightmap_size)
-        depth = np.concatenate([rgb_img, depth_img])
+        depth = self._getRGBDImg()
         if self.heightmap_size == 64:
           matrix = np.array([[1.5853, 0.5081, -18.4355],
                              [0., 2.5887, -33.6935],
@@ -477,12 +523,10 @@ class CloseLoopEnv(BaseEnv):
       dx = np.cos(angle) * dist
       cam_pos = [self.workspace[0].mean() + dx, self.workspace[1].mean(), dz]
       cam_up_vector = [-1, 0, 0]
-      self.sensor = Sensor(cam_pos, cam_up_vector, target_pos, 0.7, 0.1, 3)
+      self.sensor = Sensor(cam_pos, cam_up_vector, target_pos, 0.7, 0.1, 3, client_id=self.client_id)
       self.sensor.fov = 40
       self.sensor.proj_matrix = pb.computeProjectionMatrixFOV(self.sensor.fov, 1, self.sensor.near, self.sensor.far)
-      rgb_img = self.sensor.getRGBImg(self.heightmap_size)
-      depth_img = self.sensor.getDepthImg(self.heightmap_size).reshape(1, self.heightmap_size, self.heightmap_size)
-      depth = np.concatenate([rgb_img, depth_img])
+      depth = self._getRGBDImg()
       if self.view_type == 'camera_side_rgbd_60_undis':
         if self.heightmap_size == 64:
           matrix = np.array([[  1.3096,   0.2665,  -9.7538],
@@ -502,15 +546,13 @@ class CloseLoopEnv(BaseEnv):
       cam_pos = [1, self.workspace[1].mean()-0.05, 0.6]
       target_pos = [self.workspace[0].mean()-0.05, self.workspace[1].mean()-0.05, 0]
       cam_up_vector = [-1, 0, 0]
-      self.sensor = Sensor(cam_pos, cam_up_vector, target_pos, 0.7, 0.1, 3)
+      self.sensor = Sensor(cam_pos, cam_up_vector, target_pos, 0.7, 0.1, 3, client_id=self.client_id)
       self.sensor.fov = 40
       self.sensor.proj_matrix = pb.computeProjectionMatrixFOV(self.sensor.fov, 1, self.sensor.near, self.sensor.far)
       if self.view_type == 'camera_side_offset':
         depth = self.sensor.getDepthImg(self.heightmap_size)
       elif self.view_type == 'camera_side_offset_rgbd':
-        rgb_img = self.sensor.getRGBImg(self.heightmap_size)
-        depth_img = self.sensor.getDepthImg(self.heightmap_size).reshape(1, self.heightmap_size, self.heightmap_size)
-        depth = np.concatenate([rgb_img, depth_img])
+        depth = self._getRGBDImg()
       else:
         depth = self.sensor.getHeightmap(self.heightmap_size)
       return depth
@@ -59,13 +59,13 @@ class CloseLoopHouseholdPickingClutteredEnv(CloseLoopEnv):
                                      random_orientation=self.random_orientation,
                                      pos=[randpos], padding=0.1,
                                      min_distance=0, model_id=i+2 if self.fix_set else -1)
-          pb.changeDynamics(obj[0].object_id, -1, lateralFriction=0.6)
+          pb.changeDynamics(obj[0].object_id, -1, lateralFriction=0.6, physicsClientId=self.client_id)
           self.wait(10)
       except NoValidPositionException:
         continue
       else:
         break
-    self.wait(200)
+    self.settle(200)
 
     self.obj_grasped = 0
     self.grasp_done = 0
@@ -44,6 +44,32 @@ DEFAULT_CONFIG = {
   'object_type' : 'cube',
   # The number of episodes to run a hard reset of pybullet
   'hard_reset_freq': 1000,
+  # If True, snapshot the world containing the robot and the static equipment after each hard reset and restore the
+  # snapshot in the following resets instead of only moving the robot back to its home pose
+  'scene_template': False,
+  # If True, park the objects of a finished episode out of the workspace instead of removing them and reuse them when
+  # an object with the same class, model and scale is generated again
+  'object_pool': False,
+  # How the env waits for the objects to settle after an action or after generating objects. Choices: 'fixed' (step
+  # the simulation for the full number of steps), 'adaptive' (stop early once all objects are at rest)
+  'settle_mode': 'fixed',
+  # In the adaptive settle mode, the objects are at rest once their linear (m/s) and angular (rad/s) velocities are
+  # below this threshold. The velocities are checked every settle_chunk simulation steps
+  'settle_velocity_threshold': 1e-3,
+  'settle_chunk': 10,
+  # The maximum number of simulation steps of a settle. None keeps the number of steps of each call, e.g. 100 after an
+  # action
+  'settle_max_steps': None,
+  # If True, enable the sleeping of the objects in pybullet so objects at rest are not simulated
+  'body_sleeping': False,
+  # How the top-down heightmap observation is produced. Choices: 'camera' (render it), 'analytic' (rasterize it from the
+  # poses of the blocks when the scene only contains cubes, bricks, triangles, roofs and cylinders, and render it otherwise)
+  'heightmap_backend': 'camera',
+  # The dtype of the pixel observations. Choices: 'float64', 'float32', 'float16', 'uint16', 'uint8'. The integer dtypes
+  # store the heights in units of constants.OBS_DTYPE_SCALE, from 0 up to 0.4m (uint8) or 0.65m (uint16). The close loop
+  # envs only support them for the view types of absolute heights ('render_fix', 'render_center_height' and the
+  # '*_height' camera views other than 'camera_side_height')
+  'obs_dtype': 'float64',
   # The type of the observation. Choices: 'render_center', 'render_center_height', 'render_fix', 'camera_center_xyzr',
   #                                       'camera_center_xyr', 'camera_center_xyz', 'camera_center_xy', 'camera_fix',
   #                                       'camera_center_xyr_height', 'camera_center_xyz_height',
@@ -69,6 +95,25 @@ DEFAULT_CONFIG = {
   # moving to pre pose the gripper will shift around. Adjusting before lifting will make the gripper more stable while
   # moving to the pre pose, but will reduce the chance for a grasp, especially in the cluttered scene.
   'adjust_gripper_after_lift': False,
+  # The number of simulation steps between two joint state reads while the arm moves. Bigger values reduce the cost of
+  # the convergence checks, but the arm may move up to motion_chunk - 1 steps past convergence
+  'motion_chunk': 1,
+  # The number of IK solutions of end effector movements kept by the robot. For a pose within ik_cache_resolution of a
+  # cached one, the cached joint positions are used without solving the IK if all the arm joints are within
+  # ik_cache_joint_tolerance (rad) of them, otherwise the IK is warm started from them. 0 disables the cache
+  'ik_cache_size': 0,
+  'ik_cache_resolution': 1e-3,
+  'ik_cache_joint_tolerance': 0.5,
+  # The step budget of the gripper movements, the number of simulation steps between two joint state reads while the
+  # gripper moves, and the motor force on all the gripper joints at which a gripper movement stops (None to only stop
+  # once the fingers reach the target or stall)
+  'gripper_max_steps': 100,
+  'gripper_chunk': 1,
+  'gripper_force_threshold': None,
+  # How the pick and place primitives are executed. Choices: 'dynamic' (the grasp is simulated if simulate_grasp),
+  # 'kinematic' (requires simulate_grasp=False, the arm is teleported and the object under the fingers at the grasp pose
+  # is attached to the gripper without simulating the grasp)
+  'primitive_mode': 'dynamic',
   # The offset when adjusting gripper commands after gripper closes at an object. A bigger value increases the chance
   # for a grasp, but reduces the stability while holding it. Recommended value 0.01 or 0.001
   'kuka_adjust_gripper_offset': 0.01,
@@ -88,6 +133,12 @@ DEFAULT_CONFIG = {
   #   'trans_robot': make the robot transparent.
   # Example: 'workspace_option': ['white_plane', 'black_workspace']
   'workspace_option': [],
+  # How the render_* observations fill the pixels no point is projected to. Choices: 'edt' (nearest valid pixel using a
+  # distance transform), 'nearest' (nearest valid pixel using a KD-tree, slower)
+  'hole_filling': 'edt',
+  # If True, the render_* observations only capture the point cloud again once an object moved, and leave the robot out
+  # of the point cloud (the gripper is painted on the observation)
+  'incremental_render': False,
 
   ## Deprecated parameters ##
   'pos_candidate': None,
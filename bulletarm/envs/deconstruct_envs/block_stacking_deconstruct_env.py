@@ -29,7 +29,7 @@ class BlockStackingDeconstructEnv(DeconstructEnv):
     for i in range(self.num_obj):
       self.generateStructureShape((pos[0], pos[1], i * self.max_block_size + self.max_block_size / 2), rot,
                                   constants.CUBE)
-    self.wait(50)
+    self.settle(50)
 
 def createBlockStackingDeconstructEnv(config):
   return BlockStackingDeconstructEnv(config)
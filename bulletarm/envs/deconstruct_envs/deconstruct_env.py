@@ -46,7 +46,8 @@ class DeconstructEnv(BaseEnv):
       motion_primative, x, y, z, rot = self._decodeAction(action)
       in_hand_img = self.getInHandImage(self.heightmap, x, y, z, rot, old_heightmap)
 
-    return self._isHolding(), in_hand_img, self.heightmap.reshape([1, self.heightmap_size, self.heightmap_size])
+    return self._isHolding(), in_hand_img, \
+           self._castObservation(self.heightmap.reshape([1, self.heightmap_size, self.heightmap_size]))
 
   def resetDeconstructEnv(self):
     self.resetPybulletWorkspace()
@@ -82,7 +83,7 @@ class DeconstructEnv(BaseEnv):
   def step(self, action):
     reward = 1.0 if self.checkStructure() else 0.0
     self.takeAction(action)
-    self.wait(100)
+    self.settle(100)
     obs = self._getObservation(action)
     motion_primative, x, y, z, rot = self._decodeAction(action)
     done = motion_primative and self._checkTermination()
@@ -107,17 +108,17 @@ class DeconstructEnv(BaseEnv):
       scale = npr.choice(np.arange(self.block_scale_range[0], self.block_scale_range[1] + 0.01, 0.02))
 
     if obj_type == constants.CUBE:
-      handle = pb_obj_generation.generateCube(pos, rot, scale)
+      handle = pb_obj_generation.generateCube(pos, rot, scale, client_id=self.client_id)
     elif obj_type == constants.BRICK:
-      handle = pb_obj_generation.generateBrick(pos, rot, scale)
+      handle = pb_obj_generation.generateBrick(pos, rot, scale, client_id=self.client_id)
     elif obj_type == constants.ROOF:
-      handle = pb_obj_generation.generateRoof(pos, rot, scale)
+      handle = pb_obj_generation.generateRoof(pos, rot, scale, client_id=self.client_id)
     elif obj_type == constants.TRIANGLE:
-      handle = pb_obj_generation.generateTriangle(pos, rot, scale)
+      handle = pb_obj_generation.generateTriangle(pos, rot, scale, client_id=self.client_id)
     elif obj_type == constants.CYLINDER:
-      handle = pb_obj_generation.generateCylinder(pos, rot, scale)
+      handle = pb_obj_generation.generateCylinder(pos, rot, scale, client_id=self.client_id)
     elif obj_type == constants.RANDOM:
-      handle = pb_obj_generation.generateRandomObj(pos, rot, scale)
+      handle = pb_obj_generation.generateRandomObj(pos, rot, scale, client_id=self.client_id)
     else:
       raise NotImplementedError
     self.objects.append(handle)
@@ -128,19 +129,19 @@ class DeconstructEnv(BaseEnv):
   def generateStructureRandomShapeWithZScale(self, pos, rot, zscale=1):
     handle = pb_obj_generation.generateRandomObj(pos, rot,
                                                  npr.uniform(self.block_scale_range[0], self.block_scale_range[1]),
-                                                 zscale)
+                                                 zscale, client_id=self.client_id)
     self.objects.append(handle)
     self.object_types[handle] = constants.RANDOM
     self.structure_objs.append(handle)
 
   def generateStructureRandomShapeWithScaleAndZScale(self, pos, rot, scale, zscale):
-    handle = pb_obj_generation.generateRandomObj(pos, rot, scale, zscale)
+    handle = pb_obj_generation.generateRandomObj(pos, rot, scale, zscale, client_id=self.client_id)
     self.objects.append(handle)
     self.object_types[handle] = constants.RANDOM
     self.structure_objs.append(handle)
 
   def generateStructureRandomBrickShape(self, pos, rot, x_scale=0.6, y_scale=0.6, z_scale=0.6):
-    handle = pb_obj_generation.generateRandomBrick(pos, rot, x_scale, y_scale, z_scale)
+    handle = pb_obj_generation.generateRandomBrick(pos, rot, x_scale, y_scale, z_scale, client_id=self.client_id)
     self.objects.append(handle)
     self.object_types[handle] = constants.BRICK
     self.structure_objs.append(handle)
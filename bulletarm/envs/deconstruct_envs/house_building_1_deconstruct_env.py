@@ -28,7 +28,7 @@ class HouseBuilding1DeconstructEnv(DeconstructEnv):
                                   constants.CUBE)
     self.generateStructureShape((pos[0], pos[1], (self.num_obj - 1) * self.max_block_size + self.max_block_size / 2),
                                 rot, constants.TRIANGLE)
-    self.wait(50)
+    self.settle(50)
 
   def isSimValid(self):
     triangles = list(filter(lambda x: self.object_types[x] == constants.TRIANGLE, self.objects))
@@ -30,7 +30,7 @@ class HouseBuildingXDeconstructEnv(DeconstructEnv):
   def step(self, action):
     reward = 1.0 if self.checkStructure() else 0.0
     self.takeAction(action)
-    self.wait(100)
+    self.settle(100)
     obs = self._getObservation(action)
     motion_primative, x, y, z, rot = self._decodeAction(action)
     done = motion_primative and self._checkTermination()
@@ -67,7 +67,7 @@ class ImproviseHouseBuilding3DeconstructEnv(DeconstructEnv):
                                            brick_xscale, brick_yscale, brick_zscale)
 
     self.generateStructureShape((x, y, self.max_block_size * 2.5), pb.getQuaternionFromEuler([0., 0., r]), constants.ROOF)
-    self.wait(50)
+    self.settle(50)
 
   def isSimValid(self):
     roofs = list(filter(lambda x: self.object_types[x] == constants.ROOF, self.objects))
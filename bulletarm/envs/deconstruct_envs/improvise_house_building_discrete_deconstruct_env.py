@@ -86,7 +86,7 @@ class ImproviseHouseBuildingDiscreteEnv(DeconstructEnv):
     x, y, r = self.getXYRFrom2BasePos(pos1, pos2)
 
     self.generateStructureShape((x, y, roof_z), pb.getQuaternionFromEuler([0., 0., r]), constants.ROOF)
-    self.wait(50)
+    self.settle(50)
 
   def isSimValid(self):
     roofs = list(filter(lambda x: self.object_types[x] == constants.ROOF, self.objects))
@@ -44,9 +44,9 @@ class RampBaseEnv(BaseEnv):
     self.ramp2_height = np.random.random() * 0.01
 
     if self.ramp1_id > -1:
-      pb.removeBody(self.ramp1_id)
+      pb.removeBody(self.ramp1_id, physicsClientId=self.client_id)
     if self.ramp2_id > -1:
-      pb.removeBody(self.ramp2_id)
+      pb.removeBody(self.ramp2_id, physicsClientId=self.client_id)
     root_dir = os.path.dirname(bulletarm.__file__)
     urdf_filepath = os.path.join(root_dir, constants.OBJECTS_PATH, 'tilt.urdf')
 
@@ -56,16 +56,16 @@ class RampBaseEnv(BaseEnv):
                                  self.ramp1_dist_to_center * np.cos(self.ramp_rz),
                                  self.ramp1_height],
                                 pb.getQuaternionFromEuler([self.ramp1_angle, 0, self.ramp_rz]),
-                                globalScaling=1)
+                                globalScaling=1, physicsClientId=self.client_id)
     self.ramp2_angle = (self.rx_range[0] - self.rx_range[1]) * np.random.random_sample() + self.rx_range[0]
     self.ramp2_id = pb.loadURDF(urdf_filepath,
                                 [self.workspace[0].mean() + self.ramp2_dist_to_center * np.sin(self.ramp_rz),
                                  -self.ramp2_dist_to_center * np.cos(self.ramp_rz),
                                  self.ramp2_height],
                                 pb.getQuaternionFromEuler([-self.ramp2_angle, 0, self.ramp_rz + np.pi]),
-                                globalScaling=1)
-    pb.changeVisualShape(self.ramp1_id, -1, rgbaColor=[0.8706, 0.7216, 0.5294, 1])
-    pb.changeVisualShape(self.ramp2_id, -1, rgbaColor=[0.8706, 0.7216, 0.5294, 1])
+                                globalScaling=1, physicsClientId=self.client_id)
+    pb.changeVisualShape(self.ramp1_id, -1, rgbaColor=[0.8706, 0.7216, 0.5294, 1], physicsClientId=self.client_id)
+    pb.changeVisualShape(self.ramp2_id, -1, rgbaColor=[0.8706, 0.7216, 0.5294, 1], physicsClientId=self.client_id)
 
   def getY1Y2fromX(self, x):
     y1 = np.tan(self.ramp_rz) * x - np.tan(self.ramp_rz) * (self.workspace[0].mean() - self.ramp1_dist_to_center / np.sin(self.ramp_rz))
@@ -29,7 +29,7 @@ class RampImproviseHouseBuilding3Env(RampBaseEnv):
       brick_xscale = np.random.uniform(0.5, 0.7)
       brick_yscale = np.random.uniform(0.5, 0.7)
       brick_zscale = np.random.uniform(0.4, 0.7)
-      handle = object_generation.generateRandomBrick(poss[i], rots[i], brick_xscale, brick_yscale, brick_zscale)
+      handle = object_generation.generateRandomBrick(poss[i], rots[i], brick_xscale, brick_yscale, brick_zscale, client_id=self.client_id)
       self.objects.append(handle)
       self.object_types[handle] = constants.BRICK
 
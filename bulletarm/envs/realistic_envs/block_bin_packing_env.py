@@ -31,7 +31,7 @@ class BlockBinPackingEnv(BaseEnv):
       config['min_boarder_padding'] = 0.05
 
     super().__init__(config)
-    self.box = ContainerBox()
+    self.box = ContainerBox(client_id=self.client_id)
     self.box_rz = 0
     self.box_pos = [0.60, 0.12, 0]
     self.box_size = [0.23*self.block_scale_range[1], 0.15*self.block_scale_range[1], 0.1]
@@ -20,7 +20,7 @@ class BlockPickingEnv(BaseEnv):
   def step(self, action):
     pre_obj_grasped = self.obj_grasped
     self.takeAction(action)
-    self.wait(100)
+    self.settle(100)
     obs = self._getObservation(action)
     done = self._checkTermination()
     if self.reward_type == 'dense':
@@ -27,7 +27,7 @@ class BottleTrayEnv(BaseEnv):
       config['kuka_adjust_gripper_offset'] = 0.0025
     super().__init__(config)
     self.place_offset = 0.2*self.block_scale_range[1]
-    self.box = ContainerBox()
+    self.box = ContainerBox(client_id=self.client_id)
     self.box_rz = 0
     self.box_size = [0.1*self.block_scale_range[1]*3, 0.1*self.block_scale_range[1]*2, 0.05]
     self.box_pos = [0.4, 0.2, 0]
@@ -57,7 +57,8 @@ class BoxPalletizingEnv(BaseEnv):
     self.pallet_pos.append(self.pallet_z)
 
     self.pallet = Pallet(self.pallet_pos, transformations.quaternion_from_euler(0, 0, self.pallet_rz),
-                         np.random.choice(np.arange(self.block_scale_range[0], self.block_scale_range[1]+0.01, 0.02)))
+                         np.random.choice(np.arange(self.block_scale_range[0], self.block_scale_range[1]+0.01, 0.02)),
+                         client_id=self.client_id)
 
     # pos candidate for odd layer
     dx = self.pallet_size[0] / 6
@@ -95,7 +96,7 @@ class BoxPalletizingEnv(BaseEnv):
   def reset(self):
     while True:
       if self.pallet is not None:
-        pb.removeBody(self.pallet.object_id)
+        pb.removeBody(self.pallet.object_id, physicsClientId=self.client_id)
       self.resetPybulletWorkspace()
       self.resetPallet()
       try:
@@ -109,14 +110,14 @@ class BoxPalletizingEnv(BaseEnv):
 
   def step(self, action):
     self.takeAction(action)
-    self.wait(100)
+    self.settle(100)
     n_obj_on_ground = len(list(filter(lambda o: self._isObjOnGround(o), self.objects)))
     level1_objs, level2_objs, level3_objs = self.getObjEachLevel()
     # if level 2 is filled, freeze the level 1 boxes to speed up simulation
     if len(level2_objs) == 6 and len(level3_objs) == 0:
       for obj in level1_objs:
-        pb.changeDynamics(obj.object_id, -1, mass=0)
-        pb.resetBaseVelocity(obj.object_id, [0, 0, 0], [0, 0, 0])
+        pb.changeDynamics(obj.object_id, -1, mass=0, physicsClientId=self.client_id)
+        pb.resetBaseVelocity(obj.object_id, [0, 0, 0], [0, 0, 0], physicsClientId=self.client_id)
     if self.isSimValid() and len(self.objects) < self.num_obj and not self._isHolding() and n_obj_on_ground == 0:
       self.generateOneBox()
     obs = self._getObservation(action)
@@ -147,9 +148,10 @@ class BoxPalletizingEnv(BaseEnv):
     level2_threshold = self.pallet_height + 1.25 * self.box_height - 0.01
     level3_threshold = self.pallet_height + 2.25 * self.box_height - 0.01
     level4_threshold = self.pallet_height + 3.25 * self.box_height - 0.01
-    level1_objs = list(filter(lambda o: level1_threshold < o.getZPosition() < level2_threshold, self.objects))
-    level2_objs = list(filter(lambda o: level2_threshold < o.getZPosition() < level3_threshold, self.objects))
-    level3_objs = list(filter(lambda o: level3_threshold < o.getZPosition() < level4_threshold, self.objects))
+    zs = self.getObjectPoseSnapshot()[:, 2]
+    level1_objs = [o for o, z in zip(self.objects, zs) if level1_threshold < z < level2_threshold]
+    level2_objs = [o for o, z in zip(self.objects, zs) if level2_threshold < z < level3_threshold]
+    level3_objs = [o for o, z in zip(self.objects, zs) if level3_threshold < z < level4_threshold]
     return level1_objs, level2_objs, level3_objs
 
   def getNEachLevel(self):
@@ -161,9 +163,9 @@ class BoxPalletizingEnv(BaseEnv):
 
   def checkRzValid(self):
     level1_objs, level2_objs, level3_objs = self.getObjEachLevel()
-    level1_rz = list(map(lambda o: transformations.euler_from_quaternion(o.getRotation())[2], level1_objs))
-    level2_rz = list(map(lambda o: transformations.euler_from_quaternion(o.getRotation())[2], level2_objs))
-    level3_rz = list(map(lambda o: transformations.euler_from_quaternion(o.getRotation())[2], level3_objs))
+    level1_rz = list(map(lambda rot: transformations.euler_from_quaternion(rot)[2], self.getObjectPoseSnapshot(level1_objs)[:, 3:]))
+    level2_rz = list(map(lambda rot: transformations.euler_from_quaternion(rot)[2], self.getObjectPoseSnapshot(level2_objs)[:, 3:]))
+    level3_rz = list(map(lambda rot: transformations.euler_from_quaternion(rot)[2], self.getObjectPoseSnapshot(level3_objs)[:, 3:]))
     level1_rz_goal = self.pallet_rz + np.pi / 2
     if level1_rz_goal > np.pi:
       level1_rz_goal -= np.pi
@@ -188,7 +190,7 @@ class BoxPalletizingEnv(BaseEnv):
 
   def _changeBoxDynamics(self, box):
     pb.changeDynamics(box.object_id, -1, linearDamping=0.04, angularDamping=0.04, restitution=0,
-                      contactStiffness=3000, contactDamping=100)
+                      contactStiffness=3000, contactDamping=100, physicsClientId=self.client_id)
 
 def createBoxPalletizingEnv(config):
   return BoxPalletizingEnv(config)
@@ -57,7 +57,7 @@ class CovidTestEnv(BaseEnv):
     center_y = (self.workspace[1, 0] + self.workspace[1, 1]) / 2
     self.workspace_center = np.array([center_x, center_y, 0])
 
-    self.boxs = [BoxColor(), BoxColor(), BoxColor(), BoxColor()]
+    self.boxs = [BoxColor(client_id=self.client_id) for _ in range(4)]
     self.new_tube_box_size = np.array([0.17, 0.21, 0.005])
     # self.santilizing_box_size = np.array([0.2, 0.07, 0.035])
     self.used_tube_box_size = np.array([0.12, 0.08, 0.04])
@@ -222,7 +222,7 @@ class CovidTestEnv(BaseEnv):
       for obj in on_table_obj:
         if obj.object_type_id == constants.SWAB:
           self.objects.remove(obj)
-          pb.removeBody(obj.object_id)
+          pb.removeBody(obj.object_id, physicsClientId=self.client_id)
         if obj.object_type_id == constants.TEST_TUBE:
           # if self.rot_n % 2 == 1:
           #   rot_test_box_size = [self.test_box_size[1], self.test_box_size[0]]
@@ -247,7 +247,7 @@ class CovidTestEnv(BaseEnv):
 
     if self.used_tube is not None and self.used_tube in self.tubesInUsedBox():
       self.used_tube = None
-    self.wait(100)
+    self.settle(100)
     obs = self._getObservation(action)
     done = self._checkTermination()
     if done:
@@ -265,10 +265,10 @@ class CovidTestEnv(BaseEnv):
     return obs, reward, done
 
   def isObjInBox(self, obj, box):
-    pos, rot = pb.getBasePositionAndOrientation(box.id)
+    pos, rot = pb.getBasePositionAndOrientation(box.id, physicsClientId=self.client_id)
     pos = np.array(pos[:2])
     rot = pb.getEulerFromQuaternion(rot)[2]
-    obj_pos, _ = pb.getBasePositionAndOrientation(obj.object_id)
+    obj_pos, _ = pb.getBasePositionAndOrientation(obj.object_id, physicsClientId=self.client_id)
     obj_pos = np.array(obj_pos[:2])
     obj_pos -= pos
     R_inv = np.array([[np.cos(-rot), -np.sin(-rot)],
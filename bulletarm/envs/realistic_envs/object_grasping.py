@@ -7,7 +7,6 @@ from bulletarm.envs.base_env import BaseEnv
 from bulletarm.pybullet.utils import constants
 from bulletarm.pybullet.utils.constants import NoValidPositionException
 from bulletarm.pybullet.equipments.tray import Tray
-from scipy.ndimage.interpolation import rotate
 import pybullet as pb
 
 class ObjectGrasping(BaseEnv):
@@ -33,7 +32,7 @@ class ObjectGrasping(BaseEnv):
         super(ObjectGrasping, self).__init__(config)
         self.object_init_z = 0.1
         self.obj_grasped = 0
-        self.tray = Tray()
+        self.tray = Tray(client_id=self.client_id)
         self.exhibit_env_obj = False
         # self.exhibit_env_obj = True
         self.bin_size = self.workspace_size - 0.1
@@ -95,12 +94,11 @@ class ObjectGrasping(BaseEnv):
         :return: safe z
         """
         row_pixel, col_pixel = self._getPixelsFromPos(x, y)
-        # local_region is as large as ih_img
-        local_region = self.heightmap[int(row_pixel - self.in_hand_size / 2): int(row_pixel + self.in_hand_size / 2),
-                       int(col_pixel - self.in_hand_size / 2): int(col_pixel + self.in_hand_size / 2)]
-        local_region = rotate(local_region, angle=-rz * 180 / np.pi, reshape=False)
-        patch = local_region[int(self.in_hand_size / 2 - 16):int(self.in_hand_size / 2 + 16),
-                int(self.in_hand_size / 2 - 4):int(self.in_hand_size / 2 + 4)]
+        # local_region is as large as ih_img, only the patch of the rotated region is computed
+        local_region = self.patch_extractor.crop(self.heightmap, row_pixel, col_pixel)
+        patch = self.patch_extractor.rotate(local_region, -rz * 180 / np.pi, order=3,
+                                            rows=slice(int(self.in_hand_size / 2 - 16), int(self.in_hand_size / 2 + 16)),
+                                            cols=slice(int(self.in_hand_size / 2 - 4), int(self.in_hand_size / 2 + 4)))
         if z is None:
             edge = patch.copy()
             edge[5:-5] = 0
@@ -124,7 +122,7 @@ class ObjectGrasping(BaseEnv):
     def step(self, action):
         pre_obj_grasped = self.obj_grasped
         self.takeAction(action)
-        self.wait(100)
+        self.settle(100)
         # remove obj that above a threshold hight
         # for obj in self.objects:
         #   if obj.getPosition()[2] > self.pick_pre_offset:
@@ -188,7 +186,7 @@ class ObjectGrasping(BaseEnv):
                                                        random_orientation=self.random_orientation,
                                                        pos=[randpos], padding=self.min_boarder_padding,
                                                        min_distance=self.min_object_distance, model_id=-1)
-                            pb.changeDynamics(obj[0].object_id, -1, lateralFriction=0.6)
+                            pb.changeDynamics(obj[0].object_id, -1, lateralFriction=0.6, physicsClientId=self.client_id)
                             self.wait(10)
                     # elif True:
                     # #create ducks
@@ -242,7 +240,7 @@ class ObjectGrasping(BaseEnv):
                     continue
                 else:
                     break
-            self.wait(200)
+            self.settle(200)
             self.obj_grasped = 0
             # self.num_in_tray_obj = self.num_obj
         return self._getObservation()
@@ -18,7 +18,7 @@ class RandomBlockPickingClutterEnv(BaseEnv):
     super(RandomBlockPickingClutterEnv, self).__init__(config)
     self.object_init_z = 0.1
     self.obj_grasped = 0
-    self.box = ContainerBox()
+    self.box = ContainerBox(client_id=self.client_id)
 
   def initialize(self):
     super().initialize()
@@ -29,7 +29,7 @@ class RandomBlockPickingClutterEnv(BaseEnv):
   def step(self, action):
     pre_obj_grasped = self.obj_grasped
     self.takeAction(action)
-    self.wait(100)
+    self.settle(100)
     obs = self._getObservation(action)
     done = self._checkTermination()
     if self.reward_type == 'dense':
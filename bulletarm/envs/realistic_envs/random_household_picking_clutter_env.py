@@ -3,7 +3,6 @@ from bulletarm.envs.base_env import BaseEnv
 from bulletarm.pybullet.utils import constants
 from bulletarm.pybullet.utils.constants import NoValidPositionException
 from bulletarm.pybullet.equipments.tray import Tray
-from scipy.ndimage.interpolation import rotate
 import pybullet as pb
 
 class RandomHouseholdPickingClutterEnv(BaseEnv):
@@ -20,7 +19,7 @@ class RandomHouseholdPickingClutterEnv(BaseEnv):
     super(RandomHouseholdPickingClutterEnv, self).__init__(config)
     self.object_init_z = 0.1
     self.obj_grasped = 0
-    self.tray = Tray()
+    self.tray = Tray(client_id=self.client_id)
 
   def initialize(self):
     super().initialize()
@@ -69,15 +68,11 @@ class RandomHouseholdPickingClutterEnv(BaseEnv):
                         [-np.sin(rz), np.cos(rz)]])
         rotated_transition = R.dot(transition) + np.array([self.heightmap_size / 2, self.heightmap_size / 2])
 
-        rotated_heightmap = rotate(self.heightmap, angle=rz * 180 / np.pi, reshape=False)
-        # patch = rotated_heightmap[int(rotated_transition[0] - patch_size / 2):
-        #                           int(rotated_transition[0] + patch_size / 2),
-        #                           int(rotated_transition[1] - patch_size / 2):
-        #                           int(rotated_transition[1] + patch_size / 2)]
-        patch = rotated_heightmap[int(rotated_transition[0] - 6):
-                                  int(rotated_transition[0] + 6),
-                                  int(rotated_transition[1] - patch_size / 2):
-                                  int(rotated_transition[1] + patch_size / 2)]
+        # only the patch of the rotated heightmap is computed
+        patch = self.patch_extractor.rotate(self.heightmap, rz * 180 / np.pi, order=3,
+                                            rows=slice(int(rotated_transition[0] - 6), int(rotated_transition[0] + 6)),
+                                            cols=slice(int(rotated_transition[1] - patch_size / 2),
+                                                       int(rotated_transition[1] + patch_size / 2)))
         z = (np.min(patch) + np.max(patch)) / 2
         gripper_depth = 0.015
         gripper_reach = 0.02
@@ -88,7 +83,7 @@ class RandomHouseholdPickingClutterEnv(BaseEnv):
   def step(self, action):
     pre_obj_grasped = self.obj_grasped
     self.takeAction(action)
-    self.wait(200)
+    self.settle(200)
     # remove obj that above a threshold hight
     # for obj in self.objects:
     #   if obj.getPosition()[2] > self.pick_pre_offset:
@@ -130,7 +125,7 @@ class RandomHouseholdPickingClutterEnv(BaseEnv):
           obj = self._generateShapes(constants.RANDOM_HOUSEHOLD, 1, random_orientation=self.random_orientation,
                                      pos=[randpos], padding=self.min_boarder_padding,
                                      min_distance=self.min_object_distance)
-          pb.changeDynamics(obj[0].object_id, -1, lateralFriction=0.6)
+          pb.changeDynamics(obj[0].object_id, -1, lateralFriction=0.6, physicsClientId=self.client_id)
       except NoValidPositionException:
         continue
       else:
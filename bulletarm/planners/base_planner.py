@@ -113,9 +113,8 @@ class BasePlanner(object):
     return self.env.max_block_size
 
   def getDistance(self, obj1, obj2):
-    position1 = obj1.getPosition()
-    position2 = obj2.getPosition()
-    return np.linalg.norm(np.array(position1) - np.array(position2))
+    position1, position2 = self.env.getObjectPoseSnapshot([obj1, obj2])[:, :3]
+    return np.linalg.norm(position1 - position2)
 
   def getValidPositions(self, padding, min_distance, existing_positions, num_shapes, sample_range=None):
     return self.env._getValidPositions(padding, min_distance, existing_positions, num_shapes, sample_range)
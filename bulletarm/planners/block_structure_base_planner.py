@@ -269,7 +269,7 @@ class BlockStructureBasePlanner(BasePlanner):
     objects = np.array(list(filter(lambda x: not self.isObjectHeld(x), objects)))
     object_poses = self.env.getObjectPoses(objects)
 
-    AABBs = list(map(lambda obj: pb.getAABB(obj.object_id), objects))
+    AABBs = list(map(lambda obj: pb.getAABB(obj.object_id, physicsClientId=self.env.client_id), objects))
     sizes = list(map(lambda x: (x[1][0] - x[0][0]) * (x[1][1] - x[0][1]) * (x[1][2] - x[0][2]), AABBs))
 
     if ascend:
@@ -108,7 +108,7 @@ class CovidTestPlanner(BlockStructureBasePlanner):
         objs, types = self.env.OnTableObj()
         for obj, type in zip(objs, types):
           if type == constants.TEST_TUBE:
-            pos, _ = pb.getBasePositionAndOrientation(obj.object_id)
+            pos, _ = pb.getBasePositionAndOrientation(obj.object_id, physicsClientId=self.env.client_id)
             rand_x, rand_y, rand_z = pos
 
       rand_trans = np.array([np.random.uniform(-0.02, 0.02), 0.1 * (int(np.random.rand() > 0.5) - 0.5)])
@@ -6,29 +6,30 @@ import bulletarm
 from bulletarm.pybullet.utils import pybullet_util
 
 class Blanket:
-  def __init__(self):
+  def __init__(self, client_id=0):
+    self.client_id = client_id
     self.root_dir = os.path.dirname(bulletarm.__file__)
     self.id = None
     self.object_id = self.id
 
   def initialize(self, pos=(0,0,0), rot=(0,0,0,1), size=(0.2, 0.2, 0.2)):
-    bottom_visual = pb.createVisualShape(pb.GEOM_BOX, halfExtents=[size[0]/2, size[1]/2, size[2]/2], rgbaColor=[1, 1, 1, 1])
-    bottom_collision = pb.createCollisionShape(pb.GEOM_BOX, halfExtents=[size[0]/2, size[1]/2, size[2]/2])
+    bottom_visual = pb.createVisualShape(pb.GEOM_BOX, halfExtents=[size[0]/2, size[1]/2, size[2]/2], rgbaColor=[1, 1, 1, 1], physicsClientId=self.client_id)
+    bottom_collision = pb.createCollisionShape(pb.GEOM_BOX, halfExtents=[size[0]/2, size[1]/2, size[2]/2], physicsClientId=self.client_id)
 
     self.id = pb.createMultiBody(baseMass=0,
                                  baseCollisionShapeIndex=bottom_collision,
                                  baseVisualShapeIndex=bottom_visual,
                                  basePosition=pos,
-                                 baseOrientation=rot,
+                                 baseOrientation=rot, physicsClientId=self.client_id,
     )
     self.object_id = self.id
 
   def reset(self, pos=(0,0,0), rot=(0,0,0,1)):
-    pb.resetBasePositionAndOrientation(self.id, pos, rot)
+    pb.resetBasePositionAndOrientation(self.id, pos, rot, physicsClientId=self.client_id)
 
   def remove(self):
     if self.id:
-      pb.removeBody(self.id)
+      pb.removeBody(self.id, physicsClientId=self.client_id)
     self.id = None
     self.object_id = self.id
 
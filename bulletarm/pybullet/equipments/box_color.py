@@ -6,26 +6,27 @@ import bulletarm
 from bulletarm.pybullet.utils import pybullet_util
 
 class BoxColor:
-  def __init__(self):
+  def __init__(self, client_id=0):
+    self.client_id = client_id
     self.root_dir = os.path.dirname(bulletarm.__file__)
     self.id = None
     self.size = None
 
   def initialize(self, pos=(0,0,0), rot=(0,0,0,1), size=(0.2, 0.2, 0.2), color=[1, 1, 1, 1]):
-    bottom_visual = pb.createVisualShape(pb.GEOM_BOX, halfExtents=[size[0]/2, size[1]/2, 0.002], rgbaColor=color)
-    bottom_collision = pb.createCollisionShape(pb.GEOM_BOX, halfExtents=[size[0]/2, size[1]/2, 0.002])
+    bottom_visual = pb.createVisualShape(pb.GEOM_BOX, halfExtents=[size[0]/2, size[1]/2, 0.002], rgbaColor=color, physicsClientId=self.client_id)
+    bottom_collision = pb.createCollisionShape(pb.GEOM_BOX, halfExtents=[size[0]/2, size[1]/2, 0.002], physicsClientId=self.client_id)
 
-    front_visual = pb.createVisualShape(pb.GEOM_BOX, halfExtents=[0.002, size[1]/2, size[2]/2], rgbaColor=color)
-    front_collision = pb.createCollisionShape(pb.GEOM_BOX, halfExtents=[0.002, size[1]/2, size[2]/2])
+    front_visual = pb.createVisualShape(pb.GEOM_BOX, halfExtents=[0.002, size[1]/2, size[2]/2], rgbaColor=color, physicsClientId=self.client_id)
+    front_collision = pb.createCollisionShape(pb.GEOM_BOX, halfExtents=[0.002, size[1]/2, size[2]/2], physicsClientId=self.client_id)
 
-    back_visual = pb.createVisualShape(pb.GEOM_BOX, halfExtents=[0.002, size[1] / 2, size[2] / 2], rgbaColor=color)
-    back_collision = pb.createCollisionShape(pb.GEOM_BOX, halfExtents=[0.002, size[1] / 2, size[2] / 2])
+    back_visual = pb.createVisualShape(pb.GEOM_BOX, halfExtents=[0.002, size[1] / 2, size[2] / 2], rgbaColor=color, physicsClientId=self.client_id)
+    back_collision = pb.createCollisionShape(pb.GEOM_BOX, halfExtents=[0.002, size[1] / 2, size[2] / 2], physicsClientId=self.client_id)
 
-    left_visual = pb.createVisualShape(pb.GEOM_BOX, halfExtents=[size[0]/2, 0.002, size[2] / 2], rgbaColor=color)
-    left_collision = pb.createCollisionShape(pb.GEOM_BOX, halfExtents=[size[0]/2, 0.002, size[2] / 2])
+    left_visual = pb.createVisualShape(pb.GEOM_BOX, halfExtents=[size[0]/2, 0.002, size[2] / 2], rgbaColor=color, physicsClientId=self.client_id)
+    left_collision = pb.createCollisionShape(pb.GEOM_BOX, halfExtents=[size[0]/2, 0.002, size[2] / 2], physicsClientId=self.client_id)
 
-    right_visual = pb.createVisualShape(pb.GEOM_BOX, halfExtents=[size[0]/2, 0.002, size[2]/2], rgbaColor=color)
-    right_collision = pb.createCollisionShape(pb.GEOM_BOX, halfExtents=[size[0]/2, 0.002, size[2]/2])
+    right_visual = pb.createVisualShape(pb.GEOM_BOX, halfExtents=[size[0]/2, 0.002, size[2]/2], rgbaColor=color, physicsClientId=self.client_id)
+    right_collision = pb.createCollisionShape(pb.GEOM_BOX, halfExtents=[size[0]/2, 0.002, size[2]/2], physicsClientId=self.client_id)
 
     self.size = size
     self.id = pb.createMultiBody(baseMass=0,
@@ -45,18 +46,18 @@ class BoxColor:
                                  linkInertialFrameOrientations=[[0, 0, 0, 1], [0, 0, 0, 1], [0, 0, 0, 1], [0, 0, 0, 1]],
                                  linkParentIndices=[0, 0, 0, 0],
                                  linkJointTypes=[pb.JOINT_FIXED, pb.JOINT_FIXED, pb.JOINT_FIXED, pb.JOINT_FIXED],
-                                 linkJointAxis=[[0, 0, 1], [0, 0, 1], [0, 0, 1], [0, 0, 1]]
+                                 linkJointAxis=[[0, 0, 1], [0, 0, 1], [0, 0, 1], [0, 0, 1]], physicsClientId=self.client_id
     )
 
     pb.changeDynamics(self.id,
                       -1,
                       rollingFriction=1,
-                      linearDamping=0.1)
+                      linearDamping=0.1, physicsClientId=self.client_id)
 
   def reset(self, pos=(0,0,0), rot=(0,0,0,1)):
-    pb.resetBasePositionAndOrientation(self.id, pos, rot)
+    pb.resetBasePositionAndOrientation(self.id, pos, rot, physicsClientId=self.client_id)
 
   def remove(self):
     if self.id:
-      pb.removeBody(self.id)
+      pb.removeBody(self.id, physicsClientId=self.client_id)
     self.id = None
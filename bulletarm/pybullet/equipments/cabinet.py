@@ -7,33 +7,34 @@ from bulletarm.pybullet.utils import constants
 
 
 class Cabinet:
-  def __init__(self):
+  def __init__(self, client_id=0):
+    self.client_id = client_id
     self.id = None
 
   def initialize(self, pos=(0, 0, 0), rot=(0, 0, 0, 1)):
     cabinet_urdf_filepath = os.path.join(constants.URDF_PATH, 'kitchen_description/urdf/kitchen_right_only.urdf')
-    self.id = pb.loadURDF(cabinet_urdf_filepath, pos, rot)
+    self.id = pb.loadURDF(cabinet_urdf_filepath, pos, rot, physicsClientId=self.client_id)
 
   def remove(self):
     if self.id:
-      pb.removeBody(self.id)
+      pb.removeBody(self.id, physicsClientId=self.client_id)
     self.id = None
 
   def getLeftHandlePos(self):
-    link_state = pb.getLinkState(self.id, 5)
+    link_state = pb.getLinkState(self.id, 5, physicsClientId=self.client_id)
     pos = list(link_state[0])
     pos[0] += 0.005
     rot = list(link_state[1])
     return pos
 
   def getLeftHandleRot(self):
-    link_state = pb.getLinkState(self.id, 5)
+    link_state = pb.getLinkState(self.id, 5, physicsClientId=self.client_id)
     pos = list(link_state[0])
     rot = list(link_state[1])
     return rot
 
   def getRightHandlePos(self):
-    link_state = pb.getLinkState(self.id, 9)
+    link_state = pb.getLinkState(self.id, 9, physicsClientId=self.client_id)
     pos = list(link_state[0])
     rot = list(link_state[1])
     return pos
@@ -6,25 +6,26 @@ import bulletarm
 from bulletarm.pybullet.utils import pybullet_util
 
 class ContainerBox:
-  def __init__(self):
+  def __init__(self, client_id=0):
+    self.client_id = client_id
     self.root_dir = os.path.dirname(bulletarm.__file__)
     self.id = None
 
   def initialize(self, pos=(0,0,0), rot=(0,0,0,1), size=(0.2, 0.2, 0.2), thickness=0.005):
-    bottom_visual = pb.createVisualShape(pb.GEOM_BOX, halfExtents=[size[0]/2, size[1]/2, thickness], rgbaColor=[1, 1, 1, 1])
-    bottom_collision = pb.createCollisionShape(pb.GEOM_BOX, halfExtents=[size[0]/2, size[1]/2, thickness])
+    bottom_visual = pb.createVisualShape(pb.GEOM_BOX, halfExtents=[size[0]/2, size[1]/2, thickness], rgbaColor=[1, 1, 1, 1], physicsClientId=self.client_id)
+    bottom_collision = pb.createCollisionShape(pb.GEOM_BOX, halfExtents=[size[0]/2, size[1]/2, thickness], physicsClientId=self.client_id)
 
-    front_visual = pb.createVisualShape(pb.GEOM_BOX, halfExtents=[thickness, size[1]/2, size[2]/2], rgbaColor=[1, 1, 1, 1])
-    front_collision = pb.createCollisionShape(pb.GEOM_BOX, halfExtents=[thickness, size[1]/2, size[2]/2])
+    front_visual = pb.createVisualShape(pb.GEOM_BOX, halfExtents=[thickness, size[1]/2, size[2]/2], rgbaColor=[1, 1, 1, 1], physicsClientId=self.client_id)
+    front_collision = pb.createCollisionShape(pb.GEOM_BOX, halfExtents=[thickness, size[1]/2, size[2]/2], physicsClientId=self.client_id)
 
-    back_visual = pb.createVisualShape(pb.GEOM_BOX, halfExtents=[thickness, size[1] / 2, size[2] / 2], rgbaColor=[1, 1, 1, 1])
-    back_collision = pb.createCollisionShape(pb.GEOM_BOX, halfExtents=[thickness, size[1] / 2, size[2] / 2])
+    back_visual = pb.createVisualShape(pb.GEOM_BOX, halfExtents=[thickness, size[1] / 2, size[2] / 2], rgbaColor=[1, 1, 1, 1], physicsClientId=self.client_id)
+    back_collision = pb.createCollisionShape(pb.GEOM_BOX, halfExtents=[thickness, size[1] / 2, size[2] / 2], physicsClientId=self.client_id)
 
-    left_visual = pb.createVisualShape(pb.GEOM_BOX, halfExtents=[size[0]/2, thickness, size[2] / 2], rgbaColor=[1, 1, 1, 1])
-    left_collision = pb.createCollisionShape(pb.GEOM_BOX, halfExtents=[size[0]/2, thickness, size[2] / 2])
+    left_visual = pb.createVisualShape(pb.GEOM_BOX, halfExtents=[size[0]/2, thickness, size[2] / 2], rgbaColor=[1, 1, 1, 1], physicsClientId=self.client_id)
+    left_collision = pb.createCollisionShape(pb.GEOM_BOX, halfExtents=[size[0]/2, thickness, size[2] / 2], physicsClientId=self.client_id)
 
-    right_visual = pb.createVisualShape(pb.GEOM_BOX, halfExtents=[size[0]/2, thickness, size[2]/2], rgbaColor=[1, 1, 1, 1])
-    right_collision = pb.createCollisionShape(pb.GEOM_BOX, halfExtents=[size[0]/2, thickness, size[2]/2])
+    right_visual = pb.createVisualShape(pb.GEOM_BOX, halfExtents=[size[0]/2, thickness, size[2]/2], rgbaColor=[1, 1, 1, 1], physicsClientId=self.client_id)
+    right_collision = pb.createCollisionShape(pb.GEOM_BOX, halfExtents=[size[0]/2, thickness, size[2]/2], physicsClientId=self.client_id)
 
     self.id = pb.createMultiBody(baseMass=0,
                                  baseCollisionShapeIndex=bottom_collision,
@@ -43,13 +44,13 @@ class ContainerBox:
                                  linkInertialFrameOrientations=[[0, 0, 0, 1], [0, 0, 0, 1], [0, 0, 0, 1], [0, 0, 0, 1]],
                                  linkParentIndices=[0, 0, 0, 0],
                                  linkJointTypes=[pb.JOINT_FIXED, pb.JOINT_FIXED, pb.JOINT_FIXED, pb.JOINT_FIXED],
-                                 linkJointAxis=[[0, 0, 1], [0, 0, 1], [0, 0, 1], [0, 0, 1]]
+                                 linkJointAxis=[[0, 0, 1], [0, 0, 1], [0, 0, 1], [0, 0, 1]], physicsClientId=self.client_id
     )
 
   def reset(self, pos=(0,0,0), rot=(0,0,0,1)):
-    pb.resetBasePositionAndOrientation(self.id, pos, rot)
+    pb.resetBasePositionAndOrientation(self.id, pos, rot, physicsClientId=self.client_id)
 
   def remove(self):
     if self.id:
-      pb.removeBody(self.id)
+      pb.removeBody(self.id, physicsClientId=self.client_id)
     self.id = None
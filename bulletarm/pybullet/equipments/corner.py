@@ -6,27 +6,28 @@ import bulletarm
 from bulletarm.pybullet.utils import pybullet_util
 
 class Corner:
-  def __init__(self):
+  def __init__(self, client_id=0):
+    self.client_id = client_id
     self.id = None
 
   def initialize(self, pos=(0,0,0), rot=(0,0,0,1), size=(0.2, 0.2, 0.1)):
-    bottom_visual = pb.createVisualShape(pb.GEOM_BOX, halfExtents=[size[1]/2, size[1]/2, 0.001], rgbaColor=[1, 1, 1, 1])
-    bottom_collision = pb.createCollisionShape(pb.GEOM_BOX, halfExtents=[size[1]/2, size[1]/2, 0.001])
+    bottom_visual = pb.createVisualShape(pb.GEOM_BOX, halfExtents=[size[1]/2, size[1]/2, 0.001], rgbaColor=[1, 1, 1, 1], physicsClientId=self.client_id)
+    bottom_collision = pb.createCollisionShape(pb.GEOM_BOX, halfExtents=[size[1]/2, size[1]/2, 0.001], physicsClientId=self.client_id)
 
-    front_visual = pb.createVisualShape(pb.GEOM_BOX, halfExtents=[0.01, size[1]/2, size[2]/2], rgbaColor=[1, 1, 1, 1])
-    front_collision = pb.createCollisionShape(pb.GEOM_BOX, halfExtents=[0.01, size[1]/2, size[2]/2])
+    front_visual = pb.createVisualShape(pb.GEOM_BOX, halfExtents=[0.01, size[1]/2, size[2]/2], rgbaColor=[1, 1, 1, 1], physicsClientId=self.client_id)
+    front_collision = pb.createCollisionShape(pb.GEOM_BOX, halfExtents=[0.01, size[1]/2, size[2]/2], physicsClientId=self.client_id)
 
-    left_visual = pb.createVisualShape(pb.GEOM_BOX, halfExtents=[size[0]/2, 0.01, size[2] / 2], rgbaColor=[1, 1, 1, 1])
-    left_collision = pb.createCollisionShape(pb.GEOM_BOX, halfExtents=[size[0]/2, 0.01, size[2] / 2])
+    left_visual = pb.createVisualShape(pb.GEOM_BOX, halfExtents=[size[0]/2, 0.01, size[2] / 2], rgbaColor=[1, 1, 1, 1], physicsClientId=self.client_id)
+    left_collision = pb.createCollisionShape(pb.GEOM_BOX, halfExtents=[size[0]/2, 0.01, size[2] / 2], physicsClientId=self.client_id)
 
-    obj_visual = pb.createVisualShape(pb.GEOM_BOX, halfExtents=[0.005, 0.005, 0.005], rgbaColor=[1, 0, 0, 0])
-    obj_collision = pb.createVisualShape(pb.GEOM_BOX, halfExtents=[0, 0, 0], rgbaColor=[1, 0, 0, 1])
+    obj_visual = pb.createVisualShape(pb.GEOM_BOX, halfExtents=[0.005, 0.005, 0.005], rgbaColor=[1, 0, 0, 0], physicsClientId=self.client_id)
+    obj_collision = pb.createVisualShape(pb.GEOM_BOX, halfExtents=[0, 0, 0], rgbaColor=[1, 0, 0, 1], physicsClientId=self.client_id)
 
-    pull_visual = pb.createVisualShape(pb.GEOM_BOX, halfExtents=[0.005, 0.005, 0.005], rgbaColor=[0, 1, 0, 0])
-    pull_collision= pb.createVisualShape(pb.GEOM_BOX, halfExtents=[0, 0, 0], rgbaColor=[0, 1, 0, 1])
+    pull_visual = pb.createVisualShape(pb.GEOM_BOX, halfExtents=[0.005, 0.005, 0.005], rgbaColor=[0, 1, 0, 0], physicsClientId=self.client_id)
+    pull_collision= pb.createVisualShape(pb.GEOM_BOX, halfExtents=[0, 0, 0], rgbaColor=[0, 1, 0, 1], physicsClientId=self.client_id)
 
-    press_visual = pb.createVisualShape(pb.GEOM_BOX, halfExtents=[0.005, 0.005, 0.005], rgbaColor=[0, 0, 1, 0])
-    press_collision= pb.createVisualShape(pb.GEOM_BOX, halfExtents=[0, 0, 0], rgbaColor=[0, 0, 1, 1])
+    press_visual = pb.createVisualShape(pb.GEOM_BOX, halfExtents=[0.005, 0.005, 0.005], rgbaColor=[0, 0, 1, 0], physicsClientId=self.client_id)
+    press_collision= pb.createVisualShape(pb.GEOM_BOX, halfExtents=[0, 0, 0], rgbaColor=[0, 0, 1, 1], physicsClientId=self.client_id)
 
     self.id = pb.createMultiBody(baseMass=0,
                                  baseCollisionShapeIndex=bottom_collision,
@@ -46,33 +47,33 @@ class Corner:
                                  linkInertialFrameOrientations=[[0, 0, 0, 1], [0, 0, 0, 1], [0, 0, 0, 1], [0, 0, 0, 1], [0, 0, 0, 1]],
                                  linkParentIndices=[0, 0, 0, 0, 0],
                                  linkJointTypes=[pb.JOINT_FIXED, pb.JOINT_FIXED, pb.JOINT_FIXED, pb.JOINT_FIXED, pb.JOINT_FIXED],
-                                 linkJointAxis=[[0, 0, 1], [0, 0, 1], [0, 0, 1], [0, 0, 1], [0, 0, 1]]
+                                 linkJointAxis=[[0, 0, 1], [0, 0, 1], [0, 0, 1], [0, 0, 1], [0, 0, 1]], physicsClientId=self.client_id
     )
-    pb.changeDynamics(self.id, -1, lateralFriction=0.001)
+    pb.changeDynamics(self.id, -1, lateralFriction=0.001, physicsClientId=self.client_id)
 
   def reset(self, pos=(0,0,0), rot=(0,0,0,1)):
-    pb.resetBasePositionAndOrientation(self.id, pos, rot)
+    pb.resetBasePositionAndOrientation(self.id, pos, rot, physicsClientId=self.client_id)
 
   def getObjPose(self):
-    link_state = pb.getLinkState(self.id, 2)
+    link_state = pb.getLinkState(self.id, 2, physicsClientId=self.client_id)
     pos, rot = link_state[0], link_state[1]
     return list(pos), list(rot)
 
   def getPullPose(self):
-    link_state = pb.getLinkState(self.id, 3)
+    link_state = pb.getLinkState(self.id, 3, physicsClientId=self.client_id)
     pos, rot = link_state[0], link_state[1]
     return list(pos), list(rot)
 
   def getPressPose(self):
-    link_state = pb.getLinkState(self.id, 4)
+    link_state = pb.getLinkState(self.id, 4, physicsClientId=self.client_id)
     pos, rot = link_state[0], link_state[1]
     return list(pos), list(rot)
 
   def getPose(self):
-    pos, rot = pb.getBasePositionAndOrientation(self.id)
+    pos, rot = pb.getBasePositionAndOrientation(self.id, physicsClientId=self.client_id)
     return list(pos), list(rot)
 
   def remove(self):
     if self.id:
-      pb.removeBody(self.id)
+      pb.removeBody(self.id, physicsClientId=self.client_id)
     self.id = None
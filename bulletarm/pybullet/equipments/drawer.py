@@ -6,10 +6,12 @@ from bulletarm.pybullet.utils import transformations
 from bulletarm.pybullet.utils import constants
 from bulletarm.pybullet.equipments.drawer_handle import DrawerHandle
 from bulletarm.pybullet.objects.pybullet_object import PybulletObject
+from bulletarm.pybullet.utils import pybullet_util
 from typing import List
 
 class Drawer:
-  def __init__(self, model_id=1):
+  def __init__(self, model_id=1, client_id=0):
+    self.client_id = client_id
     assert model_id in [1, 2]
     self.model_id = model_id
     self.id = None
@@ -19,14 +21,14 @@ class Drawer:
 
   def initialize(self, pos=(0,0,0), rot=(0,0,0,1), scale=0.5):
     drawer_urdf_filepath = os.path.join(constants.URDF_PATH, 'drawer{}.urdf'.format(self.model_id))
-    self.id = pb.loadURDF(drawer_urdf_filepath, pos, rot, globalScaling=scale)
-    self.handle = DrawerHandle(self.id)
+    self.id = pb.loadURDF(drawer_urdf_filepath, pos, rot, globalScaling=scale, physicsClientId=self.client_id)
+    self.handle = DrawerHandle(self.id, client_id=self.client_id)
 
   def remove(self):
     if self.id:
-      pb.removeBody(self.id)
+      pb.removeBody(self.id, physicsClientId=self.client_id)
     if self.handle:
-      pb.removeBody(self.handle.id)
+      pb.removeBody(self.handle.id, physicsClientId=self.client_id)
     self.id = None
     self.handle = None
 
@@ -38,7 +40,7 @@ class Drawer:
     return False
 
   def getPose(self):
-    pos, rot = pb.getBasePositionAndOrientation(self.id)
+    pos, rot = pb.getBasePositionAndOrientation(self.id, physicsClientId=self.client_id)
     return list(pos), list(rot)
 
   def getHandlePosition(self):
@@ -49,27 +51,27 @@ class Drawer:
     return self.handle.getRotation()
 
   def reset(self, pos=(0,0,0), rot=(0,0,0,1)):
-    pb.resetBasePositionAndOrientation(self.id, pos, rot)
-    pb.resetJointState(self.id, 1, 0)
+    pb.resetBasePositionAndOrientation(self.id, pos, rot, physicsClientId=self.client_id)
+    pb.resetJointState(self.id, 1, 0, physicsClientId=self.client_id)
     self.handle.reset()
     for i in range(50):
-      pb.stepSimulation()
-    pb.resetJointState(self.id, 1, 0)
+      pybullet_util.stepSimulation(self.client_id)
+    pb.resetJointState(self.id, 1, 0, physicsClientId=self.client_id)
     for i in range(50):
-      pb.stepSimulation()
+      pybullet_util.stepSimulation(self.client_id)
     pass
 
   def isDrawerOpen(self):
-    return pb.getJointState(self.id, 1)[0] > 0.15
+    return pb.getJointState(self.id, 1, physicsClientId=self.client_id)[0] > 0.15
 
   def isDrawerClosed(self):
-    return pb.getJointState(self.id, 1)[0] < 0.02
+    return pb.getJointState(self.id, 1, physicsClientId=self.client_id)[0] < 0.02
 
   def getObjInitPos(self):
-    return pb.getLinkState(self.id, self.object_init_link_id)[0]
+    return pb.getLinkState(self.id, self.object_init_link_id, physicsClientId=self.client_id)[0]
 
   def getObjInitRot(self):
-    return pb.getLinkState(self.id, self.object_init_link_id)[1]
+    return pb.getLinkState(self.id, self.object_init_link_id, physicsClientId=self.client_id)[1]
 
   def constraintObjects(self, objects: List[PybulletObject]):
     drawer_pos, drawer_rot = self.getObjInitPos(), self.getObjInitRot()
@@ -85,9 +87,9 @@ class Drawer:
                                 jointType=pb.JOINT_FIXED, jointAxis=[0, 0, 0],
                                 parentFramePosition=dTo[:3, 3],
                                 childFramePosition=[0, 0, 0],
-                                parentFrameOrientation=transformations.quaternion_from_matrix(dTo))
+                                parentFrameOrientation=transformations.quaternion_from_matrix(dTo), physicsClientId=self.client_id)
       self.cids.append(cid)
 
   def releaseObjectConstraints(self):
     for cid in self.cids:
-      pb.removeConstraint(cid)
+      pb.removeConstraint(cid, physicsClientId=self.client_id)
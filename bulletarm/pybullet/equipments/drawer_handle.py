@@ -5,12 +5,14 @@ import numpy as np
 import bulletarm
 from bulletarm.pybullet.utils.pybullet_util import constants
 from bulletarm.pybullet.utils import transformations
+from bulletarm.pybullet.utils import pybullet_util
 
 BOX = 0
 CYLINDER = 1
 
 class DrawerHandle:
-  def __init__(self, drawer_id, fixed=True):
+  def __init__(self, drawer_id, fixed=True, client_id=0):
+    self.client_id = client_id
     self.drawer_id = drawer_id
     self.drawer_fw_id = 6
     if fixed:
@@ -44,28 +46,28 @@ class DrawerHandle:
 
     self.sidebar_length = self.grip_to_drawer
 
-    grip_position = list(pb.getLinkState(drawer_id, self.drawer_fw_id)[4])
+    grip_position = list(pb.getLinkState(drawer_id, self.drawer_fw_id, physicsClientId=self.client_id)[4])
     grip_position[0] -= self.grip_to_drawer
 
     if self.grip_type == BOX:
-      grip_visual_id = pb.createVisualShape(pb.GEOM_BOX, halfExtents=[self.grip_width/2, self.grip_length/2, self.grip_width/2], rgbaColor=[1, 1, 1, 1])
-      grip_collision_id = pb.createCollisionShape(pb.GEOM_BOX, halfExtents=[self.grip_width/2, self.grip_length/2, self.grip_width/2])
+      grip_visual_id = pb.createVisualShape(pb.GEOM_BOX, halfExtents=[self.grip_width/2, self.grip_length/2, self.grip_width/2], rgbaColor=[1, 1, 1, 1], physicsClientId=self.client_id)
+      grip_collision_id = pb.createCollisionShape(pb.GEOM_BOX, halfExtents=[self.grip_width/2, self.grip_length/2, self.grip_width/2], physicsClientId=self.client_id)
     elif self.grip_type == CYLINDER:
-      grip_visual_id = pb.createVisualShape(pb.GEOM_CYLINDER, length=self.grip_length, radius=self.grip_width/2, rgbaColor=[1, 1, 1, 1], visualFrameOrientation=pb.getQuaternionFromEuler([np.pi/2, 0, 0]))
-      grip_collision_id = pb.createCollisionShape(pb.GEOM_CYLINDER, height=self.grip_length, radius=self.grip_width/2, collisionFrameOrientation=pb.getQuaternionFromEuler([np.pi/2, 0, 0]))
+      grip_visual_id = pb.createVisualShape(pb.GEOM_CYLINDER, length=self.grip_length, radius=self.grip_width/2, rgbaColor=[1, 1, 1, 1], visualFrameOrientation=pb.getQuaternionFromEuler([np.pi/2, 0, 0]), physicsClientId=self.client_id)
+      grip_collision_id = pb.createCollisionShape(pb.GEOM_CYLINDER, height=self.grip_length, radius=self.grip_width/2, collisionFrameOrientation=pb.getQuaternionFromEuler([np.pi/2, 0, 0]), physicsClientId=self.client_id)
     else:
       raise NotImplementedError
 
     if self.sidebar_type == BOX:
       left_visual_id = pb.createVisualShape(pb.GEOM_BOX, halfExtents=[self.sidebar_length / 2, self.sidebar_width / 2,
-                                                                      self.sidebar_width / 2], rgbaColor=[1, 1, 1, 1])
+                                                                      self.sidebar_width / 2], rgbaColor=[1, 1, 1, 1], physicsClientId=self.client_id)
 
       right_visual_id = pb.createVisualShape(pb.GEOM_BOX, halfExtents=[self.sidebar_length / 2, self.sidebar_width / 2,
-                                                                       self.sidebar_width / 2], rgbaColor=[1, 1, 1, 1])
+                                                                       self.sidebar_width / 2], rgbaColor=[1, 1, 1, 1], physicsClientId=self.client_id)
     elif self.sidebar_type == CYLINDER:
-      left_visual_id = pb.createVisualShape(pb.GEOM_CYLINDER, length=self.sidebar_length, radius=self.sidebar_width/2, rgbaColor=[1, 1, 1, 1], visualFrameOrientation=pb.getQuaternionFromEuler([0, np.pi/2, 0]))
+      left_visual_id = pb.createVisualShape(pb.GEOM_CYLINDER, length=self.sidebar_length, radius=self.sidebar_width/2, rgbaColor=[1, 1, 1, 1], visualFrameOrientation=pb.getQuaternionFromEuler([0, np.pi/2, 0]), physicsClientId=self.client_id)
 
-      right_visual_id = pb.createVisualShape(pb.GEOM_CYLINDER, length=self.sidebar_length, radius=self.sidebar_width/2, rgbaColor=[1, 1, 1, 1], visualFrameOrientation=pb.getQuaternionFromEuler([0, np.pi/2, 0]))
+      right_visual_id = pb.createVisualShape(pb.GEOM_CYLINDER, length=self.sidebar_length, radius=self.sidebar_width/2, rgbaColor=[1, 1, 1, 1], visualFrameOrientation=pb.getQuaternionFromEuler([0, np.pi/2, 0]), physicsClientId=self.client_id)
     else:
       raise NotImplementedError
 
@@ -82,35 +84,35 @@ class DrawerHandle:
                                  linkInertialFrameOrientations=[[0, 0, 0, 1], [0, 0, 0, 1]],
                                  linkParentIndices=[0, 0],
                                  linkJointTypes=[pb.JOINT_FIXED, pb.JOINT_FIXED],
-                                 linkJointAxis=[[0, 0, 1], [0, 0, 1]])
+                                 linkJointAxis=[[0, 0, 1], [0, 0, 1]], physicsClientId=self.client_id)
 
     pb.changeDynamics(self.id, -1,
                       lateralFriction=200,
                       spinningFriction=0,
-                      rollingFriction=0)
+                      rollingFriction=0, physicsClientId=self.client_id)
 
     pb.createConstraint(drawer_id, self.drawer_fw_id, self.id, -1,
                         jointType=pb.JOINT_FIXED, jointAxis=[0, 0, 0],
                         parentFramePosition=[self.grip_to_drawer, 0, 0],
                         childFramePosition=[0, 0, 0],
-                        childFrameOrientation=pb.getQuaternionFromEuler([0, 0, np.pi]))
+                        childFrameOrientation=pb.getQuaternionFromEuler([0, 0, np.pi]), physicsClientId=self.client_id)
 
     for _ in range(100):
-      pb.stepSimulation()
+      pybullet_util.stepSimulation(self.client_id)
     pass
 
   def reset(self):
-    drawer_fw_pos = pb.getLinkState(self.drawer_id, self.drawer_fw_id)[0]
-    drawer_fw_rot = pb.getLinkState(self.drawer_id, self.drawer_fw_id)[1]
+    drawer_fw_pos = pb.getLinkState(self.drawer_id, self.drawer_fw_id, physicsClientId=self.client_id)[0]
+    drawer_fw_rot = pb.getLinkState(self.drawer_id, self.drawer_fw_id, physicsClientId=self.client_id)[1]
     m = np.array(pb.getMatrixFromQuaternion(drawer_fw_rot)).reshape(3, 3)
     pos = np.array(drawer_fw_pos) + m[:, 0] * self.grip_to_drawer
     # rot_matrix = m @ np.array(transformations.euler_matrix(0, 0, np.pi))[:3, :3]
     rot_matrix = np.eye(4)
     rot_matrix[:3, :3] = m @ np.array(transformations.euler_matrix(0, 0, np.pi))[:3, :3]
-    pb.resetBasePositionAndOrientation(self.id, pos, transformations.quaternion_from_matrix(rot_matrix))
+    pb.resetBasePositionAndOrientation(self.id, pos, transformations.quaternion_from_matrix(rot_matrix), physicsClientId=self.client_id)
 
   def getPosition(self):
-    pos, rot = pb.getBasePositionAndOrientation(self.id)
+    pos, rot = pb.getBasePositionAndOrientation(self.id, physicsClientId=self.client_id)
     m = np.array(pb.getMatrixFromQuaternion(rot)).reshape(3, 3)
     offset = 0.01
     pos = pos + m[:, 0] * offset
@@ -120,5 +122,5 @@ class DrawerHandle:
     return pos
 
   def getRotation(self):
-    pos, rot = pb.getBasePositionAndOrientation(self.id)
+    pos, rot = pb.getBasePositionAndOrientation(self.id, physicsClientId=self.client_id)
     return rot
@@ -3,11 +3,13 @@ import numpy as np
 
 from bulletarm.pybullet.equipments.drawer import Drawer
 from bulletarm.pybullet.equipments.rack import Rack
+from bulletarm.pybullet.utils import pybullet_util
 
 class DrawerWithRack:
-  def __init__(self, rack_n=3):
-    self.drawer = Drawer(model_id=2)
-    self.rack = Rack(rack_n, dist=0.05)
+  def __init__(self, rack_n=3, client_id=0):
+    self.client_id = client_id
+    self.drawer = Drawer(model_id=2, client_id=client_id)
+    self.rack = Rack(rack_n, dist=0.05, client_id=client_id)
 
   def initialize(self, pos=(0,0,0), rot=(0,0,0,1)):
     self.drawer.initialize(pos, rot)
@@ -16,12 +18,12 @@ class DrawerWithRack:
                         jointType = pb.JOINT_FIXED, jointAxis = [0, 0, 0],
                         parentFramePosition = [0, 0, 0],
                         childFramePosition = [0, 0, 0],
-                        childFrameOrientation = pb.getQuaternionFromEuler([0, 0, np.pi]))
+                        childFrameOrientation = pb.getQuaternionFromEuler([0, 0, np.pi]), physicsClientId=self.client_id)
   def reset(self, pos=(0,0,0), rot=(0,0,0,1)):
-    pb.resetBasePositionAndOrientation(self.drawer.id, pos, rot)
-    pb.resetJointState(self.drawer.id, 1, 0)
+    pb.resetBasePositionAndOrientation(self.drawer.id, pos, rot, physicsClientId=self.client_id)
+    pb.resetJointState(self.drawer.id, 1, 0, physicsClientId=self.client_id)
     self.drawer.handle.reset()
     self.rack.reset(self.drawer.getObjInitPos(), rot)
     for i in range(50):
-      pb.stepSimulation()
+      pybullet_util.stepSimulation(self.client_id)
 
@@ -8,7 +8,8 @@ from bulletarm.pybullet.utils import transformations
 from bulletarm.pybullet.utils import constants
 
 class Rack:
-  def __init__(self, n=3, dist=0.1):
+  def __init__(self, n=3, dist=0.1, client_id=0):
+    self.client_id = client_id
     self.n = n
     self.ids = []
     self.dist = dist
@@ -28,13 +29,13 @@ class Rack:
     urdf_filepath = os.path.join(constants.URDF_PATH, 'rack2.urdf')
     poss = self.getEachPos(pos, rot)
     for i in range(self.n):
-      self.ids.append(pb.loadURDF(urdf_filepath, poss[i], rot, useFixedBase=fixed))
+      self.ids.append(pb.loadURDF(urdf_filepath, poss[i], rot, useFixedBase=fixed, physicsClientId=self.client_id))
       if len(self.ids) > 1:
         pb.createConstraint(self.ids[-2], -1, self.ids[-1], -1,
                             jointType=pb.JOINT_FIXED, jointAxis=[0, 0, 0],
                             parentFramePosition=[self.dist, 0, 0],
                             childFramePosition=[0, 0, 0],
-                            childFrameOrientation=pb.getQuaternionFromEuler([0, 0, 0]))
+                            childFrameOrientation=pb.getQuaternionFromEuler([0, 0, 0]), physicsClientId=self.client_id)
 
     # base_x, base_y, base_z = pos
     # rx, ry, rz = transformations.euler_from_quaternion(rot)
@@ -46,24 +47,24 @@ class Rack:
 
   def remove(self):
     for idx in self.ids:
-      pb.removeBody(idx)
+      pb.removeBody(idx, physicsClientId=self.client_id)
     self.ids = []
 
   def reset(self, pos=(0,0,0), rot=(0,0,0,1)):
     poss = self.getEachPos(pos, rot)
     for i in range(self.n):
-      pb.resetBasePositionAndOrientation(self.ids[i], poss[i], rot)
+      pb.resetBasePositionAndOrientation(self.ids[i], poss[i], rot, physicsClientId=self.client_id)
     for i in range(10):
-      pb.stepSimulation()
+      pybullet_util.stepSimulation(self.client_id)
 
   def getObjInitPosList(self):
     poss = []
     for idx in self.ids:
-      poss.append(pb.getLinkState(idx, 2)[0])
+      poss.append(pb.getLinkState(idx, 2, physicsClientId=self.client_id)[0])
     return poss[1:]
 
   def getObjInitRotList(self):
     rots = []
     for idx in self.ids:
-      rots.append(pb.getLinkState(idx, 2)[1])
+      rots.append(pb.getLinkState(idx, 2, physicsClientId=self.client_id)[1])
     return rots[1:]
@@ -7,33 +7,34 @@ from bulletarm.pybullet.utils import pybullet_util
 from bulletarm.pybullet.utils import constants
 
 class Shelf:
-  def __init__(self):
+  def __init__(self, client_id=0):
+    self.client_id = client_id
     self.id = None
     self.middle_wall_id = 5
     self.target1_id = 6
 
   def initialize(self, pos=(0,0,0), rot=(0,0,0,1)):
     urdf_filepath = os.path.join(constants.URDF_PATH, 'shelf.urdf')
-    self.id = pb.loadURDF(urdf_filepath, pos, rot)
+    self.id = pb.loadURDF(urdf_filepath, pos, rot, physicsClientId=self.client_id)
 
   def remove(self):
     if self.id:
-      pb.removeBody(self.id)
+      pb.removeBody(self.id, physicsClientId=self.client_id)
     self.id = None
 
   def reset(self, pos=(0,0,0), rot=(0,0,0,1)):
-    pb.resetBasePositionAndOrientation(self.id, pos, rot)
+    pb.resetBasePositionAndOrientation(self.id, pos, rot, physicsClientId=self.client_id)
     for i in range(10):
-      pb.stepSimulation()
+      pybullet_util.stepSimulation(self.client_id)
 
   def getTarget1Pos(self):
-    return pb.getLinkState(self.id, self.target1_id)[0]
+    return pb.getLinkState(self.id, self.target1_id, physicsClientId=self.client_id)[0]
 
   def isObjectOnTarget1(self, obj):
     target1_pos = self.getTarget1Pos()
     if np.linalg.norm(np.array(obj.getPosition()) - np.array(target1_pos)) > 0.05:
       return False
-    contact_points = pb.getContactPoints(bodyA=self.id, linkIndexA=self.middle_wall_id)
+    contact_points = pb.getContactPoints(bodyA=self.id, linkIndexA=self.middle_wall_id, physicsClientId=self.client_id)
     for p in contact_points:
       if p[2] == obj.object_id:
         return True
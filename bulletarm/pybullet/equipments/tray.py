@@ -6,7 +6,8 @@ import bulletarm
 from bulletarm.pybullet.utils import pybullet_util
 
 class Tray:
-  def __init__(self):
+  def __init__(self, client_id=0):
+    self.client_id = client_id
     self.root_dir = os.path.dirname(bulletarm.__file__)
     self.id = None
 
@@ -50,56 +51,56 @@ class Tray:
     size0_outer = size_outer[0] / 2 + 2 * half_wall_height_outer * sin_offset_outer
     size1_outer = size_outer[1] / 2 + 2 * half_wall_height_outer * sin_offset_outer
     bottom_visual = pb.createVisualShape(pb.GEOM_BOX, halfExtents=[size0_inner, size1_inner, botton_half_thick],
-                                         rgbaColor=color)
-    bottom_collision = pb.createCollisionShape(pb.GEOM_BOX, halfExtents=[size0_inner, size1_inner, botton_half_thick])
+                                         rgbaColor=color, physicsClientId=self.client_id)
+    bottom_collision = pb.createCollisionShape(pb.GEOM_BOX, halfExtents=[size0_inner, size1_inner, botton_half_thick], physicsClientId=self.client_id)
 
     front_visual_inner = pb.createVisualShape(pb.GEOM_BOX,
                                               halfExtents=[half_thickness, size1_inner, half_wall_height_inner],
-                                              rgbaColor=color_inner)
+                                              rgbaColor=color_inner, physicsClientId=self.client_id)
     front_collision_inner = pb.createCollisionShape(pb.GEOM_BOX, halfExtents=[half_thickness, size1_inner,
-                                                                              half_wall_height_inner])
+                                                                              half_wall_height_inner], physicsClientId=self.client_id)
 
     back_visual_inner = pb.createVisualShape(pb.GEOM_BOX,
                                              halfExtents=[half_thickness, size1_inner, half_wall_height_inner],
-                                             rgbaColor=color_inner)
+                                             rgbaColor=color_inner, physicsClientId=self.client_id)
     back_collision_inner = pb.createCollisionShape(pb.GEOM_BOX, halfExtents=[half_thickness, size1_inner,
-                                                                             half_wall_height_inner])
+                                                                             half_wall_height_inner], physicsClientId=self.client_id)
 
     left_visual_inner = pb.createVisualShape(pb.GEOM_BOX,
                                              halfExtents=[size0_inner, half_thickness, half_wall_height_inner],
-                                             rgbaColor=color_inner)
+                                             rgbaColor=color_inner, physicsClientId=self.client_id)
     left_collision_inner = pb.createCollisionShape(pb.GEOM_BOX, halfExtents=[size0_inner, half_thickness,
-                                                                             half_wall_height_inner])
+                                                                             half_wall_height_inner], physicsClientId=self.client_id)
 
     right_visual_inner = pb.createVisualShape(pb.GEOM_BOX,
                                               halfExtents=[size0_inner, half_thickness, half_wall_height_inner],
-                                              rgbaColor=color_inner)
+                                              rgbaColor=color_inner, physicsClientId=self.client_id)
     right_collision_inner = pb.createCollisionShape(pb.GEOM_BOX, halfExtents=[size0_inner, half_thickness,
-                                                                              half_wall_height_inner])
+                                                                              half_wall_height_inner], physicsClientId=self.client_id)
 
     front_visual_outer = pb.createVisualShape(pb.GEOM_BOX,
                                               halfExtents=[half_thickness, size1_outer, half_wall_height_outer],
-                                              rgbaColor=color)
+                                              rgbaColor=color, physicsClientId=self.client_id)
     front_collision_outer = pb.createCollisionShape(pb.GEOM_BOX, halfExtents=[half_thickness, size1_outer,
-                                                                              half_wall_height_outer])
+                                                                              half_wall_height_outer], physicsClientId=self.client_id)
 
     back_visual_outer = pb.createVisualShape(pb.GEOM_BOX,
                                              halfExtents=[half_thickness, size1_outer, half_wall_height_outer],
-                                             rgbaColor=color)
+                                             rgbaColor=color, physicsClientId=self.client_id)
     back_collision_outer = pb.createCollisionShape(pb.GEOM_BOX, halfExtents=[half_thickness, size1_outer,
-                                                                             half_wall_height_outer])
+                                                                             half_wall_height_outer], physicsClientId=self.client_id)
 
     left_visual_outer = pb.createVisualShape(pb.GEOM_BOX,
                                              halfExtents=[size0_outer, half_thickness, half_wall_height_outer],
-                                             rgbaColor=color)
+                                             rgbaColor=color, physicsClientId=self.client_id)
     left_collision_outer = pb.createCollisionShape(pb.GEOM_BOX, halfExtents=[size0_outer, half_thickness,
-                                                                             half_wall_height_outer])
+                                                                             half_wall_height_outer], physicsClientId=self.client_id)
 
     right_visual_outer = pb.createVisualShape(pb.GEOM_BOX,
                                               halfExtents=[size0_outer, half_thickness, half_wall_height_outer],
-                                              rgbaColor=color)
+                                              rgbaColor=color, physicsClientId=self.client_id)
     right_collision_outer = pb.createCollisionShape(pb.GEOM_BOX, halfExtents=[size0_outer, half_thickness,
-                                                                              half_wall_height_outer])
+                                                                              half_wall_height_outer], physicsClientId=self.client_id)
 
     self.id = pb.createMultiBody(baseMass=0,
                                  baseCollisionShapeIndex=bottom_collision,
@@ -149,25 +150,25 @@ class Tray:
                                  linkJointTypes=[pb.JOINT_FIXED, pb.JOINT_FIXED, pb.JOINT_FIXED, pb.JOINT_FIXED,
                                                  pb.JOINT_FIXED, pb.JOINT_FIXED, pb.JOINT_FIXED, pb.JOINT_FIXED],
                                  linkJointAxis=[[0, 0, 1], [0, 0, 1], [0, 0, 1], [0, 0, 1],
-                                                [0, 0, 1], [0, 0, 1], [0, 0, 1], [0, 0, 1]]
+                                                [0, 0, 1], [0, 0, 1], [0, 0, 1], [0, 0, 1]], physicsClientId=self.client_id
                                  )
     for i in range(1, 9):
       pb.changeDynamics(self.id,
                         i,
                         lateralFriction=0.,
                         rollingFriction=0.,
-                        linearDamping=0.1)
+                        linearDamping=0.1, physicsClientId=self.client_id)
 
     pb.changeDynamics(self.id,
                       -1,
                       lateralFriction=0.5,
                       rollingFriction=0.01,
-                      linearDamping=0.1)
+                      linearDamping=0.1, physicsClientId=self.client_id)
 
   def reset(self, pos=(0, 0, 0), rot=(0, 0, 0, 1)):
-    pb.resetBasePositionAndOrientation(self.id, pos, rot)
+    pb.resetBasePositionAndOrientation(self.id, pos, rot, physicsClientId=self.client_id)
 
   def remove(self):
     if self.id:
-      pb.removeBody(self.id)
+      pb.removeBody(self.id, physicsClientId=self.client_id)
     self.id = None
@@ -11,23 +11,23 @@ from bulletarm.pybullet.utils import constants
 
 
 class Bottle(PybulletObject):
-  def __init__(self, pos, rot, scale):
+  def __init__(self, pos, rot, scale, client_id=0):
     self.scale = scale
     root_dir = os.path.dirname(bulletarm.__file__)
     # self.model_id = 1
     self.model_id = np.random.choice([1, 3, 4, 5, 7, 8, 9, 10])
     urdf_filepath = os.path.join(root_dir, constants.OBJECTS_PATH, 'bottle/bottle{}.urdf'.format(self.model_id))
-    object_id = pb.loadURDF(urdf_filepath, basePosition=pos, baseOrientation=rot, globalScaling=scale)
+    object_id = pb.loadURDF(urdf_filepath, basePosition=pos, baseOrientation=rot, globalScaling=scale, physicsClientId=client_id)
 
-    super(Bottle, self).__init__(constants.BOTTLE, object_id)
+    super(Bottle, self).__init__(constants.BOTTLE, object_id, client_id)
 
   def getGraspRotation(self):
-    link_state = pb.getLinkState(self.object_id, 0)
+    link_state = pb.getLinkState(self.object_id, 0, physicsClientId=self.client_id)
     rot_q = link_state[1]
     return list(rot_q)
 
   def getGraspPosition(self):
-    link_state = pb.getLinkState(self.object_id, 0)
+    link_state = pb.getLinkState(self.object_id, 0, physicsClientId=self.client_id)
     pos = link_state[0]
     return list(pos)
 
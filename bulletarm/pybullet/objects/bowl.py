@@ -31,16 +31,16 @@ def getZOffset(model_id):
     raise NotImplementedError
 
 class Bowl(PybulletObject):
-  def __init__(self, pos, rot, scale):
+  def __init__(self, pos, rot, scale, client_id=0):
     self.scale = scale
     root_dir = os.path.dirname(bulletarm.__file__)
     self.model_id = 1
     urdf_filepath = os.path.join(root_dir, constants.OBJECTS_PATH, 'bowl/bowl{}.urdf'.format(self.model_id))
-    object_id = pb.loadURDF(urdf_filepath, basePosition=pos, baseOrientation=rot, globalScaling=scale)
+    object_id = pb.loadURDF(urdf_filepath, basePosition=pos, baseOrientation=rot, globalScaling=scale, physicsClientId=client_id)
 
-    super(Bowl, self).__init__(constants.BOWL, object_id)
+    super(Bowl, self).__init__(constants.BOWL, object_id, client_id)
 
-    pb.changeVisualShape(object_id, -1, rgbaColor=[1, 1, 0, 1])
+    pb.changeVisualShape(object_id, -1, rgbaColor=[1, 1, 0, 1], physicsClientId=client_id)
 
   def getGraspRotation(self):
     return self.getGraspPose()[1]
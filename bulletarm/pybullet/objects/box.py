@@ -11,21 +11,21 @@ from bulletarm.pybullet.utils import constants
 from bulletarm.pybullet.utils import transformations
 
 class Box(PybulletObject):
-  def __init__(self, pos, rot, scale):
+  def __init__(self, pos, rot, scale, client_id=0):
     root_dir = os.path.dirname(bulletarm.__file__)
     urdf_filepath = os.path.join(root_dir, constants.OBJECTS_PATH, 'box/box.urdf')
-    object_id = pb.loadURDF(urdf_filepath, basePosition=pos, baseOrientation=rot, globalScaling=scale, flags=pb.URDF_ENABLE_SLEEPING)
+    object_id = pb.loadURDF(urdf_filepath, basePosition=pos, baseOrientation=rot, globalScaling=scale, flags=pb.URDF_ENABLE_SLEEPING, physicsClientId=client_id)
     shade = np.random.rand() + 0.5
     color = np.float32([shade * 156, shade * 117, shade * 95, 255]) / 255
-    pb.changeVisualShape(object_id, -1, rgbaColor=color)
-    super(Box, self).__init__(constants.BOX, object_id)
+    pb.changeVisualShape(object_id, -1, rgbaColor=color, physicsClientId=client_id)
+    super(Box, self).__init__(constants.BOX, object_id, client_id)
 
   def getRotation(self):
     pos, rot = self.getPose()
     return rot
 
   def getPose(self):
-    pos, rot = pb.getBasePositionAndOrientation(self.object_id)
+    pos, rot = pb.getBasePositionAndOrientation(self.object_id, physicsClientId=self.client_id)
     T = transformations.quaternion_matrix(rot)
     t = 0
     while T[2, 2] < 0.5 and t < 3:
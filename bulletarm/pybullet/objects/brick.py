@@ -11,12 +11,12 @@ from bulletarm.pybullet.utils import constants
 from bulletarm.pybullet.utils import transformations
 
 class Brick(PybulletObject):
-  def __init__(self, pos, rot, scale):
+  def __init__(self, pos, rot, scale, client_id=0):
     root_dir = os.path.dirname(bulletarm.__file__)
     urdf_filepath = os.path.join(root_dir, constants.OBJECTS_PATH, 'brick_small.urdf')
-    object_id = pb.loadURDF(urdf_filepath, basePosition=pos, baseOrientation=rot, globalScaling=scale)
-    pb.changeVisualShape(object_id, -1, rgbaColor=[0, 0, 1, 1])
-    super(Brick, self).__init__(constants.BRICK, object_id)
+    object_id = pb.loadURDF(urdf_filepath, basePosition=pos, baseOrientation=rot, globalScaling=scale, physicsClientId=client_id)
+    pb.changeVisualShape(object_id, -1, rgbaColor=[0, 0, 1, 1], physicsClientId=client_id)
+    super(Brick, self).__init__(constants.BRICK, object_id, client_id)
 
     self.original_size = 0.05
     self.size = 0.05 * scale
@@ -29,7 +29,7 @@ class Brick(PybulletObject):
     return rot
 
   def getPose(self):
-    pos, rot = pb.getBasePositionAndOrientation(self.object_id)
+    pos, rot = pb.getBasePositionAndOrientation(self.object_id, physicsClientId=self.client_id)
     T = transformations.quaternion_matrix(rot)
     t = 0
     while T[2, 2] < 0.5 and t < 3:
@@ -9,21 +9,21 @@ from bulletarm.pybullet.objects.pybullet_object import PybulletObject
 from bulletarm.pybullet.utils import constants
 
 class Cup(PybulletObject):
-  def __init__(self, pos, rot, scale):
+  def __init__(self, pos, rot, scale, client_id=0):
     root_dir = os.path.dirname(bulletarm.__file__)
     # urdf_filepath = os.path.join(root_dir, constants.OBJECTS_PATH, 'kitchenUtensils/urdf/glass2.urdf')
     urdf_filepath = os.path.join(root_dir, constants.OBJECTS_PATH, 'cup/cup.urdf')
-    object_id = pb.loadURDF(urdf_filepath, basePosition=pos, baseOrientation=rot, globalScaling=scale)
+    object_id = pb.loadURDF(urdf_filepath, basePosition=pos, baseOrientation=rot, globalScaling=scale, physicsClientId=client_id)
 
-    super(Cup, self).__init__(constants.CUP, object_id)
+    super(Cup, self).__init__(constants.CUP, object_id, client_id)
 
   def getGraspRotation(self):
-    link_state = pb.getLinkState(self.object_id, 0)
+    link_state = pb.getLinkState(self.object_id, 0, physicsClientId=self.client_id)
     rot_q = link_state[1]
     return list(rot_q)
 
   def getGraspPosition(self):
-    link_state = pb.getLinkState(self.object_id, 0)
+    link_state = pb.getLinkState(self.object_id, 0, physicsClientId=self.client_id)
     pos = link_state[0]
     return list(pos)
 
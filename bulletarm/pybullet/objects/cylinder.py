@@ -9,12 +9,12 @@ from bulletarm.pybullet.objects.pybullet_object import PybulletObject
 from bulletarm.pybullet.utils import constants
 
 class Cylinder(PybulletObject):
-  def __init__(self, pos, rot, scale):
+  def __init__(self, pos, rot, scale, client_id=0):
     root_dir = os.path.dirname(bulletarm.__file__)
     urdf_filepath = os.path.join(root_dir, constants.OBJECTS_PATH, 'cylinder.urdf')
-    object_id = pb.loadURDF(urdf_filepath, basePosition=pos, baseOrientation=rot, globalScaling=scale)
+    object_id = pb.loadURDF(urdf_filepath, basePosition=pos, baseOrientation=rot, globalScaling=scale, physicsClientId=client_id)
 
-    super(Cylinder, self).__init__(constants.CUBE, object_id)
+    super(Cylinder, self).__init__(constants.CUBE, object_id, client_id)
 
     self.original_height = 0.025
     self.original_size = 0.05
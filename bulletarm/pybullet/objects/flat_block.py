@@ -8,14 +8,14 @@ from bulletarm.pybullet.utils import constants
 
 
 class FlatBlock(PybulletObject):
-  def __init__(self, pos, rot, scale):
-    bottom_visual = pb.createVisualShape(pb.GEOM_BOX, halfExtents=[0.05*scale, 0.05*scale, 0.025], rgbaColor=[1, 1, 1, 1])
-    bottom_collision = pb.createCollisionShape(pb.GEOM_BOX, halfExtents=[0.05*scale, 0.05*scale, 0.025])
+  def __init__(self, pos, rot, scale, client_id=0):
+    bottom_visual = pb.createVisualShape(pb.GEOM_BOX, halfExtents=[0.05*scale, 0.05*scale, 0.025], rgbaColor=[1, 1, 1, 1], physicsClientId=client_id)
+    bottom_collision = pb.createCollisionShape(pb.GEOM_BOX, halfExtents=[0.05*scale, 0.05*scale, 0.025], physicsClientId=client_id)
     object_id = pb.createMultiBody(baseMass=0.5,
                             baseCollisionShapeIndex=bottom_collision,
                             baseVisualShapeIndex=bottom_visual,
                             basePosition=pos,
-                            baseOrientation=rot,
+                            baseOrientation=rot, physicsClientId=client_id,
                             )
-    pb.changeVisualShape(object_id, -1, rgbaColor=[0, 0, 1, 1])
-    super(FlatBlock, self).__init__(constants.FLAT_BLOCK, object_id)
+    pb.changeVisualShape(object_id, -1, rgbaColor=[0, 0, 1, 1], physicsClientId=client_id)
+    super(FlatBlock, self).__init__(constants.FLAT_BLOCK, object_id, client_id)
@@ -10,6 +10,7 @@ import glob
 import bulletarm
 from bulletarm.pybullet.objects.pybullet_object import PybulletObject
 from bulletarm.pybullet.utils import constants
+from bulletarm.pybullet.utils.shape_cache import getMeshShapes
 
 root_dir = os.path.dirname(bulletarm.__file__)
 obj_pattern = os.path.join(root_dir, constants.OBJECTS_PATH, 'GraspNet1B_object/0*/')
@@ -22,14 +23,22 @@ def get_immediate_subdirectories(a_dir):
             if os.path.isdir(os.path.join(a_dir, name))]
 
 
+def sampleIndex(index=-1):
+    """
+    Resolve the model index of a GraspNet object.
+    :param index: the model index, a random model is sampled if negative
+    :return: the model index
+    """
+    if index < 0:
+        index = np.random.choice(np.arange(total_num_objects), 1)[0]
+    return index
+
+
 class GraspNetObject(PybulletObject):
-    def __init__(self, pos, rot, scale, index=-1):
+    def __init__(self, pos, rot, scale, index=-1, client_id=0):
 
-        if index >= 0:
-            obj_filepath = found_object_directories[index]
-        else:
-            index = np.random.choice(np.arange(total_num_objects), 1)[0]
-            obj_filepath = found_object_directories[index]
+        index = sampleIndex(index)
+        obj_filepath = found_object_directories[index]
 
         color = np.random.uniform(0.6, 1, (4,))
         color[-1] = 1
@@ -40,40 +49,36 @@ class GraspNetObject(PybulletObject):
         obj_scale = scale
 
         while True:
-            obj_visual = pb.createVisualShape(pb.GEOM_MESH,
-                                              fileName=obj_filepath + 'convex.obj',
-                                              rgbaColor=color,
-                                              meshScale=[obj_scale, obj_scale, obj_scale])
-            obj_collision = pb.createCollisionShape(pb.GEOM_MESH,
-                                                    fileName=obj_filepath + 'convex.obj',
-                                                    meshScale=[obj_scale, obj_scale, obj_scale])
+            obj_visual, obj_collision = getMeshShapes(obj_filepath + 'convex.obj', [obj_scale, obj_scale, obj_scale],
+                                                      client_id)
 
             object_id = pb.createMultiBody(baseMass=0.15,
                                            baseCollisionShapeIndex=obj_collision,
                                            baseVisualShapeIndex=obj_visual,
                                            basePosition=pos,
-                                           baseOrientation=rot)
+                                           baseOrientation=rot, physicsClientId=client_id)
 
-            aabb = pb.getAABB(object_id)
+            aabb = pb.getAABB(object_id, physicsClientId=client_id)
             aabb = np.asarray(aabb)
             size = aabb[1] - aabb[0]
 
             if np.partition(size, -2)[-2] > obj_edge_max:
                 obj_scale *= 0.8
-                pb.removeBody(object_id)
+                pb.removeBody(object_id, physicsClientId=client_id)
             elif size[0] * size[1] * size[2] > obj_volume_max:
                 obj_scale *= 0.85
-                pb.removeBody(object_id)
+                pb.removeBody(object_id, physicsClientId=client_id)
             elif size.min() < obj_edge_min:
                 obj_scale /= 0.95
-                pb.removeBody(object_id)
+                pb.removeBody(object_id, physicsClientId=client_id)
             else:
                 break
+        pb.changeVisualShape(object_id, -1, rgbaColor=color, physicsClientId=client_id)
 
         pb.changeDynamics(object_id,
                           -1,
                           lateralFriction=1,
                           spinningFriction=0.005,
-                          rollingFriction=0.005)
+                          rollingFriction=0.005, physicsClientId=client_id)
 
-        super(GraspNetObject, self).__init__(constants.RANDOM, object_id)
+        super(GraspNetObject, self).__init__(constants.RANDOM, object_id, client_id)
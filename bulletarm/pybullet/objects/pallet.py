@@ -9,9 +9,9 @@ from bulletarm.pybullet.objects.pybullet_object import PybulletObject
 from bulletarm.pybullet.utils import constants
 
 class Pallet(PybulletObject):
-  def __init__(self, pos, rot, scale):
+  def __init__(self, pos, rot, scale, client_id=0):
     root_dir = os.path.dirname(bulletarm.__file__)
     urdf_filepath = os.path.join(root_dir, constants.OBJECTS_PATH, 'pallet/pallet3.urdf')
-    object_id = pb.loadURDF(urdf_filepath, basePosition=pos, baseOrientation=rot, globalScaling=scale, useFixedBase=True)
+    object_id = pb.loadURDF(urdf_filepath, basePosition=pos, baseOrientation=rot, globalScaling=scale, useFixedBase=True, physicsClientId=client_id)
 
-    super(Pallet, self).__init__(constants.PALLET, object_id)
+    super(Pallet, self).__init__(constants.PALLET, object_id, client_id)
@@ -53,14 +53,14 @@ PLACE_Z_OFFSET = {
 }
 
 class Plate(PybulletObject):
-  def __init__(self, pos, rot, scale, model_id):
+  def __init__(self, pos, rot, scale, model_id, client_id=0):
     self.scale = scale
     root_dir = os.path.dirname(bulletarm.__file__)
     self.model_id = model_id
     urdf_filepath = os.path.join(root_dir, constants.OBJECTS_PATH, 'plate/plate{}.urdf'.format(self.model_id))
-    object_id = pb.loadURDF(urdf_filepath, basePosition=pos, baseOrientation=rot, globalScaling=scale)
+    object_id = pb.loadURDF(urdf_filepath, basePosition=pos, baseOrientation=rot, globalScaling=scale, physicsClientId=client_id)
 
-    super(Plate, self).__init__(constants.CUBE, object_id)
+    super(Plate, self).__init__(constants.CUBE, object_id, client_id)
 
   # def getRotation(self):
   #   link_state = pb.getLinkState(self.object_id, 0)
@@ -74,12 +74,12 @@ class Plate(PybulletObject):
   #   return list(pos), list(rot)
 
   def getGraspRotation(self):
-    link_state = pb.getLinkState(self.object_id, 0)
+    link_state = pb.getLinkState(self.object_id, 0, physicsClientId=self.client_id)
     rot_q = link_state[1]
     return list(rot_q)
 
   def getGraspPosition(self):
-    link_state = pb.getLinkState(self.object_id, 0)
+    link_state = pb.getLinkState(self.object_id, 0, physicsClientId=self.client_id)
     pos = link_state[0]
     return list(pos)
 
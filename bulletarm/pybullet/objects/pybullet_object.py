@@ -3,6 +3,7 @@
 '''
 
 import pybullet as pb
+from bulletarm.pybullet.utils import pybullet_util
 
 class PybulletObject(object):
   '''
@@ -11,10 +12,12 @@ class PybulletObject(object):
   Args:
     object_type_id (int): The id for the object type being loaded. See cosntants.py.
     object_id (int): The object id.
+    client_id (int): The pybullet physics client the object was loaded into. Defaults to 0.
   '''
-  def __init__(self, object_type_id, object_id):
+  def __init__(self, object_type_id, object_id, client_id=0):
     self.object_type_id = object_type_id
     self.object_id = object_id
+    self.client_id = client_id
 
   def getXPosition(self):
     '''
@@ -59,7 +62,7 @@ class PybulletObject(object):
     Returns:
       list[float]: The xyz position of the object.
     '''
-    pos, _ = pb.getBasePositionAndOrientation(self.object_id)
+    pos, _ = pb.getBasePositionAndOrientation(self.object_id, physicsClientId=self.client_id)
     return list(pos)
 
   def getRotation(self):
@@ -69,7 +72,7 @@ class PybulletObject(object):
     Returns:
       list[float](numpy.array): The rpy orientation of the object.
     '''
-    _, rot = pb.getBasePositionAndOrientation(self.object_id)
+    _, rot = pb.getBasePositionAndOrientation(self.object_id, physicsClientId=self.client_id)
     return list(rot)
 
   def getPose(self):
@@ -79,7 +82,7 @@ class PybulletObject(object):
     Returns:
       (list[float], list[float]): (position, orientation)
     '''
-    pos, rot = pb.getBasePositionAndOrientation(self.object_id)
+    pos, rot = pb.getBasePositionAndOrientation(self.object_id, physicsClientId=self.client_id)
     return list(pos), list(rot)
 
   def getGraspPosition(self):
@@ -120,7 +123,7 @@ class PybulletObject(object):
     Returns:
 
     '''
-    return pb.resetBaseVelocity(self.object_id, linear_velocity, angular_velocity)
+    return pb.resetBaseVelocity(self.object_id, linear_velocity, angular_velocity, physicsClientId=self.client_id)
 
   def getVelocity(self):
     '''
@@ -129,7 +132,7 @@ class PybulletObject(object):
     Returns:
       (list[float], list[float]): (linear_velocity, angular velocity)
     '''
-    return pb.getBaseVelocity(self.object_id)
+    return pb.getBaseVelocity(self.object_id, physicsClientId=self.client_id)
 
   def getBoundingBox(self):
     '''
@@ -138,7 +141,7 @@ class PybulletObject(object):
     Returns:
       list[float]: The AABB bounding box
     '''
-    return list(pb.getAABB(self.object_id))
+    return list(pb.getAABB(self.object_id, physicsClientId=self.client_id))
 
   def getContactPoints(self):
     '''
@@ -147,7 +150,7 @@ class PybulletObject(object):
     Returns:
       list[float]: The points of contact
     '''
-    return pb.getContactPoints(self.object_id)
+    return pybullet_util.getContactPoints(self.object_id, self.client_id)
 
   def isTouching(self, obj):
     '''
@@ -189,7 +192,8 @@ class PybulletObject(object):
       pos (numpy.array): Position
       rot (numpy.array): Orientation
     '''
-    pb.resetBasePositionAndOrientation(self.object_id, pos, rot)
+    pb.resetBasePositionAndOrientation(self.object_id, pos, rot, physicsClientId=self.client_id)
+    pybullet_util.markWorldChanged(self.client_id)
 
   def __eq__(self, other):
     '''
@@ -9,6 +9,7 @@ import glob
 import bulletarm
 from bulletarm.pybullet.objects.pybullet_object import PybulletObject
 from bulletarm.pybullet.utils import constants
+from bulletarm.pybullet.utils.shape_cache import getMeshShapes
 
 root_dir = os.path.dirname(bulletarm.__file__)
 obj_pattern = os.path.join(root_dir, constants.OBJECTS_PATH, 'random_block/*.obj')
@@ -25,25 +26,34 @@ base_rotation_map = {
   '7.obj': (0, 0, np.pi/2),
 }
 
+def sampleIndex(index=-1):
+  '''
+  Resolve the model index of a random block.
+
+  Args:
+    index (int): The model index. A random model is sampled if negative. Defaults to -1.
+
+  Returns:
+    int: The model index
+  '''
+  if index < 0:
+    index = np.random.choice(np.arange(total_num_objects), 1)[0]
+  return index
+
 class RandomBlock(PybulletObject):
-  def __init__(self, pos, rot, scale):
-    obj_filepath = found_object_directories[np.random.choice(np.arange(total_num_objects), 1)[0]]
+  def __init__(self, pos, rot, scale, client_id=0, index=-1):
+    obj_filepath = found_object_directories[sampleIndex(index)]
     model = obj_filepath.split('/')[-1]
     shape_rotation = pb.getQuaternionFromEuler(base_rotation_map[model]) if model in base_rotation_map.keys() else (0, 0, 0, 1)
     mesh_scale = [scale, scale, scale]
-    visualShapeId = pb.createVisualShape(shapeType=pb.GEOM_MESH,
-                                         fileName=obj_filepath,
-                                         rgbaColor=[np.random.random(), np.random.random(), np.random.random(), 1],
-                                         meshScale=mesh_scale,
-                                         visualFrameOrientation=shape_rotation)
-    collisionShapeId = pb.createCollisionShape(shapeType=pb.GEOM_MESH,
-                                               fileName=obj_filepath,
-                                               meshScale=mesh_scale,
-                                               collisionFrameOrientation=shape_rotation)
+    color = [np.random.random(), np.random.random(), np.random.random(), 1]
+    visualShapeId, collisionShapeId = getMeshShapes(obj_filepath, mesh_scale, client_id,
+                                                    frame_orientation=shape_rotation)
     object_id = pb.createMultiBody(baseMass=0.1,
                                    baseInertialFramePosition=[0, 0, 0],
                                    baseCollisionShapeIndex=collisionShapeId,
                                    baseVisualShapeIndex=visualShapeId,
                                    basePosition=pos,
-                                   baseOrientation=rot)
-    super(RandomBlock, self).__init__(constants.RANDOM, object_id)
+                                   baseOrientation=rot, physicsClientId=client_id)
+    pb.changeVisualShape(object_id, -1, rgbaColor=color, physicsClientId=client_id)
+    super(RandomBlock, self).__init__(constants.RANDOM, object_id, client_id)
@@ -7,17 +7,17 @@ from bulletarm.pybullet.objects.pybullet_object import PybulletObject
 from bulletarm.pybullet.utils import constants
 
 class RandomBrick(PybulletObject):
-  def __init__(self, pos, rot, x_scale, y_scale, z_scale):
+  def __init__(self, pos, rot, x_scale, y_scale, z_scale, client_id=0):
     visualShapeId = pb.createVisualShape(shapeType=pb.GEOM_BOX,
-                                         halfExtents=[0.05/2*x_scale, 0.15/2*y_scale, 0.05/2*z_scale])
+                                         halfExtents=[0.05/2*x_scale, 0.15/2*y_scale, 0.05/2*z_scale], physicsClientId=client_id)
     collisionShapeId = pb.createCollisionShape(shapeType=pb.GEOM_BOX,
-                                               halfExtents=[0.05/2*x_scale, 0.15/2*y_scale, 0.05/2*z_scale])
+                                               halfExtents=[0.05/2*x_scale, 0.15/2*y_scale, 0.05/2*z_scale], physicsClientId=client_id)
     object_id = pb.createMultiBody(baseMass=0.1,
                                    baseInertialFramePosition=[0, 0, 0],
                                    baseCollisionShapeIndex=collisionShapeId,
                                    baseVisualShapeIndex=visualShapeId,
                                    basePosition=pos,
-                                   baseOrientation=rot)
-    pb.changeVisualShape(object_id, -1, rgbaColor=[0, 0, 1, 1])
+                                   baseOrientation=rot, physicsClientId=client_id)
+    pb.changeVisualShape(object_id, -1, rgbaColor=[0, 0, 1, 1], physicsClientId=client_id)
 
-    super(RandomBrick, self).__init__(constants.BRICK, object_id)
+    super(RandomBrick, self).__init__(constants.BRICK, object_id, client_id)
@@ -17,12 +17,26 @@ found_object_directories = glob.glob(urdf_pattern)
 #                                        found_object_directories))
 total_num_objects = len(found_object_directories)
 
+def sampleIndex(index=-1):
+  '''
+  Resolve the model index of a random household object.
+
+  Args:
+    index (int): The model index. A random model is sampled if negative. Defaults to -1.
+
+  Returns:
+    int: The model index
+  '''
+  if index < 0:
+    index = np.random.choice(np.arange(total_num_objects), 1)[0]
+  return index
+
 class RandomHouseHoldObject(PybulletObject):
-  def __init__(self, pos, rot, scale):
+  def __init__(self, pos, rot, scale, client_id=0, index=-1):
     # for i, urdf in enumerate(found_object_directories):
     #   pb.loadURDF(urdf, basePosition=[0.1+i//4*0.15, 0.1+i%4*0.15, 0.05], baseOrientation=(0, 0, 0, 1), globalScaling=scale)
 
-    urdf_filepath = found_object_directories[np.random.choice(np.arange(total_num_objects), 1)[0]]
-    object_id = pb.loadURDF(urdf_filepath, basePosition=pos, baseOrientation=rot, globalScaling=scale)
+    urdf_filepath = found_object_directories[sampleIndex(index)]
+    object_id = pb.loadURDF(urdf_filepath, basePosition=pos, baseOrientation=rot, globalScaling=scale, physicsClientId=client_id)
 
-    super(RandomHouseHoldObject, self).__init__(constants.RANDOM, object_id)
+    super(RandomHouseHoldObject, self).__init__(constants.RANDOM, object_id, client_id)
@@ -10,6 +10,7 @@ import glob
 import bulletarm
 from bulletarm.pybullet.objects.pybullet_object import PybulletObject
 from bulletarm.pybullet.utils import constants
+from bulletarm.pybullet.utils.shape_cache import getMeshShapes
 from bulletarm.pybullet.objects.random_household_object_200_info import *
 
 root_dir = os.path.dirname(bulletarm.__file__)
@@ -44,20 +45,31 @@ def delete_big_files():
                 os.remove(file_path)
 
 
+sorted_obj_sr_indx = np.argsort(obj_avg_sr)[::-1]
+
+
+def sampleIndex(index=-1):
+    """
+    Resolve the model index of a household object. Non-negative indices rank the objects by their grasp success rate.
+    :param index: the model index, a random object with a high success rate is sampled if negative
+    :return: the model index
+    """
+    if index < 0:
+        while True:
+            index = np.random.choice(np.arange(total_num_objects), 1)[0]
+            if obj_avg_sr[index] > 0.97:  # sr > 0.8:  143 objs; sr > 0.9: 134 objs;
+                                          # sr > 0.95: 105 objs; sr > 0.99: 41 objs;
+                                          # sr > 0.97: 76 objs
+                                          # avg sr = 0.923; avg sr > 0.8 = 0.968
+                                          # avg sr > 0.97 = 0.9938
+                break
+        index = int(np.nonzero(sorted_obj_sr_indx == index)[0][0])
+    return index
+
+
 class RandomHouseHoldObject200(PybulletObject):
-    def __init__(self, pos, rot, scale, index=-1):
-        if index < 0:
-            while True:
-                index = np.random.choice(np.arange(total_num_objects), 1)[0]
-                if obj_avg_sr[index] > 0.97:  # sr > 0.8:  143 objs; sr > 0.9: 134 objs;
-                                              # sr > 0.95: 105 objs; sr > 0.99: 41 objs;
-                                              # sr > 0.97: 76 objs
-                                              # avg sr = 0.923; avg sr > 0.8 = 0.968
-                                              # avg sr > 0.97 = 0.9938
-                    break
-        else:
-            sorted_obj_sr_indx = np.argsort(obj_avg_sr)[::-1]
-            index = sorted_obj_sr_indx[index]
+    def __init__(self, pos, rot, scale, index=-1, client_id=0):
+        index = sorted_obj_sr_indx[sampleIndex(index)]
         obj_filepath = found_object_directories[index]
         # object_id = pb.loadURDF(obj_filepath, basePosition=pos, baseOrientation=rot, globalScaling=scale)
 
@@ -66,15 +78,8 @@ class RandomHouseHoldObject200(PybulletObject):
 
         real_scale = obj_scales[index] * scale
         center = [x * scale for x in obj_centers[index]]
-        obj_visual = pb.createVisualShape(pb.GEOM_MESH,
-                                          fileName=obj_filepath,
-                                          meshScale=[real_scale, real_scale, real_scale],
-                                          rgbaColor=color,
-                                          visualFramePosition=center)
-        obj_collision = pb.createCollisionShape(pb.GEOM_MESH,
-                                                fileName=obj_filepath,
-                                                meshScale=[real_scale, real_scale, real_scale],
-                                                collisionFramePosition=center)
+        obj_visual, obj_collision = getMeshShapes(obj_filepath, [real_scale, real_scale, real_scale], client_id,
+                                                  frame_position=center)
         self.center = center
         self.real_scale = real_scale
 
@@ -82,12 +87,13 @@ class RandomHouseHoldObject200(PybulletObject):
                                        baseCollisionShapeIndex=obj_collision,
                                        baseVisualShapeIndex=obj_visual,
                                        basePosition=pos,
-                                       baseOrientation=rot)
+                                       baseOrientation=rot, physicsClientId=client_id)
+        pb.changeVisualShape(object_id, -1, rgbaColor=color, physicsClientId=client_id)
 
         pb.changeDynamics(object_id,
                           -1,
                           lateralFriction=1,
                           spinningFriction=0.005,
-                          rollingFriction=0.005)
+                          rollingFriction=0.005, physicsClientId=client_id)
 
-        super(RandomHouseHoldObject200, self).__init__(constants.RANDOM, object_id)
+        super(RandomHouseHoldObject200, self).__init__(constants.RANDOM, object_id, client_id)
@@ -10,6 +10,7 @@ import re
 import bulletarm
 from bulletarm.pybullet.objects.pybullet_object import PybulletObject
 from bulletarm.pybullet.utils import constants
+from bulletarm.pybullet.utils.shape_cache import getMeshShapes
 
 root_dir = os.path.dirname(bulletarm.__file__)
 obj_pattern = os.path.join(root_dir, constants.OBJECTS_PATH, 'random_urdfs/*/*.obj')
@@ -20,18 +21,27 @@ found_object_directories = list(filter(lambda x: re.search(r'(002|005|027|032|06
                                        found_object_directories))
 total_num_objects = len(found_object_directories)
 
+def sampleIndex(index=-1):
+  '''
+  Resolve the model index of a random object.
+
+  Args:
+    index (int): The model index. A random model is sampled if negative. Defaults to -1.
+
+  Returns:
+    int: The model index
+  '''
+  if index < 0:
+    index = np.random.choice(np.arange(total_num_objects), 1)[0]
+  return index
+
 class RandomObject(PybulletObject):
-  def __init__(self, pos, rot, scale, z_scale=1):
+  def __init__(self, pos, rot, scale, z_scale=1, client_id=0, index=-1):
     self.z_scale = z_scale
-    obj_filepath = found_object_directories[np.random.choice(np.arange(total_num_objects), 1)[0]]
+    obj_filepath = found_object_directories[sampleIndex(index)]
     mesh_scale = [0.01 * scale, 0.01 * scale, 0.01 * scale * z_scale]
-    visualShapeId = pb.createVisualShape(shapeType=pb.GEOM_MESH,
-                                         fileName=obj_filepath,
-                                         rgbaColor=[np.random.random(), np.random.random(), np.random.random(), 1],
-                                         meshScale=mesh_scale)
-    collisionShapeId = pb.createCollisionShape(shapeType=pb.GEOM_MESH,
-                                               fileName=obj_filepath,
-                                               meshScale=mesh_scale)
+    color = [np.random.random(), np.random.random(), np.random.random(), 1]
+    visualShapeId, collisionShapeId = getMeshShapes(obj_filepath, mesh_scale, client_id)
     # collisionShapeId = pb.createCollisionShape(shapeType=pb.GEOM_BOX,
     #                                            halfExtents=[0.024*scale, 0.024*scale, 0.024*scale])
     object_id = pb.createMultiBody(baseMass=0.1,
@@ -39,6 +49,7 @@ class RandomObject(PybulletObject):
                                    baseCollisionShapeIndex=collisionShapeId,
                                    baseVisualShapeIndex=visualShapeId,
                                    basePosition=pos,
-                                   baseOrientation=rot)
+                                   baseOrientation=rot, physicsClientId=client_id)
+    pb.changeVisualShape(object_id, -1, rgbaColor=color, physicsClientId=client_id)
     # pb.changeDynamics(object_id, -1, mass=0.1, lateralFriction=1.0, spinningFriction=0.0, rollingFriction=0.0)
-    super(RandomObject, self).__init__(constants.RANDOM, object_id)
+    super(RandomObject, self).__init__(constants.RANDOM, object_id, client_id)
@@ -9,12 +9,12 @@ from bulletarm.pybullet.objects.pybullet_object import PybulletObject
 from bulletarm.pybullet.utils import constants
 
 class Roof(PybulletObject):
-  def __init__(self, pos, rot, scale):
+  def __init__(self, pos, rot, scale, client_id=0):
     root_dir = os.path.dirname(bulletarm.__file__)
     urdf_filepath = os.path.join(root_dir, constants.OBJECTS_PATH, 'roof.urdf')
-    object_id = pb.loadURDF(urdf_filepath, basePosition=pos, baseOrientation=rot, globalScaling=scale)
-    pb.changeVisualShape(object_id, -1, rgbaColor=[1, 1, 0, 1])
-    super(Roof, self).__init__(constants.ROOF, object_id)
+    object_id = pb.loadURDF(urdf_filepath, basePosition=pos, baseOrientation=rot, globalScaling=scale, physicsClientId=client_id)
+    pb.changeVisualShape(object_id, -1, rgbaColor=[1, 1, 0, 1], physicsClientId=client_id)
+    super(Roof, self).__init__(constants.ROOF, object_id, client_id)
 
     self.original_size = 0.05
     self.size = 0.05 * scale
@@ -52,14 +52,14 @@ from bulletarm.pybullet.utils import constants
 # }
 
 class Swab(PybulletObject):
-  def __init__(self, pos, rot, scale, model_id=None):
+  def __init__(self, pos, rot, scale, model_id=None, client_id=0):
     self.scale = scale
     root_dir = os.path.dirname(bulletarm.__file__)
     self.model_id = model_id
     urdf_filepath = os.path.join(root_dir, constants.OBJECTS_PATH, 'swab/swab.urdf')
-    object_id = pb.loadURDF(urdf_filepath, basePosition=pos, baseOrientation=rot, globalScaling=scale)
+    object_id = pb.loadURDF(urdf_filepath, basePosition=pos, baseOrientation=rot, globalScaling=scale, physicsClientId=client_id)
 
-    super(Swab, self).__init__(constants.SWAB, object_id)
+    super(Swab, self).__init__(constants.SWAB, object_id, client_id)
 
   # def getRotation(self):
   #   link_state = pb.getLinkState(self.object_id, 0)
@@ -73,12 +73,12 @@ class Swab(PybulletObject):
   #   return list(pos), list(rot)
 
   def getGraspRotation(self):
-    base_state = pb.getBasePositionAndOrientation(self.object_id)
+    base_state = pb.getBasePositionAndOrientation(self.object_id, physicsClientId=self.client_id)
     rot_q = base_state[0]
     return list(rot_q)
 
   def getGraspPosition(self):
-    base_state = pb.getBasePositionAndOrientation(self.object_id)
+    base_state = pb.getBasePositionAndOrientation(self.object_id, physicsClientId=self.client_id)
     pos = base_state[0]
     return list(pos)
 
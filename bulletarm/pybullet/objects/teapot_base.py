@@ -7,15 +7,15 @@ from bulletarm.pybullet.utils import transformations
 from bulletarm.pybullet.utils import constants
 
 class TeapotBase(PybulletObject):
-  def __init__(self, pos, rot, scale, model_id=1):
+  def __init__(self, pos, rot, scale, model_id=1, client_id=0):
     self.teapot_model_id = model_id
     urdf_filepath = os.path.join(constants.URDF_PATH, 'teapot/{}/base.urdf'.format(self.teapot_model_id))
-    object_id = pb.loadURDF(urdf_filepath, basePosition=pos, baseOrientation=rot, globalScaling=scale)
-    super().__init__(constants.TEAPOT, object_id)
+    object_id = pb.loadURDF(urdf_filepath, basePosition=pos, baseOrientation=rot, globalScaling=scale, physicsClientId=client_id)
+    super().__init__(constants.TEAPOT, object_id, client_id)
     self.scale = scale
 
   def getGraspPosition(self):
-    pos, rot = pb.getBasePositionAndOrientation(self.object_id)
+    pos, rot = pb.getBasePositionAndOrientation(self.object_id, physicsClientId=self.client_id)
     T = transformations.quaternion_matrix(rot)
     pos = np.array(pos)
     if self.teapot_model_id == 1:
@@ -36,7 +36,7 @@ class TeapotBase(PybulletObject):
     return self.getGraspPosition()
 
   def getOpenPos(self):
-    pos, rot = pb.getBasePositionAndOrientation(self.object_id)
+    pos, rot = pb.getBasePositionAndOrientation(self.object_id, physicsClientId=self.client_id)
     pos = np.array(pos)
     pos[2] += 1*self.scale
     return pos
@@ -9,12 +9,12 @@ from bulletarm.pybullet.objects.pybullet_object import PybulletObject
 from bulletarm.pybullet.utils import constants
 
 class Triangle(PybulletObject):
-  def __init__(self, pos, rot, scale):
+  def __init__(self, pos, rot, scale, client_id=0):
     root_dir = os.path.dirname(bulletarm.__file__)
     urdf_filepath = os.path.join(root_dir, constants.OBJECTS_PATH, 'triangle.urdf')
-    object_id = pb.loadURDF(urdf_filepath, basePosition=pos, baseOrientation=rot, globalScaling=scale)
-    pb.changeVisualShape(object_id, -1, rgbaColor=[1, 1, 0, 1])
-    super(Triangle, self).__init__(constants.TRIANGLE, object_id)
+    object_id = pb.loadURDF(urdf_filepath, basePosition=pos, baseOrientation=rot, globalScaling=scale, physicsClientId=client_id)
+    pb.changeVisualShape(object_id, -1, rgbaColor=[1, 1, 0, 1], physicsClientId=client_id)
+    super(Triangle, self).__init__(constants.TRIANGLE, object_id, client_id)
 
     self.original_size = 0.05
     self.size = 0.05 * scale
@@ -13,7 +13,6 @@ from bulletarm.pybullet.utils import constants
 from bulletarm.pybullet.robots.robot_base import RobotBase
 import time
 
-from bulletarm.pybullet.utils import pybullet_util
 from bulletarm.pybullet.utils import object_generation
 from bulletarm.pybullet.utils import transformations
 
@@ -21,8 +20,8 @@ class Kuka(RobotBase):
   '''
 
   '''
-  def __init__(self):
-    super().__init__()
+  def __init__(self, client_id=0):
+    super().__init__(client_id)
     self.max_velocity = .35
     self.max_force = 200.
     self.end_effector_index = 14
@@ -50,25 +49,29 @@ class Kuka(RobotBase):
     # ]
 
     self.gripper_joint_limit = [0, 0.2]
+    self.gripper_joint_indices = [8, 11]
+    self.gripper_joint_multipliers = [-1, 1]
+    self.gripper_open_position = self.gripper_joint_limit[1]
+    self.gripper_closed_position = self.gripper_joint_limit[0]
     self.adjust_gripper_offset = 0.01
 
   def initialize(self):
     ''''''
     ur5_urdf_filepath = os.path.join(constants.URDF_PATH, 'kuka/kuka_with_gripper2.sdf')
-    self.id = pb.loadSDF(ur5_urdf_filepath)[0]
-    pb.resetBasePositionAndOrientation(self.id, [-0.2,0,0], [0,0,0,1])
+    self.id = pb.loadSDF(ur5_urdf_filepath, physicsClientId=self.client_id)[0]
+    pb.resetBasePositionAndOrientation(self.id, [-0.2,0,0], [0,0,0,1], physicsClientId=self.client_id)
 
     # self.is_holding = False
     self.gripper_closed = False
     self.holding_obj = None
-    self.num_joints = pb.getNumJoints(self.id)
-    [pb.resetJointState(self.id, idx, self.home_positions[idx]) for idx in range(self.num_joints)]
+    self.num_joints = pb.getNumJoints(self.id, physicsClientId=self.client_id)
+    [pb.resetJointState(self.id, idx, self.home_positions[idx], physicsClientId=self.client_id) for idx in range(self.num_joints)]
     self.openGripper()
 
     self.arm_joint_names = list()
     self.arm_joint_indices = list()
     for i in range (self.num_joints):
-      joint_info = pb.getJointInfo(self.id, i)
+      joint_info = pb.getJointInfo(self.id, i, physicsClientId=self.client_id)
       if i in range(7):
         self.arm_joint_names.append(str(joint_info[1]))
         self.arm_joint_indices.append(i)
@@ -76,52 +79,20 @@ class Kuka(RobotBase):
   def reset(self):
     self.gripper_closed = False
     self.holding_obj = None
-    [pb.resetJointState(self.id, idx, self.home_positions[idx]) for idx in range(self.num_joints)]
+    [pb.resetJointState(self.id, idx, self.home_positions[idx], physicsClientId=self.client_id) for idx in range(self.num_joints)]
     self.moveToJ(self.home_positions_joint)
     self.openGripper()
 
-  def controlGripper(self, open_ratio, max_it=100):
-    p1, p2 = self._getGripperJointPosition()
-    target = open_ratio * (self.gripper_joint_limit[1] - self.gripper_joint_limit[0]) + self.gripper_joint_limit[0]
-    self._sendGripperCommand(target, target)
-    it = 0
-    while abs(target - p1) + abs(target - p2) > 0.001:
-      pb.stepSimulation()
-      it += 1
-      p1_, p2_ = self._getGripperJointPosition()
-      if it > max_it or (abs(p1 - p1_) < 0.0001 and abs(p2 - p2_) < 0.0001):
-        return
-      p1 = p1_
-      p2 = p2_
-
-  def getGripperOpenRatio(self):
-    p1, p2 = self._getGripperJointPosition()
-    mean = (p1 + p2)/2
-    ratio = (mean - self.gripper_joint_limit[0]) / (self.gripper_joint_limit[1] - self.gripper_joint_limit[0])
-    return ratio
-
-  def closeGripper(self, max_it=100, primative=constants.PICK_PRIMATIVE):
+  def closeGripper(self, max_it=None, primative=constants.PICK_PRIMATIVE):
     ''''''
     if primative == constants.PULL_PRIMATIVE:
       force = 20
     else:
       force = 2
-    p1, p2 = self._getGripperJointPosition()
     target = self.gripper_joint_limit[0]
     self._sendGripperCommand(target, target, force)
     self.gripper_closed = True
-    it = 0
-    while abs(target-p1) + abs(target-p2) > 0.001:
-      pb.stepSimulation()
-      it += 1
-      p1_, p2_ = self._getGripperJointPosition()
-      if it > max_it or (abs(p1 - p1_) < 0.0001 and abs(p2 - p2_) < 0.0001):
-        # mean = (p1 + p2) / 2 - 0.001
-        # self._sendGripperCommand(mean, mean)
-        return False
-      p1 = p1_
-      p2 = p2_
-    return True
+    return self._actuateGripper(target, max_it)
 
   def adjustGripperCommand(self):
     p1, p2 = self._getGripperJointPosition()
@@ -138,38 +109,18 @@ class Kuka(RobotBase):
 
   def openGripper(self):
     ''''''
-    p1, p2 = self._getGripperJointPosition()
     target = self.gripper_joint_limit[1]
     self._sendGripperCommand(target, target)
     self.gripper_closed = False
     self.holding_obj = None
-    it = 0
-    if self.holding_obj:
-      pos, rot = self.holding_obj.getPose()
-    while abs(target-p1) + abs(target-p2) > 0.001:
-      if self.holding_obj and it < 5:
-        self.holding_obj.resetPose(pos, rot)
-      pb.stepSimulation()
-      it += 1
-      if it > 100:
-        return False
-      p1_, p2_ = self._getGripperJointPosition()
-      if p1 >= p1_ and p2 >= p2_:
-        return False
-      p1 = p1_
-      p2 = p2_
-    return True
+    return self._actuateGripper(target)
 
   def gripperHasForce(self):
-    return pb.getJointState(self.id, 8)[3] >= 2 or pb.getJointState(self.id, 11)[3] <= -2
-
-  def _calculateIK(self, pos, rot):
-    return pb.calculateInverseKinematics(self.id, self.end_effector_index, pos, rot, jointDamping=self.jd)[:7]
+    return pb.getJointState(self.id, 8, physicsClientId=self.client_id)[3] >= 2 or pb.getJointState(self.id, 11, physicsClientId=self.client_id)[3] <= -2
 
-  def _getGripperJointPosition(self):
-    p1 = -pb.getJointState(self.id, 8)[0]
-    p2 = pb.getJointState(self.id, 11)[0]
-    return p1, p2
+  def _calculateIK(self, pos, rot, current_positions=None):
+    kwargs = {} if current_positions is None else {'currentPositions': current_positions}
+    return pb.calculateInverseKinematics(self.id, self.end_effector_index, pos, rot, jointDamping=self.jd, **kwargs, physicsClientId=self.client_id)[:7]
 
   def _sendPositionCommand(self, commands):
     ''''''
@@ -178,11 +129,11 @@ class Kuka(RobotBase):
                                  targetVelocities=[0.]*num_motors,
                                  forces=[self.max_force]*num_motors,
                                  positionGains=[self.position_gain]*num_motors,
-                                 velocityGains=[1.0]*num_motors)
+                                 velocityGains=[1.0]*num_motors, physicsClientId=self.client_id)
 
   def _sendGripperCommand(self, target_pos1, target_pos2, force=2):
     pb.setJointMotorControlArray(self.id,
                                  [8, 11, 10, 13],
                                  pb.POSITION_CONTROL,
                                  [-target_pos1, target_pos2, 0, 0],
-                                 forces=[force, force,  force, force])
+                                 forces=[force, force,  force, force], physicsClientId=self.client_id)
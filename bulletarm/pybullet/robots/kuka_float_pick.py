@@ -3,10 +3,11 @@ import numpy as np
 import pybullet as pb
 
 from bulletarm.pybullet.robots.kuka import Kuka
+from bulletarm.pybullet.utils import pybullet_util
 
 class KukaFloatPick(Kuka):
-  def __init__(self):
-    super().__init__()
+  def __init__(self, client_id=0):
+    super().__init__(client_id)
 
   def pick(self, pos, rot, offset, dynamic=True, objects=None, simulate_grasp=True):
     ''''''
@@ -31,7 +32,7 @@ class KukaFloatPick(Kuka):
         self.moveTo(pre_pos, pre_rot, True)
         self.adjustGripperCommand()
         for i in range(10):
-          pb.stepSimulation()
+          pybullet_util.stepSimulation(self.client_id)
         self.holding_obj = self.getPickedObj(objects)
       self.moveToJ(self.home_positions_joint, dynamic)
       self.checkGripperClosed()
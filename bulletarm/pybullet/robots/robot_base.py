@@ -7,7 +7,7 @@ import copy
 import math
 import numpy as np
 import numpy.random as npr
-from collections import deque
+from collections import deque, OrderedDict
 from abc import abstractmethod
 
 import pybullet as pb
@@ -24,8 +24,12 @@ from bulletarm.pybullet.utils import transformations
 class RobotBase:
   '''
   Base Robot Class.
+
+  Args:
+    client_id (int): The pybullet physics client the robot is loaded into. Defaults to 0.
   '''
-  def __init__(self):
+  def __init__(self, client_id=0):
+    self.client_id = client_id
     self.id = None
     self.num_joints = None
     self.arm_joint_names = list()
@@ -42,7 +46,42 @@ class RobotBase:
     }
 
     self.position_gain = 0.02
+    # the gripper joints along with the sign of their positions, and the gripper positions when fully open and closed
+    self.gripper_joint_indices = list()
+    self.gripper_joint_multipliers = [1, 1]
+    self.gripper_open_position = None
+    self.gripper_closed_position = None
+    # the default step budget of the gripper movements, the number of simulation steps between two joint state reads,
+    # and the motor force on all the gripper joints at which a movement stops. Disabled if None
+    self.gripper_max_it = 100
+    self.gripper_chunk = 1
+    self.gripper_force_th = None
+    # the number of simulation steps of the last gripper movement
+    self.last_gripper_steps = 0
+    # the links whose contacts count for getPickedObj (None for all the links of the robot), and the maximum z component
+    # of the normal of a contact to count as horizontal
+    self.finger_link_indices = None
+    self.picked_obj_normal_th = 0.3
     self.adjust_gripper_after_lift = False
+    # number of simulation steps between two joint state reads while moving the arm
+    self.motion_chunk = 1
+    # final IK solutions of the cartesian movements, keyed by the target pose quantized to ik_cache_resolution.
+    # Disabled if the size is 0. A cached solution within ik_cache_joint_tolerance (rad) of the current arm joints is
+    # used without solving the IK
+    self.ik_cache_size = 0
+    self.ik_cache_resolution = 1e-3
+    self.ik_cache_joint_tolerance = 0.5
+    self.ik_cache = OrderedDict()
+    self.ik_cache_hits = 0
+    self.ik_cache_misses = 0
+    # the number of IK rounds of the last cartesian movement
+    self.last_ik_iterations = 0
+    self.ik_dof_indices = None
+    # 'dynamic' simulates the pick and place primitives, 'kinematic' teleports the arm and resolves the grasp from the
+    # geometry of the objects. The held object is then attached to the end effector by grasp_constraint
+    self.primitive_mode = 'dynamic'
+    self.grasp_tolerance = 0.01
+    self.grasp_constraint = None
 
   def saveState(self):
     '''
@@ -60,14 +99,32 @@ class RobotBase:
     '''
     self.holding_obj = self.state['holding_obj']
     self.gripper_closed = self.state['gripper_closed']
+    self.detachObj()
+    if self.primitive_mode == 'kinematic':
+      if self.holding_obj:
+        self._attachObj(self.holding_obj)
+      return
     if self.gripper_closed:
       self.closeGripper(max_it=0)
     else:
       self.openGripper()
 
+  def restoreHome(self):
+    '''
+    Resend the home pose and open gripper motor commands after the joints have been restored to the
+    home pose, i.e. by restoring a saved world. Unlike reset, the joint states are not overwritten so
+    the robot does not need to settle again.
+    '''
+    self.gripper_closed = False
+    self.holding_obj = None
+    self.detachObj()
+    self.moveToJ(self.home_positions_joint[:len(self.arm_joint_indices)])
+    self.openGripper()
+
   def getPickedObj(self, objects):
     '''
-    Get the object which is currently being held by the gripper.
+    Get the object which is currently being held by the gripper, i.e. the first object with at least two horizontal
+    contacts with the fingers.
 
     Args:
       objects (numpy.array): Objects to check if are being held.
@@ -78,15 +135,87 @@ class RobotBase:
     if not objects:
       return None
 
+    # check the contact force normal to count the horizontal contact points
+    body_ids, link_ids, normals_z = self.getContacts()
+    horizontal = np.abs(normals_z) < self.picked_obj_normal_th
+    if self.finger_link_indices is not None:
+      horizontal &= np.isin(link_ids, self.finger_link_indices)
+    contact_ids, contact_counts = np.unique(body_ids[horizontal], return_counts=True)
+    picked_ids = set(contact_ids[contact_counts >= 2].tolist())
     for obj in objects:
-      # check the contact force normal to count the horizontal contact points
-      contact_points = pb.getContactPoints(self.id, obj.object_id)
-      horizontal = list(filter(lambda p: abs(p[7][2]) < 0.3, contact_points))
-      if len(horizontal) >= 2:
+      if obj.object_id in picked_ids:
         return obj
 
     return None
 
+  def getContacts(self):
+    '''
+    Get the contact points of the robot with the other bodies. The contacts are queried once per simulation step, see
+    pybullet_util.getContactPoints.
+
+    Returns:
+      (numpy.array, numpy.array, numpy.array): The ids of the other bodies, the robot links and the z components of the
+        contact normals
+    '''
+    contact_points = pybullet_util.getContactPoints(self.id, self.client_id)
+    body_ids = np.array([p[2] for p in contact_points], dtype=int)
+    link_ids = np.array([p[3] for p in contact_points], dtype=int)
+    normals_z = np.array([p[7][2] for p in contact_points], dtype=float)
+    return body_ids, link_ids, normals_z
+
+  def getObjUnderGripper(self, pos, objects):
+    '''
+    Get the object under the fingers of a gripper at the given position, i.e. the top most object whose bounding box
+    contains the position, with grasp_tolerance of slack.
+
+    Args:
+      pos (numpy.array): The end effector position.
+      objects (numpy.array): Objects to check.
+
+    Returns:
+      (pybullet.objects.PybulletObject): The object under the gripper, None if there is none.
+    '''
+    if not objects:
+      return None
+
+    picked_obj = None
+    picked_obj_top = -np.inf
+    pos = np.asarray(pos)
+    for obj in objects:
+      aabb_min, aabb_max = pb.getAABB(obj.object_id, physicsClientId=self.client_id)
+      aabb_min = np.array(aabb_min) - self.grasp_tolerance
+      aabb_max = np.array(aabb_max) + self.grasp_tolerance
+      if np.all(aabb_min <= pos) and np.all(pos <= aabb_max) and aabb_max[2] > picked_obj_top:
+        picked_obj = obj
+        picked_obj_top = aabb_max[2]
+    return picked_obj
+
+  def _attachObj(self, obj):
+    '''
+    Attach an object to the end effector with a fixed constraint, keeping their current relative pose.
+
+    Args:
+      obj (pybullet.objects.PybulletObject): The object to attach.
+    '''
+    # the frames of the constraint are the center of mass frames of the end effector link and of the object
+    ls = pb.getLinkState(self.id, self.end_effector_index, physicsClientId=self.client_id)
+    obj_pos, obj_rot = obj.getPose()
+    end_inv_pos, end_inv_rot = pb.invertTransform(ls[0], ls[1])
+    endTobj_pos, endTobj_rot = pb.multiplyTransforms(end_inv_pos, end_inv_rot, obj_pos, obj_rot)
+    self.grasp_constraint = pb.createConstraint(self.id, self.end_effector_index, obj.object_id, -1,
+                                                jointType=pb.JOINT_FIXED, jointAxis=[0, 0, 0],
+                                                parentFramePosition=endTobj_pos, childFramePosition=[0, 0, 0],
+                                                parentFrameOrientation=endTobj_rot,
+                                                physicsClientId=self.client_id)
+
+  def detachObj(self):
+    '''
+    Remove the constraint attaching the held object to the end effector in the kinematic primitive mode, if any.
+    '''
+    if self.grasp_constraint is not None:
+      pb.removeConstraint(self.grasp_constraint, physicsClientId=self.client_id)
+      self.grasp_constraint = None
+
   def pick(self, pos, rot, offset, dynamic=True, objects=None, simulate_grasp=True, top_down_approach=False):
     '''
     Execute a pick action at the given pose.
@@ -102,6 +231,10 @@ class RobotBase:
       top_down_approach (bool): Force a top-down grasp action. Defaults to False. If set to True,
         approach vector will be set to top-down.
     '''
+    if self.primitive_mode == 'kinematic':
+      self._pickKinematic(pos, rot, objects)
+      return
+
     self.openGripper()
 
     # Setup pre-grasp pose
@@ -135,7 +268,7 @@ class RobotBase:
         self.moveTo(pre_pos, pre_rot, True)
 
       for i in range(100):
-        pb.stepSimulation()
+        pybullet_util.stepSimulation(self.client_id)
     else:
       self.moveTo(pos, rot, dynamic)
 
@@ -157,6 +290,10 @@ class RobotBase:
       top_down_approach (bool): Force a top-down grasp action. Defaults to False. If set to True,
         approach vector will be set to top-down.
     '''
+    if self.primitive_mode == 'kinematic':
+      self._placeKinematic(pos, rot)
+      return
+
     # Setup pre-place pose
     pre_pos = copy.copy(pos)
     pre_rot = copy.copy(rot)
@@ -179,6 +316,39 @@ class RobotBase:
     self.moveTo(pre_pos, pre_rot, dynamic)
     self.moveToJ(self.home_positions_joint, dynamic)
 
+  def _pickKinematic(self, pos, rot, objects):
+    '''
+    Pick in the kinematic primitive mode: the arm is teleported to the grasp pose and back home without stepping the
+    simulation, and the object under the fingers at the reached pose is attached to the end effector. The fingers stay
+    open.
+
+    Args:
+      pos (numpy.array): Desired end effector position.
+      rot (numpy.array): Desired end effector orientation.
+      objects (numpy.array): List of objects which can be picked up.
+    '''
+    self._moveToCartesianPose(pos, rot, False)
+    self.holding_obj = self.getObjUnderGripper(self._getEndEffectorPosition(), objects)
+    if self.holding_obj:
+      self.gripper_closed = True
+      self._attachObj(self.holding_obj)
+    self.moveToJ(self.home_positions_joint, False)
+
+  def _placeKinematic(self, pos, rot):
+    '''
+    Place in the kinematic primitive mode: the arm is teleported to the place pose along with the held object, which is
+    released there, and back home without stepping the simulation.
+
+    Args:
+      pos (numpy.array): Desired end effector position.
+      rot (numpy.array): Desired end effector orientation.
+    '''
+    self.moveTo(pos, rot, False)
+    self.detachObj()
+    self.holding_obj = None
+    self.gripper_closed = False
+    self.moveToJ(self.home_positions_joint, False)
+
   def push(self, pos, rot, offset, dynamic=True):
     '''
     Execute a push action at the given pose.
@@ -271,6 +441,84 @@ class RobotBase:
     self.openGripper()
     self.moveToJ(self.home_positions_joint, dynamic)
 
+  def controlGripper(self, open_ratio, max_it=None):
+    '''
+    Move the gripper to the given open ratio.
+
+    Args:
+      open_ratio (float): The open ratio of the gripper, 0 is closed and 1 is open.
+      max_it (int): Maximum number of simulation steps of the movement. Defaults to gripper_max_it.
+    '''
+    target = open_ratio * (self.gripper_open_position - self.gripper_closed_position) + self.gripper_closed_position
+    self._sendGripperCommand(target, target)
+    self._actuateGripper(target, max_it)
+
+  def getGripperOpenRatio(self):
+    '''
+    Get the open ratio of the gripper, 0 is closed and 1 is open.
+
+    Returns:
+      float: The open ratio
+    '''
+    p1, p2 = self._getGripperJointPosition()
+    mean = (p1 + p2)/2
+    ratio = (mean - self.gripper_closed_position) / (self.gripper_open_position - self.gripper_closed_position)
+    return ratio
+
+  def _actuateGripper(self, target, max_it=None, tol=1e-3, stall_th=1e-4):
+    '''
+    Step the simulation after a gripper command until the gripper joints reach the target. The simulation is stepped in
+    chunks of gripper_chunk steps between two reads of the joint states. The movement stops early when the joints stall,
+    i.e. moved less than stall_th per step, or when the fingers press against something, i.e. all the gripper motors
+    apply at least gripper_force_th while the joints moved less than 10 * stall_th per step. The number of simulation
+    steps is recorded in last_gripper_steps.
+
+    Args:
+      target (float): The target position of the gripper joints.
+      max_it (int): Maximum number of simulation steps, the movement stops after max_it + 1 steps. Defaults to
+        gripper_max_it.
+      tol (float): The movement ends once the summed distance of the joints to the target is within tol. Defaults to 1e-3.
+      stall_th (float): The per step threshold for stalling. Defaults to 1e-4.
+
+    Returns:
+      bool: True if the joints reached the target, False if the movement stopped early
+    '''
+    if max_it is None:
+      max_it = self.gripper_max_it
+    multipliers = np.array(self.gripper_joint_multipliers)
+    joint_state = pb.getJointStates(self.id, self.gripper_joint_indices, physicsClientId=self.client_id)
+    joint_pos = multipliers * [state[0] for state in joint_state]
+    n_it = 0
+    self.last_gripper_steps = 0
+    while np.sum(np.abs(target - joint_pos)) > tol:
+      self._beforeGripperStep(joint_pos)
+      chunk = min(self.gripper_chunk, max_it + 1 - n_it)
+      for _ in range(chunk):
+        pybullet_util.stepSimulation(self.client_id)
+      n_it += chunk
+      self.last_gripper_steps = n_it
+      joint_state = pb.getJointStates(self.id, self.gripper_joint_indices, physicsClientId=self.client_id)
+      new_joint_pos = multipliers * [state[0] for state in joint_state]
+      moved = np.abs(joint_pos - new_joint_pos)
+      if n_it > max_it or np.all(moved < stall_th * chunk):
+        return False
+      # the motors also saturate while accelerating the fingers, so the force only counts once the fingers are slow
+      if self.gripper_force_th is not None and np.all(moved < 10 * stall_th * chunk) and \
+         all(abs(state[3]) >= self.gripper_force_th for state in joint_state):
+        return False
+      joint_pos = new_joint_pos
+    return True
+
+  def _beforeGripperStep(self, joint_pos):
+    '''
+    Called before each chunk of simulation steps of a gripper movement, for grippers with joints that follow the
+    gripper joints.
+
+    Args:
+      joint_pos (numpy.array): The current positions of the gripper joints.
+    '''
+    pass
+
   def moveTo(self, pos, rot, dynamic=True, pos_th=1e-3, rot_th=1e-3):
     '''
     Move the end-effector to the given pose.
@@ -281,11 +529,15 @@ class RobotBase:
       dynamic (bool): Simualte arm dynamics when moving the arm. Defaults to True.
       pos_th (float): Positional threshold for ending the movement. Defaults to 1e-3.
       rot_th (float): Rotational threshold for ending the movement. Defaults to 1e-3.
+
+    Returns:
+      int: The number of simulation steps of the movement
     '''
     if dynamic or not self.holding_obj:
-      self._moveToCartesianPose(pos, rot, dynamic, pos_th, rot_th)
+      return self._moveToCartesianPose(pos, rot, dynamic, pos_th, rot_th)
     else:
       self._teleportArmWithObj(pos, rot)
+      return 0
 
   def moveToJ(self, joint_pose, dynamic=True):
     '''
@@ -294,39 +546,54 @@ class RobotBase:
     Args:
       joint_pose (numpy.array): Joint positions for each joint in the manipulator.
       dynamic (bool): Simualte arm dynamics when moving the arm. Defaults to True.
+
+    Returns:
+      int: The number of simulation steps of the movement
     '''
     if dynamic or not self.holding_obj:
-      self._moveToJointPose(joint_pose, dynamic)
+      return self._moveToJointPose(joint_pose, dynamic)
     else:
       self._teleportArmWithObjJointPose(joint_pose)
+      return 0
 
   def _moveToJointPose(self, target_pose, dynamic=True, max_it=1000):
     '''
-    Move the desired joint positions
+    Move the desired joint positions. The simulation is stepped in chunks of motion_chunk steps between two reads of
+    the joint states. The movement ends once the joints are within 1e-3 of the target, or when the arm stalls, i.e.
+    the joints moved less than 1e-3 over the last 4 steps.
 
     Args:
       joint_pose (numpy.array): Joint positions for each joint in the manipulator.
       dynamic (bool): Simualte arm dynamics when moving the arm. Defaults to True.
-      max_it (int): Maximum number of iterations the movement can take. Defaults to 10000.
-    '''
-    if dynamic:
-      self._sendPositionCommand(target_pose)
-      past_joint_pos = deque(maxlen=5)
-      joint_state = pb.getJointStates(self.id, self.arm_joint_indices)
-      joint_pos = list(zip(*joint_state))[0]
-      n_it = 0
-      while not np.allclose(joint_pos, target_pose, atol=1e-3) and n_it < max_it:
-        pb.stepSimulation()
-        n_it += 1
-        # Check to see if the arm can't move any close to the desired joint position
-        if len(past_joint_pos) == 5 and np.allclose(past_joint_pos[-1], past_joint_pos, atol=1e-3):
-          break
-        past_joint_pos.append(joint_pos)
-        joint_state = pb.getJointStates(self.id, self.arm_joint_indices)
-        joint_pos = list(zip(*joint_state))[0]
+      max_it (int): Maximum number of iterations the movement can take. Defaults to 1000.
 
-    else:
+    Returns:
+      int: The number of simulation steps of the movement
+    '''
+    if not dynamic:
       self._setJointPoses(target_pose)
+      return 0
+
+    self._sendPositionCommand(target_pose)
+    target_pose = np.asarray(target_pose)
+    # the arm stalls if it moved less than 1e-3 over 4 steps, checked over the reads spanning at least 4 steps
+    past_joint_pos = deque(maxlen=int(np.ceil(4 / self.motion_chunk)) + 1)
+    stall_th = 1e-3 * max(1, (past_joint_pos.maxlen - 1) * self.motion_chunk / 4)
+    joint_state = pb.getJointStates(self.id, self.arm_joint_indices, physicsClientId=self.client_id)
+    joint_pos = np.array([state[0] for state in joint_state])
+    n_it = 0
+    while np.any(np.abs(joint_pos - target_pose) > 1e-3 + 1e-5 * np.abs(target_pose)) and n_it < max_it:
+      for _ in range(min(self.motion_chunk, max_it - n_it)):
+        pybullet_util.stepSimulation(self.client_id)
+        n_it += 1
+      # Check to see if the arm can't move any close to the desired joint position
+      if len(past_joint_pos) == past_joint_pos.maxlen and \
+         np.all(np.abs(np.array(past_joint_pos) - past_joint_pos[-1]) <= stall_th + 1e-5 * np.abs(past_joint_pos[-1])):
+        break
+      past_joint_pos.append(joint_pos)
+      joint_state = pb.getJointStates(self.id, self.arm_joint_indices, physicsClientId=self.client_id)
+      joint_pos = np.array([state[0] for state in joint_state])
+    return n_it
 
   def _moveToCartesianPose(self, pos, rot, dynamic=True, pos_th=1e-3, rot_th=1e-3):
     '''
@@ -338,23 +605,79 @@ class RobotBase:
       dynamic (bool): Simualte arm dynamics when moving the arm. Defaults to True.
       pos_th (float): Positional threshold for ending the movement. Defaults to 1e-3.
       rot_th (float): Rotational threshold for ending the movement. Defaults to 1e-3.
+
+    Returns:
+      int: The number of simulation steps of the movement
     '''
 
     close_enough = False
     outer_it = 0
     max_outer_it = 10
     max_inner_it = 100
+    n_it = 0
 
     while not close_enough and outer_it < max_outer_it:
-      ik_solve = self._calculateIK(pos, rot)
-      self._moveToJointPose(ik_solve, dynamic, max_inner_it)
+      ik_solve = self.calculateIK(pos, rot) if outer_it == 0 else self._calculateIK(pos, rot)
+      n_it += self._moveToJointPose(ik_solve, dynamic, max_inner_it)
 
-      ls = pb.getLinkState(self.id, self.end_effector_index)
+      ls = pb.getLinkState(self.id, self.end_effector_index, physicsClientId=self.client_id)
       new_pos = list(ls[4])
       new_rot = list(ls[5])
+      # q and -q are the same orientation
       close_enough = np.allclose(np.array(new_pos), pos, atol=pos_th) and \
-                     np.allclose(np.array(new_rot), rot, atol=rot_th)
+                     (np.allclose(np.array(new_rot), rot, atol=rot_th) or
+                      np.allclose(-np.array(new_rot), rot, atol=rot_th))
       outer_it += 1
+    if close_enough:
+      self._cacheIK(pos, rot, ik_solve)
+    self.last_ik_iterations = outer_it
+    return n_it
+
+  def calculateIK(self, pos, rot):
+    '''
+    Calculate the IK solution of an end effector pose. If the ik cache is enabled and a movement to a pose within
+    ik_cache_resolution happened before, the final joint positions of that movement are returned directly when all the
+    arm joints are within ik_cache_joint_tolerance of them. Otherwise the IK is warm started from them instead of the
+    current joint positions.
+
+    Args:
+      pos (numpy.array): Desired end-effector position.
+      rot (numpy.array): Desired end-effector orientation.
+
+    Returns:
+      list[float]: The arm joint positions
+    '''
+    if self.ik_cache_size == 0:
+      return self._calculateIK(pos, rot)
+    key = self._getIKCacheKey(pos, rot)
+    if key not in self.ik_cache:
+      self.ik_cache_misses += 1
+      return self._calculateIK(pos, rot)
+    self.ik_cache_hits += 1
+    self.ik_cache.move_to_end(key)
+    if self.ik_dof_indices is None:
+      self.ik_dof_indices = [i for i in range(pb.getNumJoints(self.id, physicsClientId=self.client_id))
+                             if pb.getJointInfo(self.id, i, physicsClientId=self.client_id)[2] != pb.JOINT_FIXED]
+    # the IK solves for all the movable joints, the arm joints come first
+    joint_state = pb.getJointStates(self.id, self.ik_dof_indices, physicsClientId=self.client_id)
+    current_positions = [state[0] for state in joint_state]
+    arm_positions = self.ik_cache[key]
+    if np.abs(np.array(arm_positions) - current_positions[:len(arm_positions)]).max() <= self.ik_cache_joint_tolerance:
+      return list(arm_positions)
+    current_positions[:len(arm_positions)] = arm_positions
+    return self._calculateIK(pos, rot, current_positions=current_positions)
+
+  def _getIKCacheKey(self, pos, rot):
+    return tuple(np.round(np.concatenate((pos, rot)) / self.ik_cache_resolution).astype(int))
+
+  def _cacheIK(self, pos, rot, joint_pose):
+    if self.ik_cache_size == 0:
+      return
+    key = self._getIKCacheKey(pos, rot)
+    self.ik_cache[key] = list(joint_pose)
+    self.ik_cache.move_to_end(key)
+    if len(self.ik_cache) > self.ik_cache_size:
+      self.ik_cache.popitem(last=False)
 
   def _teleportArmWithObj(self, pos, rot):
     '''
@@ -435,7 +758,7 @@ class RobotBase:
     Returns:
       (numpy.array): The end effector position.
     '''
-    state = pb.getLinkState(self.id, self.end_effector_index)
+    state = pb.getLinkState(self.id, self.end_effector_index, physicsClientId=self.client_id)
     return np.array(state[4])
 
   def _getEndEffectorRotation(self):
@@ -445,7 +768,7 @@ class RobotBase:
     Returns:
       (numpy.array): The end effector orientation.
     '''
-    state = pb.getLinkState(self.id, self.end_effector_index)
+    state = pb.getLinkState(self.id, self.end_effector_index, physicsClientId=self.client_id)
     return np.array(state[5])
 
   def _setJointPoses(self, q_poses):
@@ -457,10 +780,21 @@ class RobotBase:
     '''
     for i in range(len(q_poses)):
       motor = self.arm_joint_indices[i]
-      pb.resetJointState(self.id, motor, q_poses[i])
+      pb.resetJointState(self.id, motor, q_poses[i], physicsClientId=self.client_id)
 
     self._sendPositionCommand(q_poses)
 
+  def _getGripperJointPosition(self):
+    '''
+    Get the positions of the gripper joints.
+
+    Returns:
+      (float, float): The positions of the two gripper joints
+    '''
+    joint_state = pb.getJointStates(self.id, self.gripper_joint_indices, physicsClientId=self.client_id)
+    p1, p2 = [m * state[0] for m, state in zip(self.gripper_joint_multipliers, joint_state)]
+    return p1, p2
+
   def plotEndEffectorFrame(self):
     '''
     Plot the end effector's frame in the PyBullet GUI.
@@ -470,20 +804,20 @@ class RobotBase:
     '''
     line_id1 = pb.addUserDebugLine(self._getEndEffectorPosition(),
                                   self._getEndEffectorPosition() + 0.1 * transformations.quaternion_matrix(
-                                    self._getEndEffectorRotation())[:3, 0], (1, 0, 0))
+                                    self._getEndEffectorRotation())[:3, 0], (1, 0, 0), physicsClientId=self.client_id)
     line_id2 = pb.addUserDebugLine(self._getEndEffectorPosition(),
                                   self._getEndEffectorPosition() + 0.1 * transformations.quaternion_matrix(
-                                    self._getEndEffectorRotation())[:3, 1], (0, 1, 0))
+                                    self._getEndEffectorRotation())[:3, 1], (0, 1, 0), physicsClientId=self.client_id)
     line_id3 = pb.addUserDebugLine(self._getEndEffectorPosition(),
                                   self._getEndEffectorPosition() + 0.1 * transformations.quaternion_matrix(
-                                    self._getEndEffectorRotation())[:3, 2], (0, 0, 1))
+                                    self._getEndEffectorRotation())[:3, 2], (0, 0, 1), physicsClientId=self.client_id)
     return line_id1, line_id2, line_id3
 
   #===========================================================================#
   #           Abstract functions sub-class robots must implement              #
   #===========================================================================#
   @abstractmethod
-  def _calculateIK(self, pos, rot):
+  def _calculateIK(self, pos, rot, current_positions=None):
     raise NotImplementedError
 
   @abstractmethod
@@ -491,21 +825,13 @@ class RobotBase:
     raise NotImplementedError
 
   @abstractmethod
-  def closeGripper(self, max_it=100, primative=constants.PICK_PRIMATIVE):
+  def closeGripper(self, max_it=None, primative=constants.PICK_PRIMATIVE):
     raise NotImplementedError
 
   @abstractmethod
   def checkGripperClosed(self):
     raise NotImplementedError
 
-  @abstractmethod
-  def controlGripper(self, open_ratio, max_it=100):
-    raise NotImplementedError
-
-  @abstractmethod
-  def _getGripperJointPosition(self):
-    raise NotImplementedError
-
   @abstractmethod
   def _sendPositionCommand(self, commands):
     raise NotImplementedError
@@ -23,8 +23,8 @@ class UR5_Robotiq(RobotBase):
   '''
 
   '''
-  def __init__(self):
-    super(UR5_Robotiq, self).__init__()
+  def __init__(self, client_id=0):
+    super(UR5_Robotiq, self).__init__(client_id)
     # Setup arm and gripper variables
     self.max_forces = [150, 150, 150, 28, 28, 28, 30, 30]
     self.gripper_close_force = [30] * 2
@@ -37,6 +37,8 @@ class UR5_Robotiq(RobotBase):
     self.gripper_joint_limit = [0, 0.036]
     self.gripper_joint_names = list()
     self.gripper_joint_indices = list()
+    self.gripper_open_position = self.gripper_joint_limit[0]
+    self.gripper_closed_position = self.gripper_joint_limit[1]
 
     ###############################################
     ## fake robotiq 85
@@ -66,19 +68,19 @@ class UR5_Robotiq(RobotBase):
   def initialize(self):
     ''''''
     ur5_urdf_filepath = os.path.join(constants.URDF_PATH, 'ur5/ur5_robotiq_85_gripper_fake.urdf')
-    self.id = pb.loadURDF(ur5_urdf_filepath, [0,0,0.1], [0,0,0,1])
+    self.id = pb.loadURDF(ur5_urdf_filepath, [0,0,0.1], [0,0,0,1], physicsClientId=self.client_id)
     # self.is_holding = False
     self.gripper_closed = False
     self.holding_obj = None
-    self.num_joints = pb.getNumJoints(self.id)
-    [pb.resetJointState(self.id, idx, self.home_positions[idx]) for idx in range(self.num_joints)]
+    self.num_joints = pb.getNumJoints(self.id, physicsClientId=self.client_id)
+    [pb.resetJointState(self.id, idx, self.home_positions[idx], physicsClientId=self.client_id) for idx in range(self.num_joints)]
 
     self.arm_joint_names = list()
     self.arm_joint_indices = list()
     self.gripper_joint_names = list()
     self.gripper_joint_indices = list()
     for i in range (self.num_joints):
-      joint_info = pb.getJointInfo(self.id, i)
+      joint_info = pb.getJointInfo(self.id, i, physicsClientId=self.client_id)
       if i in range(1, 7):
         self.arm_joint_names.append(str(joint_info[1]))
         self.arm_joint_indices.append(i)
@@ -87,7 +89,7 @@ class UR5_Robotiq(RobotBase):
         self.gripper_joint_indices.append(i)
 
       elif i in range(14, self.num_joints):
-        info = pb.getJointInfo(self.id, i)
+        info = pb.getJointInfo(self.id, i, physicsClientId=self.client_id)
         jointID = info[0]
         jointName = info[1].decode("utf-8")
         jointType = jointTypeList[info[2]]
@@ -102,49 +104,19 @@ class UR5_Robotiq(RobotBase):
   def reset(self):
     self.gripper_closed = False
     self.holding_obj = None
-    [pb.resetJointState(self.id, idx, self.home_positions[idx]) for idx in range(self.num_joints)]
+    [pb.resetJointState(self.id, idx, self.home_positions[idx], physicsClientId=self.client_id) for idx in range(self.num_joints)]
 
-  def getGripperOpenRatio(self):
-    p1, p2 = self._getGripperJointPosition()
-    mean = (p1 + p2)/2
-    ratio = (mean - self.gripper_joint_limit[1]) / (self.gripper_joint_limit[0] - self.gripper_joint_limit[1])
-    return ratio
-
-  def controlGripper(self, open_ratio, max_it=100):
-    p1, p2 = self._getGripperJointPosition()
-    target = open_ratio * (self.gripper_joint_limit[0] - self.gripper_joint_limit[1]) + self.gripper_joint_limit[1]
-    self._sendGripperCommand(target, target)
-    it = 0
-    while abs(target - p1) + abs(target - p2) > 0.001:
-      self._setRobotiqPosition((p1 + p2) / 2)
-      pb.stepSimulation()
-      it += 1
-      p1_, p2_ = self._getGripperJointPosition()
-      if it > max_it or (abs(p1 - p1_) < 0.0001 and abs(p2 - p2_) < 0.0001):
-        return
-      p1 = p1_
-      p2 = p2_
-
-  def closeGripper(self, max_it=100, primative=constants.PICK_PRIMATIVE):
+  def closeGripper(self, max_it=None, primative=constants.PICK_PRIMATIVE):
     ''''''
-    p1, p2 = self._getGripperJointPosition()
     limit = self.gripper_joint_limit[1]
     self._sendGripperCommand(limit, limit)
-    # self._sendGripperCloseCommand()
     self.gripper_closed = True
-    it = 0
-    while (limit-p1) + (limit-p2) > 0.001:
-      self._setRobotiqPosition((p1 + p2) / 2)
-      pb.stepSimulation()
-      it += 1
-      p1_, p2_ = self._getGripperJointPosition()
-      if it > max_it or (abs(p1-p1_)<0.0001 and abs(p2-p2_)<0.0001):
-        mean = (p1+p2)/2 + 0.005
-        self._sendGripperCommand(mean, mean)
-        return False
-      p1 = p1_
-      p2 = p2_
-    return True
+    if self._actuateGripper(limit, max_it):
+      return True
+    p1, p2 = self._getGripperJointPosition()
+    mean = (p1+p2)/2 + 0.005
+    self._sendGripperCommand(mean, mean)
+    return False
 
   def adjustGripperCommand(self):
     p1, p2 = self._getGripperJointPosition()
@@ -161,49 +133,36 @@ class UR5_Robotiq(RobotBase):
 
   def openGripper(self):
     ''''''
-    p1, p2 = self._getGripperJointPosition()
     limit = self.gripper_joint_limit[0]
     self._sendGripperCommand(limit, limit)
     self.gripper_closed = False
-    it = 0
-    while p1 > 0.0:
-      self._setRobotiqPosition((p1 + p2) / 2)
-      pb.stepSimulation()
-      it += 1
-      if it > 100:
-        return False
-      p1, p2 = self._getGripperJointPosition()
-    return True
-
-  def _calculateIK(self, pos, rot):
-    return pb.calculateInverseKinematics(self.id, self.end_effector_index, pos, rot)[:-8]
-
-  def _getGripperJointPosition(self):
-    p1 = pb.getJointState(self.id, self.gripper_joint_indices[0])[0]
-    p2 = pb.getJointState(self.id, self.gripper_joint_indices[1])[0]
-    return p1, p2
+    return self._actuateGripper(limit)
+
+  def _calculateIK(self, pos, rot, current_positions=None):
+    kwargs = {} if current_positions is None else {'currentPositions': current_positions}
+    return pb.calculateInverseKinematics(self.id, self.end_effector_index, pos, rot, **kwargs, physicsClientId=self.client_id)[:-8]
 
   def _sendPositionCommand(self, commands):
     ''''''
     num_motors = len(self.arm_joint_indices)
     pb.setJointMotorControlArray(self.id, self.arm_joint_indices, pb.POSITION_CONTROL, commands,
-                                 [0.]*num_motors, self.max_forces[:-2], [0.02]*num_motors, [1.0]*num_motors)
+                                 [0.]*num_motors, self.max_forces[:-2], [0.02]*num_motors, [1.0]*num_motors, physicsClientId=self.client_id)
 
   def _sendGripperCommand(self, target_pos1, target_pos2):
     pb.setJointMotorControlArray(self.id, self.gripper_joint_indices, pb.POSITION_CONTROL,
                                  targetPositions=[target_pos1, target_pos2], forces=self.gripper_open_force,
-                                 positionGains=[self.position_gain]*2, velocityGains=[1.0]*2)
+                                 positionGains=[self.position_gain]*2, velocityGains=[1.0]*2, physicsClientId=self.client_id)
     # pb.setJointMotorControlArray(self.id, self.gripper_joint_indices, pb.POSITION_CONTROL,
     #                              targetPositions=[target_pos1, target_pos2], forces=self.gripper_open_force)
 
+  def _beforeGripperStep(self, joint_pos):
+    self._setRobotiqPosition(np.mean(joint_pos))
+
   def _setRobotiqPosition(self, pos):
     percentage = pos/self.gripper_joint_limit[1]
     target = percentage * (self.robotiq_joint_limit[0]-self.robotiq_joint_limit[1]) + self.robotiq_joint_limit[1]
-    for i, jn in enumerate(self.robotiq_controlJoints):
-      motor = self.robotiq_joints[jn].id
-      pb.resetJointState(self.id, motor, target*self.robotiq_mimic_multiplier[i])
-      pb.setJointMotorControl2(self.id,
-                               motor,
-                               pb.POSITION_CONTROL,
-                               targetPosition=target*self.robotiq_mimic_multiplier[i],
-                               force=100)
+    motors = [self.robotiq_joints[jn].id for jn in self.robotiq_controlJoints]
+    targets = [target*m for m in self.robotiq_mimic_multiplier]
+    pb.resetJointStatesMultiDof(self.id, motors, [[t] for t in targets], physicsClientId=self.client_id)
+    pb.setJointMotorControlArray(self.id, motors, pb.POSITION_CONTROL, targetPositions=targets,
+                                 forces=[100]*len(motors), physicsClientId=self.client_id)
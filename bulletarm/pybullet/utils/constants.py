@@ -42,3 +42,8 @@ PUSH_PRIMATIVE = 3
 
 z_scale_1 = 1
 z_scale_2 = 2
+
+# Height in meters of one unit of the integer observation dtypes (see the 'obs_dtype' config): a height h is stored as
+# round(clip(h, 0, max_height) / scale), so negative values are lost and larger heights saturate. uint8 uses the 0.4/255
+# scale of the equi_rl replay buffer (heights up to 0.4m), uint16 stores heights up to 0.65m at 0.01mm.
+OBS_DTYPE_SCALE = {'uint8': 0.4 / 255, 'uint16': 1e-5}
@@ -0,0 +1,147 @@
+import pybullet as pb
+import numpy as np
+import scipy.spatial
+
+from bulletarm.pybullet.objects.cube import Cube
+from bulletarm.pybullet.objects.brick import Brick
+from bulletarm.pybullet.objects.triangle import Triangle
+from bulletarm.pybullet.objects.roof import Roof
+from bulletarm.pybullet.objects.cylinder import Cylinder
+
+# The objects with a convex visual shape that can be rasterized from their pose
+PRIMITIVE_CLASSES = (Cube, Brick, Triangle, Roof, Cylinder)
+
+# Half-space representation of the visual shapes in the link frame, keyed by the visual shape data
+_shape_planes = dict()
+
+def _loadObjVertices(file_path):
+  vertices = list()
+  with open(file_path) as f:
+    for line in f:
+      if line.startswith('v '):
+        vertices.append([float(v) for v in line.split()[1:4]])
+  return np.array(vertices)
+
+def getShapePlanes(visual_shape_data):
+  '''
+  Get the convex hull of a visual shape as half-spaces in the link frame.
+
+  Args:
+    visual_shape_data (tuple): One entry of pb.getVisualShapeData
+
+  Returns:
+    (numpy.array, numpy.array): The (k, 3) outward normals and the (k,) offsets of the hull, a point x is inside the
+      shape if normals.dot(x) + offsets <= 0
+  '''
+  geometry_type, dimensions, file_name, local_pos, local_rot = visual_shape_data[2:7]
+  key = (geometry_type, dimensions, file_name, local_pos, local_rot)
+  if key not in _shape_planes:
+    if geometry_type == pb.GEOM_BOX:
+      vertices = np.array(np.meshgrid([-0.5, 0.5], [-0.5, 0.5], [-0.5, 0.5])).reshape(3, -1).T * dimensions
+    else:
+      vertices = _loadObjVertices(file_name.decode()) * dimensions
+    rot = np.array(pb.getMatrixFromQuaternion(local_rot)).reshape(3, 3)
+    vertices = vertices.dot(rot.T) + local_pos
+    equations = scipy.spatial.ConvexHull(vertices).equations
+    # coplanar facets share their plane
+    equations = np.unique(np.round(equations, 9), axis=0)
+    _shape_planes[key] = (equations[:, :3], equations[:, 3])
+  return _shape_planes[key]
+
+class HeightmapRasterizer(object):
+  '''
+  Computes the top-down heightmap of BaseEnv's camera directly from the poses of primitive blocks instead of
+  rendering it. Each block is convex, so the height seen by a pixel is the intersection of the camera ray with the
+  half-spaces of the block, which is computed for all pixels and faces at once. The rays follow the perspective of
+  the camera so the result matches the rendered heightmap up to the depth buffer precision.
+
+  Args:
+    workspace (numpy.array): The workspace limits
+    size (int): The size of the heightmap in pixels
+    cam_height (float): The height of the camera above the ground. The camera looks down at the center of the
+      workspace and its image covers the workspace at the ground.
+    client_id (int): The pybullet physics client. Defaults to 0.
+  '''
+  def __init__(self, workspace, size, cam_height, client_id=0):
+    self.workspace = workspace
+    self.size = size
+    self.cam_height = cam_height
+    self.client_id = client_id
+    self.center = np.array([workspace[0].mean(), workspace[1].mean()])
+    self.ws_size = max(workspace[0][1] - workspace[0][0], workspace[1][1] - workspace[1][0])
+    self.resolution = self.ws_size / size
+    # ground position sampled by each pixel, the row is along x and the column along y. The renderer samples the
+    # corner of the pixels, not their center.
+    self.pixel_x = self.center[0] - self.ws_size / 2 + (np.arange(size) + 1) * self.resolution
+    self.pixel_y = self.center[1] - self.ws_size / 2 + np.arange(size) * self.resolution
+
+  def canRasterize(self, objects, ignore_ids=()):
+    '''
+    Check if the heightmap only contains primitive objects. Any other body reaching into the view of the camera, e.g.
+    the robot or equipment, requires rendering.
+
+    Args:
+      objects (list[PybulletObject]): The objects of the env
+      ignore_ids (list[int]): Bodies which never show up in the heightmap, e.g. the ground plane
+
+    Returns:
+      bool: True if the heightmap can be rasterized
+    '''
+    if not all(isinstance(obj, PRIMITIVE_CLASSES) for obj in objects):
+      return False
+    known_ids = set(ignore_ids).union(obj.object_id for obj in objects)
+    view_min = np.append(self.center - self.ws_size / 2, -np.inf)
+    view_max = np.append(self.center + self.ws_size / 2, 1)
+    for i in range(pb.getNumBodies(physicsClientId=self.client_id)):
+      body_id = pb.getBodyUniqueId(i, physicsClientId=self.client_id)
+      if body_id in known_ids:
+        continue
+      for link in range(-1, pb.getNumJoints(body_id, physicsClientId=self.client_id)):
+        aabb_min, aabb_max = pb.getAABB(body_id, link, physicsClientId=self.client_id)
+        if np.all(np.array(aabb_min) < view_max) and np.all(np.array(aabb_max) > view_min):
+          return False
+    return True
+
+  def getHeightmap(self, objects):
+    '''
+    Rasterize the heightmap of the given primitive objects.
+
+    Args:
+      objects (list[PybulletObject]): The objects, all instances of PRIMITIVE_CLASSES
+
+    Returns:
+      numpy.array: The (size, size) heightmap
+    '''
+    heightmap = np.zeros((self.size, self.size))
+    for obj in objects:
+      pos, rot = pb.getBasePositionAndOrientation(obj.object_id, physicsClientId=self.client_id)
+      normals, offsets = getShapePlanes(pb.getVisualShapeData(obj.object_id, physicsClientId=self.client_id)[0])
+      rot = np.array(pb.getMatrixFromQuaternion(rot)).reshape(3, 3)
+      normals = normals.dot(rot.T)
+      offsets = offsets - normals.dot(pos)
+
+      # pixels covered by the shadow of the object on the ground, seen from the camera
+      aabb_min, aabb_max = pb.getAABB(obj.object_id, physicsClientId=self.client_id)
+      if aabb_min[2] >= 1 or aabb_max[2] >= self.cam_height:
+        continue
+      scale = self.cam_height / (self.cam_height - np.array([aabb_min[2], aabb_max[2]]))
+      ground_min = self.center + np.min((np.array(aabb_min[:2]) - self.center)[:, None] * scale, 1)
+      ground_max = self.center + np.max((np.array(aabb_max[:2]) - self.center)[:, None] * scale, 1)
+      rows = np.flatnonzero((self.pixel_x >= ground_min[0]) * (self.pixel_x <= ground_max[0]))
+      cols = np.flatnonzero((self.pixel_y >= ground_min[1]) * (self.pixel_y <= ground_max[1]))
+      if rows.size == 0 or cols.size == 0:
+        continue
+      gx, gy = np.meshgrid(self.pixel_x[rows], self.pixel_y[cols], indexing='ij')
+
+      # the ray of a pixel at height z is g + (c - g) * z / h, so each face constrains z linearly: a + b * z <= 0
+      a = normals[:, 0, None, None] * gx + normals[:, 1, None, None] * gy + offsets[:, None, None]
+      b = normals[:, 2, None, None] + (normals[:, 0, None, None] * (self.center[0] - gx) +
+                                       normals[:, 1, None, None] * (self.center[1] - gy)) / self.cam_height
+      with np.errstate(divide='ignore', invalid='ignore'):
+        bound = -a / b
+      upper = np.min(np.where(b > 0, bound, np.inf), 0)
+      lower = np.max(np.where(b < 0, bound, -np.inf), 0)
+      hit = (upper >= lower) * np.all((b != 0) + (a <= 0), 0) * (upper < 1)
+      region = heightmap[rows[0]:rows[-1] + 1, cols[0]:cols[-1] + 1]
+      np.maximum(region, np.where(hit, upper, 0), out=region)
+    return heightmap
@@ -0,0 +1,104 @@
+from collections import OrderedDict
+import numpy as np
+
+from bulletarm.pybullet.utils import transformations
+
+# Rotation tables shared by the projectors of the process, keyed by (in-hand image size, rotation bins)
+_rotation_tables = OrderedDict()
+# The maximum number of cached rotation tables
+ROTATION_TABLE_CACHE_SIZE = 256
+# The rotations of the tables are quantized to this step in degrees. At the corner of a 24 voxel grid, half a degree
+# moves a voxel by 0.15 voxel
+ROTATION_TABLE_STEP = 0.5
+
+class InHandProjector(object):
+  '''
+  Computes the 3-channel 'proj' in-hand image: the heightmap crop under the gripper is turned into an occupancy grid,
+  rotated into the gripper frame and projected along each axis. The voxel each grid cell lands in after the rotation
+  only depends on the rotation, so it is precomputed as an index table per rotation, quantized to
+  ROTATION_TABLE_STEP degrees, and the rotation of the occupancy grid becomes a single gather. The tables of the most
+  recently used rotations are shared between the projectors of the process.
+
+  Args:
+    size (int): The size of the in-hand image
+  '''
+  def __init__(self, size):
+    self.size = size
+    self.hits = 0
+    self.misses = 0
+
+    # voxel coordinates of the grid, centered at the middle of the grid
+    self.voxels = np.stack(np.meshgrid(*[np.arange(size)] * 3, indexing='ij'), -1).reshape(-1, 3) - size / 2
+
+  def getRotationTable(self, rot):
+    '''
+    Get the read-only flat index of the voxel each voxel of the grid is rotated to.
+
+    Args:
+      rot (list[float]): The (rx, ry, rz) rotation
+
+    Returns:
+      numpy.array: The (size^3,) int32 destination indices, -1 for voxels rotated out of the grid
+    '''
+    rotation_bins = tuple(np.round(np.rad2deg(rot) / ROTATION_TABLE_STEP).astype(int))
+    key = (self.size,) + rotation_bins
+    if key in _rotation_tables:
+      self.hits += 1
+      _rotation_tables.move_to_end(key)
+      return _rotation_tables[key]
+    self.misses += 1
+
+    R = transformations.euler_matrix(*np.deg2rad(np.array(rotation_bins) * ROTATION_TABLE_STEP))[:3, :3].T
+    point = np.round(R.dot(self.voxels.T) + self.size / 2).astype(int)
+    valid = np.logical_and(0 < point, point < self.size).all(0)
+    table = np.ravel_multi_index(point, (self.size,) * 3, mode='clip').astype(np.int32)
+    table[~valid] = -1
+    table.setflags(write=False)
+
+    _rotation_tables[key] = table
+    if len(_rotation_tables) > ROTATION_TABLE_CACHE_SIZE:
+      _rotation_tables.popitem(last=False)
+    return table
+
+  def project(self, crop, z, rot, resolution):
+    '''
+    Compute the projection of the in-hand crop.
+
+    Args:
+      crop (numpy.array): The (size, size) heightmap crop under the gripper
+      z (float): The height of the gripper
+      rot (list[float]): The (rx, ry, rz) rotation of the gripper
+      resolution (float): The size of a heightmap pixel
+
+    Returns:
+      numpy.array: The (3, size, size) projections of the rotated occupancy grid along x, y and z
+    '''
+    size = self.size
+    crop = np.round(crop, 5)
+    zs = np.array([z+(-size/2+i)*(resolution) for i in range(size)])
+    ori_occupancy = crop.reshape(size, size, 1) > zs.reshape(1, 1, size)
+    if not ori_occupancy.any():
+      return np.zeros((3, size, size))
+
+    table = self.getRotationTable(rot)
+    destination = table[np.flatnonzero(ori_occupancy)]
+    occupancy = np.zeros(size ** 3, dtype=bool)
+    occupancy[destination[destination >= 0]] = True
+    occupancy = self.medianFilter(occupancy.reshape(size, size, size))
+
+    projection = np.stack((occupancy.sum(0), occupancy.sum(1), occupancy.sum(2))).astype(float)
+    return projection
+
+  @staticmethod
+  def medianFilter(occupancy):
+    '''
+    Same as np.ceil(scipy.ndimage.median_filter(occupancy, size=2)) on a binary grid: the 2x2x2 window ending at each
+    voxel (reflected at the border) is occupied if at least 4 of its 8 voxels are.
+    '''
+    padded = np.pad(occupancy.astype(np.uint8), ((1, 0),) * 3, mode='symmetric')
+    count = np.zeros(occupancy.shape, dtype=np.uint8)
+    for dx in (0, 1):
+      for dy in (0, 1):
+        for dz in (0, 1):
+          count += padded[dx:dx + occupancy.shape[0], dy:dy + occupancy.shape[1], dz:dz + occupancy.shape[2]]
+    return count >= 4
@@ -25,64 +25,109 @@ from bulletarm.pybullet.objects.box import Box
 from bulletarm.pybullet.objects.flat_block import FlatBlock
 from bulletarm.pybullet.objects.random_household_object_200 import RandomHouseHoldObject200
 from bulletarm.pybullet.objects.grasp_net_obj import GraspNetObject
+from bulletarm.pybullet.objects import random_object, random_block, random_household_object, \
+  random_household_object_200, grasp_net_obj
+from bulletarm.pybullet.utils import constants
+from bulletarm.pybullet.utils.object_pool import ObjectPool
 
-def generateCube(pos, rot, scale):
+def generateCube(pos, rot, scale, client_id=0):
   ''''''
-  return Cube(pos, rot, scale)
-
-def generateBrick(pos, rot, scale):
-  return Brick(pos, rot, scale)
-
-def generateCylinder(pos, rot, scale):
-  return Cylinder(pos, rot, scale)
-
-def generateTriangle(pos, rot, scale):
-  return Triangle(pos, rot, scale)
-
-def generateRoof(pos, rot, scale):
-  return Roof(pos, rot, scale)
-
-def generateCup(pos, rot, scale):
-  return Cup(pos, rot, scale)
-
-def generateBowl(pos, rot, scale):
-  return Bowl(pos, rot, scale)
-
-def generatePlate(pos, rot, scale, model_id):
-  return Plate(pos, rot, scale, model_id)
-
-def generateTestTube(pos, rot, scale, model_id):
-  return TestTube(pos, rot, scale, model_id)
-
-def generateSwab(pos, rot, scale, model_id):
-  return Swab(pos, rot, scale, model_id)
-
-def generateRandomObj(pos, rot, scale, z_scale=1):
-  return RandomObject(pos, rot, scale, z_scale)
-
-def generateRandomBrick(pos, rot, x_scale, y_scale, z_scale):
-  return RandomBrick(pos, rot, x_scale, y_scale, z_scale)
-
-def generateRandomBlock(pos, rot, scale):
-  return RandomBlock(pos, rot, scale)
-
-def generateRandomHouseHoldObj(pos, rot, scale):
-  return RandomHouseHoldObject(pos, rot, scale)
-
-def generateSpoon(pos, rot, scale):
-  return Spoon(pos, rot, scale)
-
-def generateBottle(pos, rot, scale):
-  return Bottle(pos, rot, scale)
-
-def generateBox(pos, rot, scale):
-  return Box(pos, rot, scale)
-
-def generateFlatBlock(pos, rot, scale):
-  return FlatBlock(pos, rot, scale)
-
-def generateRandomHouseHoldObj200(pos, rot, scale, index):
-  return RandomHouseHoldObject200(pos, rot, scale, index)
-
-def generateGraspNetObject(pos, rot, scale, index):
-  return GraspNetObject(pos, rot, scale, index)
\ No newline at end of file
+  return Cube(pos, rot, scale, client_id=client_id)
+
+def generateBrick(pos, rot, scale, client_id=0):
+  return Brick(pos, rot, scale, client_id=client_id)
+
+def generateCylinder(pos, rot, scale, client_id=0):
+  return Cylinder(pos, rot, scale, client_id=client_id)
+
+def generateTriangle(pos, rot, scale, client_id=0):
+  return Triangle(pos, rot, scale, client_id=client_id)
+
+def generateRoof(pos, rot, scale, client_id=0):
+  return Roof(pos, rot, scale, client_id=client_id)
+
+def generateCup(pos, rot, scale, client_id=0):
+  return Cup(pos, rot, scale, client_id=client_id)
+
+def generateBowl(pos, rot, scale, client_id=0):
+  return Bowl(pos, rot, scale, client_id=client_id)
+
+def generatePlate(pos, rot, scale, model_id, client_id=0):
+  return Plate(pos, rot, scale, model_id, client_id=client_id)
+
+def generateTestTube(pos, rot, scale, model_id, client_id=0):
+  return TestTube(pos, rot, scale, model_id, client_id=client_id)
+
+def generateSwab(pos, rot, scale, model_id, client_id=0):
+  return Swab(pos, rot, scale, model_id, client_id=client_id)
+
+def generateRandomObj(pos, rot, scale, z_scale=1, client_id=0, index=-1):
+  return RandomObject(pos, rot, scale, z_scale, client_id=client_id, index=index)
+
+def generateRandomBrick(pos, rot, x_scale, y_scale, z_scale, client_id=0):
+  return RandomBrick(pos, rot, x_scale, y_scale, z_scale, client_id=client_id)
+
+def generateRandomBlock(pos, rot, scale, client_id=0, index=-1):
+  return RandomBlock(pos, rot, scale, client_id=client_id, index=index)
+
+def generateRandomHouseHoldObj(pos, rot, scale, client_id=0, index=-1):
+  return RandomHouseHoldObject(pos, rot, scale, client_id=client_id, index=index)
+
+def generateSpoon(pos, rot, scale, client_id=0):
+  return Spoon(pos, rot, scale, client_id=client_id)
+
+def generateBottle(pos, rot, scale, client_id=0):
+  return Bottle(pos, rot, scale, client_id=client_id)
+
+def generateBox(pos, rot, scale, client_id=0):
+  return Box(pos, rot, scale, client_id=client_id)
+
+def generateFlatBlock(pos, rot, scale, client_id=0):
+  return FlatBlock(pos, rot, scale, client_id=client_id)
+
+def generateRandomHouseHoldObj200(pos, rot, scale, index, client_id=0):
+  return RandomHouseHoldObject200(pos, rot, scale, index, client_id=client_id)
+
+def generateGraspNetObject(pos, rot, scale, index, client_id=0):
+  return GraspNetObject(pos, rot, scale, index, client_id=client_id)
+
+# Shape types which can be kept in an ObjectPool. Maps the shape type to the object class and the function resolving
+# the model of the object before it is created. The model is None for classes with a single model.
+POOLED_SHAPES = {
+  constants.CUBE: (Cube, None),
+  constants.BRICK: (Brick, None),
+  constants.TRIANGLE: (Triangle, None),
+  constants.ROOF: (Roof, None),
+  constants.CYLINDER: (Cylinder, None),
+  constants.CUP: (Cup, None),
+  constants.BOWL: (Bowl, None),
+  constants.SPOON: (Spoon, None),
+  constants.BOX: (Box, None),
+  constants.FLAT_BLOCK: (FlatBlock, None),
+  constants.TEST_TUBE: (TestTube, None),
+  constants.SWAB: (Swab, None),
+  constants.PLATE: (Plate, lambda model_id: model_id),
+  constants.RANDOM: (RandomObject, lambda model_id: random_object.sampleIndex()),
+  constants.RANDOM_BLOCK: (RandomBlock, lambda model_id: random_block.sampleIndex()),
+  constants.RANDOM_HOUSEHOLD: (RandomHouseHoldObject, lambda model_id: random_household_object.sampleIndex()),
+  constants.RANDOM_HOUSEHOLD200: (RandomHouseHoldObject200, random_household_object_200.sampleIndex),
+  constants.GRASP_NET_OBJ: (GraspNetObject, grasp_net_obj.sampleIndex),
+}
+
+def getPoolKey(shape_type, scale, model_id, z_scale=1):
+  '''
+  Resolve the model of an object which is about to be generated and get its ObjectPool key.
+
+  Args:
+    shape_type (int): The shape to generate
+    scale (float): The scale of the object
+    model_id (int): The requested model. Random models are sampled here so the pool can be searched for them.
+    z_scale (float): The scale of the object's Z axis. Only used by random objects. Defaults to 1.
+
+  Returns:
+    (int, tuple): The resolved model id and the pool key
+  '''
+  object_class, sample_model = POOLED_SHAPES[shape_type]
+  model_id = sample_model(model_id) if sample_model else None
+  scale = (scale, z_scale) if shape_type == constants.RANDOM else scale
+  return model_id, ObjectPool.getKey(object_class, model_id, scale)
@@ -0,0 +1,114 @@
+import pybullet as pb
+import numpy as np
+from bulletarm.pybullet.utils import pybullet_util
+
+class ObjectPool(object):
+  '''
+  Pool of object bodies for a single pybullet physics client. Instead of removing the objects of a finished
+  episode, the env parks them far away from the workspace and reactivates them when an object with the same
+  (object class, model id, scale) key is requested again. This avoids reloading URDFs and rebuilding mesh
+  collision shapes on every reset. Reactivated bodies keep the color they were created with.
+
+  Args:
+    client_id (int): The pybullet physics client the objects live in. Defaults to 0.
+    park_position (list[float]): Position around which the parked bodies are stored. Defaults to [50, 50, 50].
+  '''
+  def __init__(self, client_id=0, park_position=(50., 50., 50.)):
+    self.client_id = client_id
+    self.park_position = np.array(park_position)
+    self.parked = dict()
+    self.bodies = dict()
+    self.num_slots = 0
+
+  @staticmethod
+  def getKey(object_class, model_id, scale):
+    '''
+    Get the pool key of an object. Scales are rounded so that float noise does not split the pool.
+
+    Args:
+      object_class (type): The object class
+      model_id (int): The specific model within the class, None if the class only has one model
+      scale (float | tuple[float]): The scale(s) the object is created with
+
+    Returns:
+      tuple: The pool key
+    '''
+    scale = tuple(np.round(np.atleast_1d(scale).astype(float), 4))
+    model_id = None if model_id is None else int(model_id)
+    return object_class, model_id, scale
+
+  def register(self, obj, key):
+    '''
+    Add a newly created object to the pool so it can be parked once it is no longer used.
+
+    Args:
+      obj (PybulletObject): The object
+      key (tuple): The pool key of the object
+    '''
+    obj.pool_key = key
+    mass = pb.getDynamicsInfo(obj.object_id, -1, physicsClientId=self.client_id)[0]
+    # Each body gets its own parking spot so parked bodies never touch each other
+    self.bodies[obj.object_id] = (mass, self.num_slots)
+    self.num_slots += 1
+
+  def acquire(self, key, pos, rot):
+    '''
+    Reactivate a parked object at the given pose.
+
+    Args:
+      key (tuple): The pool key of the requested object
+      pos (list[float]): The position to place the object at
+      rot (list[float]): The orientation to place the object at
+
+    Returns:
+      PybulletObject: The reactivated object, None if no object with this key is parked
+    '''
+    if not self.parked.get(key):
+      return None
+    obj = self.parked[key].pop()
+    pb.changeDynamics(obj.object_id, -1, mass=self.bodies[obj.object_id][0],
+                      activationState=pb.ACTIVATION_STATE_WAKE_UP, physicsClientId=self.client_id)
+    pb.resetBasePositionAndOrientation(obj.object_id, pos, rot, physicsClientId=self.client_id)
+    pb.resetBaseVelocity(obj.object_id, [0, 0, 0], [0, 0, 0], physicsClientId=self.client_id)
+    pybullet_util.markWorldChanged(self.client_id)
+    return obj
+
+  def release(self, obj):
+    '''
+    Park an object out of the workspace. The object is made static so it is not simulated while parked.
+
+    Args:
+      obj (PybulletObject): The object to park
+
+    Returns:
+      bool: True if the object was parked, False if it does not belong to the pool and should be removed
+    '''
+    key = getattr(obj, 'pool_key', None)
+    if key is None or obj.object_id not in self.bodies:
+      return False
+    slot = self.bodies[obj.object_id][1]
+    pos = self.park_position + np.array([slot % 32, slot // 32, 0]) * 2.
+    pb.changeDynamics(obj.object_id, -1, mass=0, physicsClientId=self.client_id)
+    pb.resetBasePositionAndOrientation(obj.object_id, pos, [0, 0, 0, 1], physicsClientId=self.client_id)
+    pb.resetBaseVelocity(obj.object_id, [0, 0, 0], [0, 0, 0], physicsClientId=self.client_id)
+    pybullet_util.markWorldChanged(self.client_id)
+    self.parked.setdefault(key, list()).append(obj)
+    return True
+
+  def forget(self, obj):
+    '''
+    Drop an object from the pool, e.g. because the env removed its body.
+
+    Args:
+      obj (PybulletObject): The object
+    '''
+    self.bodies.pop(obj.object_id, None)
+    obj.pool_key = None
+
+  def clear(self):
+    '''
+    Forget all bodies. Must be called after the physics client is reset since the body ids become invalid.
+    '''
+    self.parked = dict()
+    self.bodies = dict()
+    self.num_slots = 0
@@ -3,8 +3,8 @@ import numpy as np
 from bulletarm.pybullet.utils.sensor import Sensor
 
 class OrthographicSensor(Sensor):
-  def __init__(self, cam_pos, cam_up_vector, target_pos, target_size, near, far):
-    super().__init__(cam_pos, cam_up_vector, target_pos, target_size, near, far)
+  def __init__(self, cam_pos, cam_up_vector, target_pos, target_size, near, far, client_id=0):
+    super().__init__(cam_pos, cam_up_vector, target_pos, target_size, near, far, client_id)
     self.target_size = target_size
     self.proj_matrix = np.array([
       [2 / target_size, 0, 0, 0],
@@ -31,7 +31,7 @@ class OrthographicSensor(Sensor):
   def getDepth(self, size):
     image_arr = pb.getCameraImage(width=size, height=size,
                                   viewMatrix=self.view_matrix,
-                                  projectionMatrix=self.proj_matrix)
+                                  projectionMatrix=self.proj_matrix, physicsClientId=self.client_id)
     depth = np.array(image_arr[3])
     depth = self.far * self.near / (self.far - (self.far - self.near) * depth)
 
@@ -0,0 +1,70 @@
+import numpy as np
+from scipy.ndimage import map_coordinates
+
+class PatchExtractor(object):
+  '''
+  Crops square patches out of a heightmap and rotates images around their center. The crop copies the part of the
+  window inside the heightmap into a reusable buffer which is zero outside of the heightmap, so the heightmap never
+  has to be padded. The rotation samples the image on a grid of output pixels relative to the center which is
+  precomputed per image shape, so a rotation only costs a 2x2 transform of the grid and one interpolation, both
+  restricted to the output pixels which are actually used.
+
+  Args:
+    size (int): The size of the patches
+  '''
+  def __init__(self, size):
+    self.size = size
+    self.buffer = np.zeros((size, size))
+    self.grids = dict()
+
+  def crop(self, heightmap, x, y):
+    '''
+    Crop the size x size window starting at (floor(x - size/2), floor(y - size/2)), with zeros outside of the heightmap.
+    The crop is written into the buffer of the extractor, which is overwritten by the next crop.
+
+    Args:
+      heightmap (numpy.array): The heightmap
+      x (float): The center row of the window in pixels
+      y (float): The center column of the window in pixels
+
+    Returns:
+      numpy.array: The (size, size) crop
+    '''
+    x_min = int(np.floor(x - self.size / 2))
+    y_min = int(np.floor(y - self.size / 2))
+    src_x = slice(max(x_min, 0), max(min(x_min + self.size, heightmap.shape[0]), 0))
+    src_y = slice(max(y_min, 0), max(min(y_min + self.size, heightmap.shape[1]), 0))
+    self.buffer.fill(0)
+    if src_x.stop > src_x.start and src_y.stop > src_y.start:
+      self.buffer[src_x.start - x_min:src_x.stop - x_min, src_y.start - y_min:src_y.stop - y_min] = \
+        heightmap[src_x, src_y]
+    return self.buffer
+
+  def _getGrid(self, shape):
+    if shape not in self.grids:
+      center = (np.array(shape) - 1) / 2
+      grid = np.stack(np.meshgrid(np.arange(shape[0]) - center[0], np.arange(shape[1]) - center[1], indexing='ij'))
+      self.grids[shape] = (grid, center)
+    return self.grids[shape]
+
+  def rotate(self, image, angle, order=1, rows=slice(None), cols=slice(None)):
+    '''
+    Rotate an image counterclockwise around its center without reshaping it, with zeros outside of the image. Same as
+    skimage.transform.rotate for order=1 and scipy.ndimage.rotate(reshape=False) for order=3.
+
+    Args:
+      image (numpy.array): The 2D image
+      angle (float): The rotation in degrees
+      order (int): The order of the interpolation, 1 (bilinear) or 3 (cubic spline). Defaults to 1.
+      rows (slice): The rows of the rotated image to compute. Defaults to all of them.
+      cols (slice): The columns of the rotated image to compute. Defaults to all of them.
+
+    Returns:
+      numpy.array: The rotated image[rows, cols]
+    '''
+    grid, center = self._getGrid(image.shape)
+    grid_rows, grid_cols = grid[:, rows, cols]
+    cos, sin = np.cos(np.deg2rad(angle)), np.sin(np.deg2rad(angle))
+    coords = np.stack((cos * grid_rows + sin * grid_cols + center[0], cos * grid_cols - sin * grid_rows + center[1]))
+    mode = 'grid-constant' if order == 1 else 'constant'
+    return map_coordinates(image, coords, order=order, mode=mode, cval=0.)
@@ -2,6 +2,64 @@ import pybullet as pb
 import numpy as np
 from bulletarm.pybullet.utils import constants
 
+# Number of times the world of each physics client was stepped or had objects teleported. Cached object poses are
+# stale once this changes.
+_world_versions = dict()
+# The contact points of the bodies of each physics client along with the world version they were queried at
+_contact_points = dict()
+
+def stepSimulation(client_id=0):
+  '''
+  Step the simulation of a physics client. Use this instead of pb.stepSimulation so the pose caches are invalidated.
+
+  Args:
+    client_id (int): The pybullet physics client. Defaults to 0.
+  '''
+  pb.stepSimulation(physicsClientId=client_id)
+  _world_versions[client_id] = _world_versions.get(client_id, 0) + 1
+
+def markWorldChanged(client_id=0):
+  '''
+  Invalidate the pose caches of a physics client after objects were moved without stepping the simulation,
+  e.g. by pb.resetBasePositionAndOrientation or pb.restoreState.
+
+  Args:
+    client_id (int): The pybullet physics client. Defaults to 0.
+  '''
+  _world_versions[client_id] = _world_versions.get(client_id, 0) + 1
+
+def getWorldVersion(client_id=0):
+  '''
+  Get the current world version of a physics client.
+
+  Args:
+    client_id (int): The pybullet physics client. Defaults to 0.
+
+  Returns:
+    int: The number of times the world was stepped or changed
+  '''
+  return _world_versions.get(client_id, 0)
+
+def getContactPoints(body_id, client_id=0):
+  '''
+  Get the contact points of a body with all the other bodies, same as pb.getContactPoints(bodyA=body_id). The contacts
+  only change when the simulation is stepped, so they are queried once per world version and shared by all the checks
+  of a step.
+
+  Args:
+    body_id (int): The body
+    client_id (int): The pybullet physics client. Defaults to 0.
+
+  Returns:
+    tuple: The contact points, with the body as bodyA
+  '''
+  version = getWorldVersion(client_id)
+  cached = _contact_points.get((client_id, body_id))
+  if cached is None or cached[0] != version:
+    cached = (version, pb.getContactPoints(bodyA=body_id, physicsClientId=client_id))
+    _contact_points[(client_id, body_id)] = cached
+  return cached[1]
+
 def getMatrix(pos, rot):
   T = np.eye(4)
   T[:3, :3] = np.array(pb.getMatrixFromQuaternion(rot)).reshape((3, 3))
@@ -1,12 +1,37 @@
 import pybullet as pb
 import numpy as np
 import scipy
+import scipy.interpolate
+import scipy.ndimage
 from bulletarm.pybullet.utils.sensor import Sensor
 from bulletarm.pybullet.utils import transformations
 
 class Renderer(object):
-  def __init__(self, workspace, sensors=None):
+  '''
+  Renders orthographic depth images from the point cloud captured by perspective sensors.
+
+  Args:
+    workspace (numpy.array): The workspace limits
+    sensors (list[Sensor]): The sensors used to capture the point cloud. Defaults to two side cameras.
+    client_id (int): The pybullet physics client. Defaults to 0.
+    hole_filling (str): How the pixels no point is projected to are filled: 'edt' copies the nearest valid pixel
+      using a Euclidean distance transform, 'nearest' does the same with a KD-tree interpolator (slower). Defaults
+      to 'edt'.
+    incremental (bool): If True, updatePoints keeps the point cloud until a body moves, and the points of the bodies
+      in ignore_body_ids (e.g. the robot) are left out of the cloud. Defaults to False.
+    move_threshold (float): The change of a body position, orientation quaternion or joint position above which the
+      point cloud is captured again in incremental mode. Defaults to 1e-3.
+  '''
+  def __init__(self, workspace, sensors=None, client_id=0, hole_filling='edt', incremental=False, move_threshold=1e-3):
+    if hole_filling not in ('edt', 'nearest'):
+      raise ValueError('Invalid hole filling method: {}'.format(hole_filling))
     self.workspace = workspace
+    self.client_id = client_id
+    self.hole_filling = hole_filling
+    self.incremental = incremental
+    self.move_threshold = move_threshold
+    self.ignore_body_ids = list()
+    self.scene_state = None
 
     self.sensors = []
     if sensors is None:
@@ -16,18 +41,22 @@ class Renderer(object):
       cam_1_forward_pos = [self.workspace[0].mean(), 0.5, 1]
       far_1 = np.linalg.norm(np.array(cam_1_forward_pos) - np.array(cam_forward_target_pos)) + 2
       self.sensors.append(Sensor(cam_1_forward_pos, cam_forward_up_vector, cam_forward_target_pos,
-                                 2, near=0.1, far=far_1))
+                                 2, near=0.1, far=far_1, client_id=self.client_id))
 
       cam_2_forward_pos = [self.workspace[0].mean(), -0.5, 1]
       far_2 = np.linalg.norm(np.array(cam_2_forward_pos) - np.array(cam_forward_target_pos)) + 2
       self.sensors.append(Sensor(cam_2_forward_pos, cam_forward_up_vector, cam_forward_target_pos,
-                                 2, near=0.1, far=far_2))
+                                 2, near=0.1, far=far_2, client_id=self.client_id))
 
     else:
       self.sensors = sensors
     self.points = np.empty((0, 3))
     self.max_crop_z = 0.05
     self.run_interpolate = True
+    self.world_to_pixel = None
+    self.world_to_pixel_key = None
+    self.depth_buffer = None
+    self.point_buffer = None
 
   def getNewPointCloud(self, res=256):
     self.clearPoints()
@@ -35,9 +64,22 @@ class Renderer(object):
     #                                np.linspace(self.workspace[1][0], self.workspace[1][1], 256))).T.reshape(-1, 2)
     # ceiling = np.concatenate((ceiling, 0.25 * np.ones((256*256, 1))), 1)
     # self.addPoints(np.array(ceiling))
+    # the points of all the sensors are written to a preallocated buffer instead of being concatenated
+    if self.point_buffer is None or self.point_buffer.shape[0] != len(self.sensors) * res * res:
+      self.point_buffer = np.empty((len(self.sensors) * res * res, 3))
+    num_points = 0
     for sensor in self.sensors:
-      self.addPoints(sensor.getPointCloud(res, to_numpy=False))
-    self.points = self.points[self.points[:, 2] <= self.workspace[2][1]]
+      if self.incremental and self.ignore_body_ids:
+        images = sensor.capture(res, ('point_cloud', 'seg'))
+        points = images['point_cloud'][~np.isin(images['seg'].reshape(-1), self.ignore_body_ids)]
+      else:
+        points = sensor.getPointCloud(res, to_numpy=False)
+      points = points[points[:, 2] <= self.workspace[2][1]]
+      self.point_buffer[num_points:num_points + points.shape[0]] = points
+      num_points += points.shape[0]
+    self.points = self.point_buffer[:num_points]
+    if self.incremental:
+      self.scene_state = self._getSceneState()
     # import pyrender
     # mesh = pyrender.Mesh.from_points(self.points.get())
     # scene = pyrender.Scene()
@@ -45,11 +87,14 @@ class Renderer(object):
     # pyrender.Viewer(scene)
 
   def getTopDownDepth(self, target_size, img_size, gripper_pos, gripper_rz):
+    crop_z = max(gripper_pos[2] - 0.01, self.max_crop_z)
     if self.points.shape[0] == 0:
       self.getNewPointCloud(512)
-      self.points = self.points[self.points[:, 2] <= max(gripper_pos[2] - 0.01, self.max_crop_z)]
-    points = np.copy(self.points)
-    points = points[points[:, 2] <= max(gripper_pos[2] - 0.01, self.max_crop_z)]
+      if not self.incremental:
+        # the cloud is captured again at the next step, only the points under the gripper are needed until then
+        self.points = self.points[self.points[:, 2] <= crop_z]
+    # projectDepth does not modify the points, only the points under the gripper are copied
+    points = self.points[self.points[:, 2] <= crop_z]
     # self.points = self.points[(self.workspace[0, 0] <= self.points[:, 0]) * (self.points[:, 0] <= self.workspace[0, 1])]
     # self.points = self.points[(self.workspace[1, 0] <= self.points[:, 1]) * (self.points[:, 1] <= self.workspace[1, 1])]
 
@@ -83,7 +128,67 @@ class Renderer(object):
   def clearPoints(self):
     self.points = np.empty((0, 3))
 
+  def updatePoints(self):
+    '''
+    Invalidate the point cloud after the world changed. In incremental mode, the cloud is only cleared if a body
+    other than the ignored ones moved by more than move_threshold since the cloud was captured.
+    '''
+    if not self.incremental:
+      self.clearPoints()
+      return
+    scene_state = self._getSceneState()
+    if self.scene_state is None or scene_state.shape != self.scene_state.shape or \
+       np.abs(scene_state - self.scene_state).max() > self.move_threshold:
+      self.clearPoints()
+
+  def _getSceneState(self):
+    '''
+    Get the base poses and joint positions of all the bodies except the ignored ones.
+    '''
+    state = list()
+    for i in range(pb.getNumBodies(physicsClientId=self.client_id)):
+      body_id = pb.getBodyUniqueId(i, physicsClientId=self.client_id)
+      if body_id in self.ignore_body_ids:
+        continue
+      pos, rot = pb.getBasePositionAndOrientation(body_id, physicsClientId=self.client_id)
+      state.extend(pos)
+      state.extend(rot)
+      num_joints = pb.getNumJoints(body_id, physicsClientId=self.client_id)
+      if num_joints > 0:
+        joint_states = pb.getJointStates(body_id, range(num_joints), physicsClientId=self.client_id)
+        state.extend(joint_state[0] for joint_state in joint_states)
+    return np.array(state)
+
   def interpolate(self, depth):
+    '''
+    Fill the NaN pixels of a depth image with the value of the nearest valid pixel, using the method selected by
+    hole_filling.
+
+    Args:
+      depth (numpy.array): The depth image, NaN where no point was projected
+
+    Returns:
+      numpy.array: The filled depth image
+    '''
+    if self.hole_filling == 'edt':
+      return self.interpolateEDT(depth)
+    else:
+      return self.interpolateNearest(depth)
+
+  def interpolateEDT(self, depth):
+    '''
+    Nearest valid pixel fill using the index output of the Euclidean distance transform, which runs in linear time
+    on the pixel grid instead of building a KD-tree over the valid pixels.
+    '''
+    invalid = np.isnan(depth)
+    if not invalid.any():
+      return depth
+    if invalid.all():
+      return np.full_like(depth, -0.1)
+    indices = scipy.ndimage.distance_transform_edt(invalid, return_distances=False, return_indices=True)
+    return depth[tuple(indices)]
+
+  def interpolateNearest(self, depth):
     # a boolean array of (width, height) which False where there are missing values and True where there are valid (non-missing) values
     mask = np.logical_not(np.isnan(depth))
     # array of (number of points, 2) containing the x,y coordinates of the valid values only
@@ -101,78 +206,67 @@ class Renderer(object):
 
     return result0
 
+  def _getWorldToPixelMatrix(self, cam_pos, cam_up_vector, target_pos, target_size):
+    '''
+    Get the matrix projecting world points to the orthographic image plane. The matrix of the last camera pose is
+    cached since the fixed views use the same pose every step.
+    '''
+    key = (tuple(cam_pos), tuple(cam_up_vector), tuple(target_pos), target_size)
+    if key != self.world_to_pixel_key:
+      view_matrix = pb.computeViewMatrix(
+        cameraEyePosition=cam_pos,
+        cameraUpVector=cam_up_vector,
+        cameraTargetPosition=target_pos,
+      )
+      view_matrix = np.asarray(view_matrix).reshape([4, 4], order='F')
+      projection_matrix = np.array([
+        [1 / (target_size / 2), 0, 0, 0],
+        [0, 1 / (target_size / 2), 0, 0],
+        [0, 0, -1, 0],
+        [0, 0, 0, 1]
+      ])
+      self.world_to_pixel = np.matmul(projection_matrix, view_matrix)
+      self.world_to_pixel_key = key
+    return self.world_to_pixel
+
   def projectDepth(self, points, size, cam_pos, cam_up_vector, target_pos, target_size):
-    view_matrix = pb.computeViewMatrix(
-      cameraEyePosition=cam_pos,
-      cameraUpVector=cam_up_vector,
-      cameraTargetPosition=target_pos,
-    )
-    view_matrix = np.asarray(view_matrix).reshape([4, 4], order='F')
-
-    augment = np.ones((1, points.shape[0]))
-    # pts = np.concatenate((np.asarray(points).T, augment), axis=0)
-    pts = np.concatenate((points.T, augment), axis=0)
-    projection_matrix = np.array([
-      [1 / (target_size / 2), 0, 0, 0],
-      [0, 1 / (target_size / 2), 0, 0],
-      [0, 0, -1, 0],
-      [0, 0, 0, 1]
-    ])
-    tran_world_pix = np.matmul(projection_matrix, view_matrix)
-    pts = np.matmul(tran_world_pix, pts)
-    pts[1] = -pts[1]
-    pts[0] = (pts[0] + 1) * size / 2
-    pts[1] = (pts[1] + 1) * size / 2
-
-    # pts_floor = pts.copy()
-    # pts_floor[0], pts_floor[1] = np.floor(pts_floor[0]), np.floor(pts_floor[1])
-    # pts_ceil = pts.copy()
-    # pts_ceil[0], pts_ceil[1] = np.ceil(pts_ceil[0]), np.ceil(pts_ceil[1])
-    # pts = np.concatenate((pts_floor, pts_ceil), 1)
-    # mask = (pts[0] >= 0) * (pts[0] < size) * (pts[1] >= 0) * (pts[1] < size)
-
-    pts[0] = np.round_(pts[0])
-    pts[1] = np.round_(pts[1])
-    mask = (pts[0] >= 0) * (pts[0] < size) * (pts[1] > 0) * (pts[1] < size)
-    pts = pts[:, mask]
-    if pts.shape[1] == 0:
-      return np.zeros([size, size])
-    # dense pixel index
-    mix_xy = (pts[1].astype(int) * size + pts[0].astype(int))
-    # lexsort point cloud first on dense pixel index, then on z value
-    ind = np.lexsort(np.stack((pts[2], mix_xy)))
-    # bin count the points that belongs to each pixel
-    bincount = np.bincount(mix_xy)
-    # cumulative sum of the bin count. the result indicates the cumulative sum of number of points for all previous pixels
-    cumsum = np.cumsum(bincount)
-    # rolling the cumsum gives the ind of the first point that belongs to each pixel.
-    # because of the lexsort, the first point has the smallest z value
-    cumsum = np.roll(cumsum, 1)
-    cumsum[0] = bincount[0]
-    cumsum[cumsum == np.roll(cumsum, -1)] = 0
-    # pad for unobserved pixels
-    cumsum = np.concatenate((cumsum, -1 * np.ones(size * size - cumsum.shape[0]))).astype(int)
-
-    depth = pts[2][ind][cumsum]
-    depth[cumsum == 0] = np.nan
-    depth = depth.reshape(size, size)
-    # depth = np.asnumpy(depth)
+    depth = self.rasterizeDepth(points, size, cam_pos, cam_up_vector, target_pos, target_size)
 
     if self.run_interpolate:
       depth = self.interpolate(depth)
     else:
       depth[np.isnan(depth)] = -0.1
 
-    # mask = np.isnan(depth)
-    # depth[mask] = np.interp(np.flatnonzero(mask), np.flatnonzero(~mask), depth[~mask])
-
-    # imputer = SimpleImputer(missing_values=np.nan, strategy='median')
-    # depth = imputer.fit_transform(depth)
-    # if depth.shape != (size, size):
-    #   depth = sk_transform.resize(depth, (size, size), mode='constant', anti_aliasing=0)
-
     return depth
 
+  def rasterizeDepth(self, points, size, cam_pos, cam_up_vector, target_pos, target_size):
+    '''
+    Project the points to an orthographic depth image without filling the holes.
+
+    Returns:
+      numpy.array: The (size, size) depth image, NaN where no point was projected
+    '''
+    tran_world_pix = self._getWorldToPixelMatrix(cam_pos, cam_up_vector, target_pos, target_size)
+    # project x and y first, the depth is only needed for the points inside the image
+    pts_xy = np.matmul(points, tran_world_pix[:2, :3].T) + tran_world_pix[:2, 3]
+    pix_x = np.round_((pts_xy[:, 0] + 1) * size / 2)
+    pix_y = np.round_((1 - pts_xy[:, 1]) * size / 2)
+
+    mask = (pix_x >= 0) * (pix_x < size) * (pix_y > 0) * (pix_y < size)
+    if not mask.any():
+      return np.zeros([size, size])
+    # dense pixel index
+    mix_xy = pix_y[mask].astype(int) * size + pix_x[mask].astype(int)
+
+    # z-buffer: keep the nearest point of each pixel. np.minimum.at is well defined for repeated pixels, unlike a
+    # fancy-index assignment
+    z = np.matmul(points[mask], tran_world_pix[2, :3]) + tran_world_pix[2, 3]
+    if self.depth_buffer is None or self.depth_buffer.shape[0] != size * size:
+      self.depth_buffer = np.empty(size * size)
+    self.depth_buffer.fill(np.inf)
+    np.minimum.at(self.depth_buffer, mix_xy, z)
+    return np.where(np.isinf(self.depth_buffer), np.nan, self.depth_buffer).reshape(size, size)
+
   def projectHeightmap(self, size, cam_pos, cam_up_vector, target_pos, target_size):
     depth = self.projectDepth(self.points, size, cam_pos, cam_up_vector, target_pos, target_size)
     return np.abs(depth - np.max(depth))
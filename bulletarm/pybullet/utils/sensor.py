@@ -2,7 +2,8 @@ import pybullet as pb
 import numpy as np
 
 class Sensor(object):
-  def __init__(self, cam_pos, cam_up_vector, target_pos, target_size, near, far):
+  def __init__(self, cam_pos, cam_up_vector, target_pos, target_size, near, far, client_id=0):
+    self.client_id = client_id
     self.view_matrix = pb.computeViewMatrix(
       cameraEyePosition=cam_pos,
       cameraUpVector=cam_up_vector,
@@ -13,6 +14,9 @@ class Sensor(object):
     self.far = far
     self.fov = np.degrees(2 * np.arctan((target_size / 2) / self.far))
     self.proj_matrix = pb.computeProjectionMatrixFOV(self.fov, 1, self.near, self.far)
+    self.pixel_grid = None
+    self.depth_column = None
+    self.pixel_grid_key = None
 
   def setCamMatrix(self, cam_pos, cam_up_vector, target_pos):
     self.view_matrix = pb.computeViewMatrix(
@@ -22,57 +26,81 @@ class Sensor(object):
     )
     self.proj_matrix = pb.computeProjectionMatrixFOV(70, 1, 0.001, 0.3)
 
-  def getHeightmap(self, size):
+  def capture(self, size, modalities=('rgb', 'depth')):
+    '''
+    Render the camera once and derive all the requested images from the same frame.
+
+    Args:
+      size (int): The width and height of the image
+      modalities (list[str]): The images to compute. Choices: 'rgb', 'depth', 'heightmap', 'seg', 'point_cloud'.
+        Defaults to ('rgb', 'depth').
+
+    Returns:
+      dict: The images keyed by modality. 'rgb' is (3, size, size) in [0, 1], 'depth' and 'heightmap' are
+        (size, size), 'seg' is the (size, size) body unique id of each pixel and 'point_cloud' is (size*size, 3) in
+        world coordinates.
+    '''
+    for modality in modalities:
+      if modality not in ('rgb', 'depth', 'heightmap', 'seg', 'point_cloud'):
+        raise ValueError('Invalid modality: {}'.format(modality))
+    flags = 0 if 'seg' in modalities else pb.ER_NO_SEGMENTATION_MASK
     image_arr = pb.getCameraImage(width=size, height=size,
                                   viewMatrix=self.view_matrix,
                                   projectionMatrix=self.proj_matrix,
-                                  renderer=pb.ER_TINY_RENDERER)
-    depth_img = np.array(image_arr[3])
-    depth = self.far * self.near / (self.far - (self.far - self.near) * depth_img)
+                                  renderer=pb.ER_TINY_RENDERER, flags=flags, physicsClientId=self.client_id)
+    images = dict()
+    if 'rgb' in modalities:
+      rgb_img = np.asarray(image_arr[2]).reshape(size, size, 4)
+      images['rgb'] = np.moveaxis(rgb_img[:, :, :3], 2, 0) / 255
+    if 'seg' in modalities:
+      images['seg'] = np.asarray(image_arr[4]).reshape(size, size)
+    depth_img = np.asarray(image_arr[3]).reshape(size, size)
+    if 'depth' in modalities or 'heightmap' in modalities:
+      depth = self.far * self.near / (self.far - (self.far - self.near) * depth_img)
+      if 'depth' in modalities:
+        images['depth'] = depth
+      if 'heightmap' in modalities:
+        images['heightmap'] = np.abs(depth - np.max(depth))
+    if 'point_cloud' in modalities:
+      images['point_cloud'] = self._depthToPointCloud(depth_img, size)
+    return images
 
-    return np.abs(depth - np.max(depth)).reshape(size, size)
+  def _depthToPointCloud(self, depth_img, size):
+    '''
+    Unproject a depth buffer to world points. The pixel to world transform and the unprojected pixel grid only
+    depend on the camera matrices and the image size, so they are cached for the last camera.
+    '''
+    # https://stackoverflow.com/questions/59128880/getting-world-coordinates-from-opengl-depth-buffer
+    key = (tuple(self.view_matrix), tuple(self.proj_matrix), size)
+    if key != self.pixel_grid_key:
+      projectionMatrix = np.asarray(self.proj_matrix).reshape([4,4],order='F')
+      viewMatrix = np.asarray(self.view_matrix).reshape([4,4],order='F')
+      tran_pix_world = np.linalg.inv(np.matmul(projectionMatrix, viewMatrix))
+      pixel_pos = np.mgrid[0:size, 0:size]
+      pixel_pos = pixel_pos/(size/2) - 1
+      pixel_pos = np.moveaxis(pixel_pos, 1, 2)
+      pixel_pos[1] = -pixel_pos[1]
+      pixel_pos = pixel_pos.reshape(2, -1)
+      # the homogeneous world position is linear in the pixel depth: grid + depth_column * z
+      self.pixel_grid = np.matmul(tran_pix_world[:, :2], pixel_pos) + tran_pix_world[:, 3:]
+      self.depth_column = tran_pix_world[:, 2:3]
+      self.pixel_grid_key = key
+    zs = 2*depth_img.reshape(1, -1) - 1
+    position = self.pixel_grid + self.depth_column * zs
+    return (position[:3] / position[3]).T
+
+  def getHeightmap(self, size):
+    return self.capture(size, ('heightmap',))['heightmap']
 
   def getRGBImg(self, size):
-    image_arr = pb.getCameraImage(width=size, height=size,
-                                  viewMatrix=self.view_matrix,
-                                  projectionMatrix=self.proj_matrix,
-                                  renderer=pb.ER_TINY_RENDERER)
-    rgb_img = np.moveaxis(image_arr[2][:, :, :3], 2, 0) / 255
-    return rgb_img
+    return self.capture(size, ('rgb',))['rgb']
 
   def getDepthImg(self, size):
-    image_arr = pb.getCameraImage(width=size, height=size,
-                                  viewMatrix=self.view_matrix,
-                                  projectionMatrix=self.proj_matrix,
-                                  renderer=pb.ER_TINY_RENDERER)
-    depth_img = np.array(image_arr[3])
-    depth = self.far * self.near / (self.far - (self.far - self.near) * depth_img)
-    return depth.reshape(size, size)
+    return self.capture(size, ('depth',))['depth']
 
   def getPointCloud(self, size, to_numpy=True):
-    image_arr = pb.getCameraImage(width=size, height=size,
-                                  viewMatrix=self.view_matrix,
-                                  projectionMatrix=self.proj_matrix,
-                                  renderer=pb.ER_TINY_RENDERER)
-    depthImg = np.asarray(image_arr[3])
-
-    # https://stackoverflow.com/questions/59128880/getting-world-coordinates-from-opengl-depth-buffer
-    projectionMatrix = np.asarray(self.proj_matrix).reshape([4,4],order='F')
-    viewMatrix = np.asarray(self.view_matrix).reshape([4,4],order='F')
-    tran_pix_world = np.linalg.inv(np.matmul(projectionMatrix, viewMatrix))
-    pixel_pos = np.mgrid[0:size, 0:size]
-    pixel_pos = pixel_pos/(size/2) - 1
-    pixel_pos = np.moveaxis(pixel_pos, 1, 2)
-    pixel_pos[1] = -pixel_pos[1]
-    zs = 2*depthImg.reshape(1, size, size) - 1
-    pixel_pos = np.concatenate((pixel_pos, zs))
-    pixel_pos = pixel_pos.reshape(3, -1)
-    augment = np.ones((1, pixel_pos.shape[1]))
-    pixel_pos = np.concatenate((pixel_pos, augment), axis=0)
-    position = np.matmul(tran_pix_world, pixel_pos)
-    pc = position / position[3]
-    points = pc.T[:, :3]
+    points = self.capture(size, ('point_cloud',))['point_cloud']
 
     # if to_numpy:
       # points = np.asnumpy(points)
-    return points
\ No newline at end of file
+    return points
@@ -0,0 +1,60 @@
+import pybullet as pb
+
+# Visual and collision shape indices of the loaded meshes, keyed by (mesh path, quantized scale, frame, client id)
+_mesh_shapes = dict()
+
+def quantizeScale(mesh_scale):
+  '''
+  Round a mesh scale to 4 significant digits so that nearly identical scales share their shapes.
+
+  Args:
+    mesh_scale (list[float]): The scale of the mesh along each axis
+
+  Returns:
+    tuple[float]: The quantized scale
+  '''
+  return tuple(float('{:.4g}'.format(s)) for s in mesh_scale)
+
+def getMeshShapes(file_path, mesh_scale, client_id=0, frame_position=(0, 0, 0), frame_orientation=(0, 0, 0, 1)):
+  '''
+  Get the visual and collision shapes of a mesh, creating them the first time the mesh is used with this scale
+  in the given physics client. The visual shape has no color, set it on the body with pb.changeVisualShape
+  instead since the shape is shared between all the bodies using it.
+
+  Args:
+    file_path (str): The path to the mesh file
+    mesh_scale (list[float]): The scale of the mesh along each axis
+    client_id (int): The pybullet physics client. Defaults to 0.
+    frame_position (list[float]): The position of the shapes in the body frame. Defaults to (0, 0, 0).
+    frame_orientation (list[float]): The orientation of the shapes in the body frame. Defaults to (0, 0, 0, 1).
+
+  Returns:
+    (int, int): The visual shape index and the collision shape index
+  '''
+  mesh_scale = quantizeScale(mesh_scale)
+  key = (file_path, mesh_scale, tuple(frame_position), tuple(frame_orientation), client_id)
+  if key not in _mesh_shapes:
+    visual_shape = pb.createVisualShape(pb.GEOM_MESH,
+                                        fileName=file_path,
+                                        meshScale=mesh_scale,
+                                        visualFramePosition=frame_position,
+                                        visualFrameOrientation=frame_orientation, physicsClientId=client_id)
+    collision_shape = pb.createCollisionShape(pb.GEOM_MESH,
+                                              fileName=file_path,
+                                              meshScale=mesh_scale,
+                                              collisionFramePosition=frame_position,
+                                              collisionFrameOrientation=frame_orientation, physicsClientId=client_id)
+    _mesh_shapes[key] = (visual_shape, collision_shape)
+  return _mesh_shapes[key]
+
+def clearShapeCache(client_id=None):
+  '''
+  Forget the cached shapes. Must be called whenever the physics client is reset (pb.resetSimulation) or
+  disconnected as the shape indices become invalid.
+
+  Args:
+    client_id (int): The physics client to clear the shapes of. Clears all clients if None. Defaults to None.
+  '''
+  for key in list(_mesh_shapes.keys()):
+    if client_id is None or key[-1] == client_id:
+      del _mesh_shapes[key]
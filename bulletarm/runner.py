@@ -3,89 +3,269 @@
 '''
 
 import numpy as np
-from multiprocessing import Process, Pipe
+from multiprocessing import Process, Pipe, connection
+from multiprocessing import shared_memory, resource_tracker
 import os
 import git
 import bulletarm
 from tqdm import tqdm
 import copy
 import time
+from collections import deque
 
-def worker(remote, parent_remote, env_fn, planner_fn=None):
+class SharedObservationBuffer(object):
   '''
-  Worker function which interacts with the environment over the remove connection
+  Preallocated observation, reward, and done flag slots for a set of environments stored in a single
+  block of shared memory. Each worker writes the results of its environment into its own slot and the
+  MultiRunner reads them back as zero-copy views of shape (num_envs, ...).
+
+  Args:
+    num_envs (int): Number of environments sharing the buffer
+    layout (list[(str, tuple, str)]): (field, shape, dtype) for each stored field of a single environment
+    name (str): Name of an existing shared memory block to attach to. Defaults to None, which creates
+      a new block.
+  '''
+  FIELDS = ['state', 'in_hand', 'obs', 'reward', 'done']
+  ALIGNMENT = 64
+
+  def __init__(self, num_envs, layout, name=None):
+    self.num_envs = num_envs
+    self.layout = layout
+
+    offsets = list()
+    size = 0
+    for field, shape, dtype in self.layout:
+      offsets.append(size)
+      nbytes = num_envs * int(np.prod(shape, dtype=int)) * np.dtype(dtype).itemsize
+      size += int(np.ceil(nbytes / self.ALIGNMENT) * self.ALIGNMENT)
+
+    if name is None:
+      self.shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+      self.owner = True
+    else:
+      self.shm = shared_memory.SharedMemory(name=name)
+      self.owner = False
+
+    self.arrays = dict()
+    for (field, shape, dtype), offset in zip(self.layout, offsets):
+      self.arrays[field] = np.ndarray((num_envs, *shape), dtype=dtype, buffer=self.shm.buf, offset=offset)
+
+  @classmethod
+  def fromObservation(cls, num_envs, obs):
+    '''
+    Create a new buffer with slots matching the shapes and dtypes of the given observation. Fields which
+    are None in the observation, i.e. the in-hand image for close-loop envs, are not stored.
+
+    Args:
+      num_envs (int): Number of environments sharing the buffer
+      obs ((numpy.array, numpy.array, numpy.array)): Sample (state, in_hand, obs) observation
+
+    Returns:
+      SharedObservationBuffer: The new buffer
+    '''
+    state, in_hand, obs = obs
+    layout = [('state', (), np.dtype(float).str)]
+    if in_hand is not None:
+      in_hand = np.asarray(in_hand)
+      layout.append(('in_hand', in_hand.shape, in_hand.dtype.str))
+    obs = np.asarray(obs)
+    layout.append(('obs', obs.shape, obs.dtype.str))
+    layout.append(('reward', (), np.dtype(float).str))
+    layout.append(('done', (), np.dtype(np.float32).str))
+    return cls(num_envs, layout)
+
+  def getSpec(self):
+    '''
+    Get the arguments required to attach to this buffer from another process.
+
+    Returns:
+      (int, list, str): (num_envs, layout, shared memory name)
+    '''
+    return self.num_envs, self.layout, self.shm.name
+
+  def write(self, idx, obs, reward=None, done=None):
+    '''
+    Write the results of a single environment into its slot.
+
+    Args:
+      idx (int): The index of the environment
+      obs ((numpy.array, numpy.array, numpy.array)): The (state, in_hand, obs) observation
+      reward (float): The reward. Defaults to None.
+      done (bool): The done flag. Defaults to None.
+    '''
+    state, in_hand, obs = obs
+    self.arrays['state'][idx] = state
+    if 'in_hand' in self.arrays:
+      self.arrays['in_hand'][idx] = in_hand
+    self.arrays['obs'][idx] = obs
+    if reward is not None:
+      self.arrays['reward'][idx] = reward
+    if done is not None:
+      self.arrays['done'][idx] = done
+
+  def read(self, idxs=None):
+    '''
+    Read the observations, rewards, and done flags of the environments. When reading all environments the
+    returned arrays are views into the shared memory and are overwritten by the next step or reset.
+
+    Args:
+      idxs (list[int]): The environments to read. Defaults to None, which reads all environments.
+
+    Returns:
+      ((numpy.array, numpy.array, numpy.array), numpy.array, numpy.array): ((states, hand_obs, obs), rewards, dones)
+    '''
+    def get(field):
+      return self.arrays[field] if idxs is None else self.arrays[field][idxs]
+
+    num = self.num_envs if idxs is None else len(idxs)
+    hand_obs = get('in_hand') if 'in_hand' in self.arrays else np.stack([None] * num)
+    return (get('state'), hand_obs, get('obs')), get('reward'), get('done')
+
+  def close(self):
+    '''
+    Release the shared memory. The block is destroyed if it was created by this buffer.
+    '''
+    self.arrays = dict()
+    self.shm.close()
+    if self.owner:
+      self.shm.unlink()
+
+def worker(remote, parent_remote, env_fns, planner_fns=None, reset_ahead=False):
+  '''
+  Worker function which interacts with one or more environments over the remote connection. Commands are
+  sent as (cmd, data) where data is a list of (env_idx, env_data) pairs for the targeted environments. The
+  targeted environments are run in turn and their results are sent back as a single list in the same order.
 
   Args:
     remote (multiprocessing.Connection): Worker remote connection
     parent_remote (multiprocessing.Connection): MultiRunner remote connection
-    env_fn (function): Creates a environment
-    planner_fn (function): Creates the planner for the environment
+    env_fns (list[function]): Creates the environments hosted by the worker
+    planner_fns (list[function]): Creates the planners for the environments
+    reset_ahead (bool): Keep a spare, already reset copy of each environment. Resets swap in the spare
+      copy and the used copy is reset after the results have been sent back.
   '''
   parent_remote.close()
 
-  env = env_fn()
-  if planner_fn:
-    planner = planner_fn(env)
-  else:
-    planner = None
+  envs = [env_fn() for env_fn in env_fns]
+  if planner_fns is None:
+    planner_fns = [None] * len(envs)
+  planners = [planner_fn(env) if planner_fn else None for env, planner_fn in zip(envs, planner_fns)]
+
+  # Spare copies of the environments and their reset observations, None until the spare has been reset
+  spare_envs, spare_planners, spare_obs = list(), list(), list()
+  if reset_ahead:
+    spare_envs = [env_fn() for env_fn in env_fns]
+    spare_planners = [planner_fn(env) if planner_fn else None for env, planner_fn in zip(spare_envs, planner_fns)]
+    spare_obs = [None] * len(envs)
+
+  # Environments sharing a process must not share the implicit default physics client
+  if len(envs) + len(spare_envs) > 1:
+    client_ids = [getattr(env, 'client_id', None) for env in envs + spare_envs]
+    if None in client_ids or len(set(client_ids)) != len(client_ids):
+      raise ValueError('Environments hosted by the same worker must each use their own physics client.')
+
+  # Shared observation buffer, only used if the runner is in shared memory mode
+  shared_obs = None
+  env_slots = [None] * len(envs)
+
+  def stepResult(env_idx, res):
+    if shared_obs is None:
+      return res
+    shared_obs.write(env_slots[env_idx], res[0], res[1], res[2])
+    return res[3:]
+
+  def obsResult(env_idx, obs):
+    if shared_obs is None:
+      return obs
+    shared_obs.write(env_slots[env_idx], obs)
+    return None
+
+  def resetEnv(env_idx):
+    if spare_obs and spare_obs[env_idx] is not None:
+      # Swap in the spare environment, the used environment becomes the spare and is reset later
+      envs[env_idx], spare_envs[env_idx] = spare_envs[env_idx], envs[env_idx]
+      planners[env_idx], spare_planners[env_idx] = spare_planners[env_idx], planners[env_idx]
+      obs, spare_obs[env_idx] = spare_obs[env_idx], None
+      return obs
+    return envs[env_idx].reset()
 
   try:
     while True:
       cmd, data = remote.recv()
-      if cmd == 'step':
-        res = env.step(data)
-        remote.send(res)
-      elif cmd == 'simulate':
-        res = env.simulate(data)
-        remote.send(res)
-      elif cmd == 'can_simulate':
-        remote.send(env.canSimulate())
-      elif cmd == 'reset_sim':
-        env.resetSimPose()
-      elif cmd == 'step_auto_reset':
-        res = env.step(data)
-        done = res[2]
-        if done:
-          # get observation after reset (res index 0), the rest stays the same
-          res = (env.reset(), *res[1:])
-        remote.send(res)
-      elif cmd == 'reset':
-        obs = env.reset()
-        remote.send(obs)
-      elif cmd == 'get_spaces':
-        remote.send((env.obs_shape, env.action_space, env.action_shape))
-      elif cmd == 'get_empty_in_hand':
-        remote.send(env.getEmptyInHand())
-      elif cmd == 'get_env_id':
-        remote.send(env.active_env_id)
-      elif cmd == 'get_next_action':
-        if planner:
-          remote.send(planner.getNextAction())
-        else:
-          raise ValueError('Attempting to use a planner which was not initialized.')
-      elif cmd == 'get_num_obj':
-        remote.send(env.num_obj)
-      elif cmd == 'save':
-        env.saveState()
-      elif cmd == 'restore':
-        env.restoreState()
-      elif cmd == 'save_to_file':
-        path = data
-        env.saveEnvToFile(path)
-      elif cmd == 'load_from_file':
-        try:
-          path = data
-          env.loadEnvFromFile(path)
-        except Exception as e:
-          print('MultiRunner worker load failed: {}'.format(e))
-          remote.send(False)
-        else:
-          remote.send(True)
-      elif cmd == 'close':
+      if cmd == 'close':
+        if shared_obs is not None:
+          shared_obs.close()
         remote.close()
         break
-      else:
-        raise NotImplementerError
+      elif cmd == 'attach_shared_memory':
+        for env_idx, (env_slot, spec) in data:
+          env_slots[env_idx] = env_slot
+          if shared_obs is None:
+            shared_obs = SharedObservationBuffer(*spec)
+        continue
+
+      results = list()
+      for env_idx, env_data in data:
+        env, planner = envs[env_idx], planners[env_idx]
+        if cmd == 'step':
+          res = env.step(env_data)
+          results.append(stepResult(env_idx, res))
+        elif cmd == 'simulate':
+          # simulate is a query, its result is sent through the pipe to keep the observations in shared memory intact
+          results.append(env.simulate(env_data))
+        elif cmd == 'can_simulate':
+          results.append(env.canSimulate())
+        elif cmd == 'reset_sim':
+          env.resetSimPose()
+        elif cmd == 'step_auto_reset':
+          res = env.step(env_data)
+          done = res[2]
+          if done:
+            # get observation after reset (res index 0), the rest stays the same
+            res = (resetEnv(env_idx), *res[1:])
+          results.append(stepResult(env_idx, res))
+        elif cmd == 'reset':
+          obs = resetEnv(env_idx)
+          results.append(obsResult(env_idx, obs))
+        elif cmd == 'get_spaces':
+          results.append((env.obs_shape, env.action_space, env.action_shape))
+        elif cmd == 'get_empty_in_hand':
+          results.append(env.getEmptyInHand())
+        elif cmd == 'get_env_id':
+          results.append(env.active_env_id)
+        elif cmd == 'get_next_action':
+          if planner:
+            results.append(planner.getNextAction())
+          else:
+            raise ValueError('Attempting to use a planner which was not initialized.')
+        elif cmd == 'get_num_obj':
+          results.append(env.num_obj)
+        elif cmd == 'save':
+          env.saveState()
+        elif cmd == 'restore':
+          env.restoreState()
+        elif cmd == 'save_to_file':
+          path = env_data
+          env.saveEnvToFile(path)
+        elif cmd == 'load_from_file':
+          try:
+            path = env_data
+            env.loadEnvFromFile(path)
+          except Exception as e:
+            print('MultiRunner worker load failed: {}'.format(e))
+            results.append(False)
+          else:
+            results.append(True)
+        else:
+          raise NotImplementedError
+
+      if cmd not in MultiRunner.NO_REPLY_CMDS:
+        remote.send(results)
+
+      # Prepare the next episodes while the runner is busy with the results
+      for env_idx in range(len(spare_obs)):
+        if spare_obs[env_idx] is None:
+          spare_obs[env_idx] = spare_envs[env_idx].reset()
   except KeyboardInterrupt:
     print('MultiRunner worker: caught keyboard interrupt')
 
@@ -96,23 +276,106 @@ class MultiRunner(object):
   Args:
     env_fns (list[function]): Env creation functions
     planner_fns (list[function]): Planner creation functions
+    shared_memory (bool): Transfer observations, rewards, and done flags through a block of shared memory
+      instead of pickling them through the pipes. The buffer is allocated on the first call to reset.
+      Returned arrays are then views into the shared memory which are overwritten by the next step or
+      reset and must be copied if they need to be kept. Defaults to False.
+    envs_per_worker (int): Number of environments hosted by each subprocess. Environments in the same
+      subprocess are stepped one after another, each on its own physics client. These environments share
+      the numpy random state of the subprocess, so seeded runs differ from runs with one environment per
+      subprocess. Defaults to 1.
+    reset_ahead (bool): Keep a spare copy of each environment in its subprocess which is reset while the
+      runner is busy. Resets, including automatic resets after an episode ends, swap in the spare copy
+      instead of resetting the environment and the used copy is reset after the results have been sent.
+      Doubles the number of simulations and does not support rendering. The environments behind an index
+      change on resets, so save and restore are not supported either. Defaults to False.
   '''
-  def __init__(self, env_fns, planner_fns):
+  # Worker commands which do not send back a result
+  NO_REPLY_CMDS = ('reset_sim', 'save', 'restore', 'save_to_file')
+
+  def __init__(self, env_fns, planner_fns, shared_memory=False, envs_per_worker=1, reset_ahead=False):
     self.waiting = False
     self.closed = False
-
-    num_envs = len(env_fns)
-    self.remotes, self.worker_remotes = zip(*[Pipe() for _ in range(num_envs)])
-    self.processes = [Process(target=worker, args=(worker_remote, remote, env_fn, planner_fn))
-                      for (worker_remote, remote, env_fn, planner_fn) in zip(self.worker_remotes, self.remotes, env_fns, planner_fns)]
+    self.shared_memory = shared_memory
+    self.shared_obs = None
+    self.reset_ahead = reset_ahead
+
+    # Workers must share the resource tracker of this process, otherwise the shared memory block is
+    # destroyed as soon as the first worker exits
+    if self.shared_memory:
+      resource_tracker.ensure_running()
+
+    # Assign each environment to a (worker, local index) slot
+    self.num_envs = len(env_fns)
+    self.envs_per_worker = envs_per_worker
+    self.env_slots = [(i // envs_per_worker, i % envs_per_worker) for i in range(self.num_envs)]
+    worker_env_fns = [env_fns[i:i+envs_per_worker] for i in range(0, self.num_envs, envs_per_worker)]
+    worker_planner_fns = [planner_fns[i:i+envs_per_worker] for i in range(0, self.num_envs, envs_per_worker)]
+
+    num_workers = len(worker_env_fns)
+    self.remotes, self.worker_remotes = zip(*[Pipe() for _ in range(num_workers)])
+    self.processes = [Process(target=worker, args=(worker_remote, remote, env_fn, planner_fn, reset_ahead))
+                      for (worker_remote, remote, env_fn, planner_fn) in zip(self.worker_remotes, self.remotes, worker_env_fns, worker_planner_fns)]
     self.num_processes = len(self.processes)
 
+    # Step results in flight for each worker, in the order they were sent, and step results which have been
+    # received but not yet returned
+    self.pending = [deque() for _ in range(self.num_processes)]
+    self.completed = list()
+    self.stepping = set()
+
     for process in self.processes:
       process.daemon = True
       process.start()
     for remote in self.worker_remotes:
       remote.close()
 
+  def _sendCommand(self, cmd, data=None, env_nums=None):
+    '''
+    Send a command to the given environments. Commands for environments hosted by the same worker
+    are sent together in a single message.
+
+    Args:
+      cmd (str): The command to send
+      data (list): The data for each environment. Defaults to None.
+      env_nums (list[int]): The environments to send the command to. Defaults to None, which sends
+        the command to all environments.
+
+    Returns:
+      (list[int], dict): The request used to receive the results, (env_nums, worker env_nums)
+    '''
+    env_nums = list(range(self.num_envs)) if env_nums is None else list(env_nums)
+    if data is None:
+      data = [None] * len(env_nums)
+
+    worker_env_nums = dict()
+    worker_data = dict()
+    for env_num, env_data in zip(env_nums, data):
+      worker_idx, env_idx = self.env_slots[env_num]
+      worker_env_nums.setdefault(worker_idx, []).append(env_num)
+      worker_data.setdefault(worker_idx, []).append((env_idx, env_data))
+    for worker_idx in worker_data:
+      self.remotes[worker_idx].send((cmd, worker_data[worker_idx]))
+
+    return env_nums, worker_env_nums
+
+  def _recvResults(self, request):
+    '''
+    Receive the results of a command sent with _sendCommand.
+
+    Args:
+      request ((list[int], dict)): The request returned by _sendCommand
+
+    Returns:
+      list: The result of each environment, in the order the environments were given to _sendCommand
+    '''
+    env_nums, worker_env_nums = request
+    results = dict()
+    for worker_idx, nums in worker_env_nums.items():
+      self._drainPending(worker_idx)
+      results.update(zip(nums, self.remotes[worker_idx].recv()))
+    return [results[env_num] for env_num in env_nums]
+
   def step(self, actions, auto_reset=False):
     '''
     Step the environments synchronously.
@@ -128,10 +391,7 @@ class MultiRunner(object):
     return self.stepWait()
 
   def simulate(self, actions):
-    for remote, action in zip(self.remotes, actions):
-      remote.send(('simulate', action))
-
-    obs = [remote.recv() for remote in self.remotes]
+    obs = self._recvResults(self._sendCommand('simulate', actions))
     states, hand_obs, obs = zip(*obs)
 
     states = np.stack(states).astype(float)
@@ -143,40 +403,150 @@ class MultiRunner(object):
     return (states, hand_obs, obs), rewards, dones
 
   def canSimulate(self):
-    for remote in self.remotes:
-      remote.send(('can_simulate', None))
-    flag = [remote.recv() for remote in self.remotes]
+    flag = self._recvResults(self._sendCommand('can_simulate'))
     flag = np.stack(flag)
     return flag
 
   def resetSimPose(self):
-    for remote in self.remotes:
-      remote.send(('reset_sim', None))
+    self._sendCommand('reset_sim')
 
-  def stepAsync(self, actions, auto_reset=False):
+  def stepAsync(self, actions, auto_reset=False, env_nums=None):
     '''
-    Step each environment in a async fashion.
+    Step each environment in a async fashion. The results are collected with stepWait or stepAny.
 
     Args:
       actions (numpy.array): Actions to take in each environment
       auto_reset (bool): Reset environments automatically after an episode ends
+      env_nums (list[int]): The environments to step. Defaults to None, which steps all environments.
     '''
-    for remote, action in zip(self.remotes, actions):
-      if auto_reset:
-        remote.send(('step_auto_reset', action))
-      else:
-        remote.send(('step', action))
+    env_nums = list(range(self.num_envs)) if env_nums is None else list(env_nums)
+    self._checkNotStepping(env_nums, 'step')
+
+    cmd = 'step_auto_reset' if auto_reset else 'step'
+    _, worker_env_nums = self._sendCommand(cmd, actions, env_nums)
+    for worker_idx, nums in worker_env_nums.items():
+      self.pending[worker_idx].append(nums)
+    self.stepping.update(env_nums)
     self.waiting = True
 
+  def _checkNotStepping(self, env_nums, action):
+    '''
+    Check that none of the given environments has a step in flight or a step result which has not been collected.
+
+    Args:
+      env_nums (list[int]): The environments
+      action (str): The action attempted on the environments, used in the error message
+    '''
+    busy = self.stepping.intersection(env_nums)
+    if busy:
+      raise ValueError('Attempting to {} environments {} whose previous step has not been collected.'.format(action, sorted(busy)))
+
   def stepWait(self):
     '''
-    Wait until each environment has completed its next step.
+    Wait until each stepping environment has completed its next step.
+
+    Returns:
+      (numpy.array, numpy.array, numpy.array): (observations, rewards, done flags) ordered by environment
+    '''
+    if not self.stepping:
+      raise ValueError('Attempting to wait on environments but no environment is stepping.')
+    for worker_idx in range(self.num_processes):
+      self._drainPending(worker_idx)
+    env_nums, results = self._collectCompleted()
+    return self._stackStepResults(env_nums, results)
+
+  def stepAny(self, timeout=None):
+    '''
+    Wait until at least one stepping environment has completed its next step. This allows new actions
+    to be sent to fast environments while slow environments are still stepping.
+
+    Args:
+      timeout (float): Maximum number of seconds to wait. Defaults to None, which waits indefinitely.
+
+    Returns:
+      (numpy.array, numpy.array, numpy.array, numpy.array): (observations, rewards, done flags, env nums)
+        for the environments which have completed their step, or None if the timeout expired first.
+    '''
+    if not self.completed:
+      busy_remotes = [self.remotes[worker_idx] for worker_idx in range(self.num_processes) if self.pending[worker_idx]]
+      if not busy_remotes:
+        raise ValueError('Attempting to wait on environments but no environment is stepping.')
+      for remote in connection.wait(busy_remotes, timeout):
+        self._recvPending(self.remotes.index(remote))
+    if not self.completed:
+      return None
+
+    env_nums, results = self._collectCompleted()
+    return (*self._stackStepResults(env_nums, results), np.array(env_nums))
+
+  def poll(self):
+    '''
+    Check which stepping environments have completed their step without blocking.
+
+    Returns:
+      list[int]: The environments whose step results are ready to be collected with stepAny
+    '''
+    busy_remotes = [self.remotes[worker_idx] for worker_idx in range(self.num_processes) if self.pending[worker_idx]]
+    for remote in connection.wait(busy_remotes, 0):
+      self._recvPending(self.remotes.index(remote))
+    return sorted(env_num for env_nums, _ in self.completed for env_num in env_nums)
+
+  def _recvPending(self, worker_idx):
+    '''
+    Receive the oldest pending step results of a worker and store them until they are collected.
+
+    Args:
+      worker_idx (int): The worker to receive from
+    '''
+    env_nums = self.pending[worker_idx].popleft()
+    self.completed.append((env_nums, self.remotes[worker_idx].recv()))
+
+  def _drainPending(self, worker_idx):
+    '''
+    Receive all pending step results of a worker. Must be called before receiving the results of any
+    other command from the worker, as the worker replies in order.
+
+    Args:
+      worker_idx (int): The worker to receive from
+    '''
+    while self.pending[worker_idx]:
+      self._recvPending(worker_idx)
+
+  def _collectCompleted(self):
+    '''
+    Remove all received step results, marking their environments as available to step again.
+
+    Returns:
+      (list[int], list): (env nums, step results) sorted by environment
+    '''
+    completed = sorted((env_num, res) for env_nums, results in self.completed for env_num, res in zip(env_nums, results))
+    self.completed = list()
+    env_nums = [env_num for env_num, _ in completed]
+    self.stepping.difference_update(env_nums)
+    self.waiting = bool(self.stepping)
+    return env_nums, [res for _, res in completed]
+
+  def _stackStepResults(self, env_nums, results):
+    '''
+    Stack the step results of the given environments into batched arrays.
+
+    Args:
+      env_nums (list[int]): The environments which were stepped
+      results (list): The step result of each environment
 
     Returns:
       (numpy.array, numpy.array, numpy.array): (observations, rewards, done flags)
     '''
-    results = [remote.recv() for remote in self.remotes]
-    self.waiting = False
+    if self.shared_obs is not None:
+      if env_nums == list(range(self.num_envs)):
+        obs, rewards, dones = self.shared_obs.read()
+      else:
+        obs, rewards, dones = self.shared_obs.read(env_nums)
+      metadata = tuple(r[0] for r in results) if results[0] else None
+      if metadata:
+        return obs, rewards, dones, metadata
+      else:
+        return obs, rewards, dones
 
     res = tuple(zip(*results))
 
@@ -206,10 +576,13 @@ class MultiRunner(object):
     Returns:
       numpy.array: Observations
     '''
-    for remote in self.remotes:
-      remote.send(('reset', None))
+    self._checkNotStepping(range(self.num_envs), 'reset')
+    obs = self._recvResults(self._sendCommand('reset'))
+    if self.shared_obs is not None:
+      return self.shared_obs.read()[0]
+    if self.shared_memory:
+      self._attachSharedMemory(obs[0])
 
-    obs = [remote.recv() for remote in self.remotes]
     states, hand_obs, obs = zip(*obs)
 
     states = np.stack(states).astype(float)
@@ -218,6 +591,17 @@ class MultiRunner(object):
 
     return (states, hand_obs, obs)
 
+  def _attachSharedMemory(self, obs):
+    '''
+    Allocate the shared observation buffer using the given observation and attach each worker to it.
+
+    Args:
+      obs ((numpy.array, numpy.array, numpy.array)): Sample (state, in_hand, obs) observation
+    '''
+    self.shared_obs = SharedObservationBuffer.fromObservation(self.num_envs, obs)
+    spec = self.shared_obs.getSpec()
+    self._sendCommand('attach_shared_memory', [(i, spec) for i in range(self.num_envs)])
+
   def reset_envs(self, env_nums):
     '''
     Resets the specified environments.
@@ -228,11 +612,11 @@ class MultiRunner(object):
     Returns:
       numpy.array: Observations
     '''
+    self._checkNotStepping(env_nums, 'reset')
+    obs = self._recvResults(self._sendCommand('reset', env_nums=env_nums))
+    if self.shared_obs is not None:
+      return self.shared_obs.read(list(env_nums))[0]
 
-    for env_num in env_nums:
-      self.remotes[env_num].send(('reset', None))
-
-    obs = [self.remotes[env_num].recv() for env_num in env_nums]
     states, hand_obs, obs = zip(*obs)
 
     states = np.stack(states).astype(float)
@@ -246,24 +630,29 @@ class MultiRunner(object):
     Close all worker processes.
     '''
     self.closed = True
-    if self.waiting:
-      [remote.recv() for remote in self.remotes]
+    for worker_idx in range(self.num_processes):
+      self._drainPending(worker_idx)
     [remote.send(('close', None)) for remote in self.remotes]
     [process.join() for process in self.processes]
+    if self.shared_obs is not None:
+      self.shared_obs.close()
+      self.shared_obs = None
 
   def save(self):
     '''
     Locally saves the current state of the environments.
     '''
-    for remote in self.remotes:
-      remote.send(('save', None))
+    if self.reset_ahead:
+      raise ValueError('Saving the environment states is not supported with reset_ahead.')
+    self._sendCommand('save')
 
   def restore(self):
     '''
     Restores the locally saved state of the environments.
     '''
-    for remote in self.remotes:
-      remote.send(('restore', None))
+    if self.reset_ahead:
+      raise ValueError('Restoring the environment states is not supported with reset_ahead.')
+    self._sendCommand('restore')
 
   def saveToFile(self, path):
     '''
@@ -272,11 +661,13 @@ class MultiRunner(object):
     Args:
       path (str): The path to save the enviornment states to
     '''
-    for i, remote in enumerate(self.remotes):
+    paths = list()
+    for i in range(self.num_envs):
       p = os.path.join(path, str(i))
       if not os.path.exists(p):
         os.makedirs(p)
-      remote.send(('save_to_file', os.path.join(path, str(i))))
+      paths.append(p)
+    self._sendCommand('save_to_file', paths)
 
   def loadFromFile(self, path):
     '''
@@ -288,20 +679,21 @@ class MultiRunner(object):
     Returns:
       bool: Flag indicating if the loading succeeded for all environments
     '''
-    for i, remote in enumerate(self.remotes):
-      remote.send(('load_from_file', os.path.join(path, str(i))))
-    return np.array([remote.recv() for remote in self.remotes]).all()
+    paths = [os.path.join(path, str(i)) for i in range(self.num_envs)]
+    return np.array(self._recvResults(self._sendCommand('load_from_file', paths))).all()
 
-  def getNextAction(self):
+  def getNextAction(self, env_nums=None):
     '''
     Get the next action from the planner for each environment.
 
+    Args:
+      env_nums (list[int]): The environments to get actions for. Defaults to None, which gets actions
+        for all environments.
+
     Returns:
       numpy.array: Actions
     '''
-    for remote in self.remotes:
-      remote.send(('get_next_action', None))
-    action = [remote.recv() for remote in self.remotes]
+    action = self._recvResults(self._sendCommand('get_next_action', env_nums=env_nums))
     action = np.stack(action)
     return action
 
@@ -309,9 +701,7 @@ class MultiRunner(object):
     '''
 
     '''
-    for remote in self.remotes:
-      remote.send(('get_empty_in_hand', None))
-    hand_obs = [remote.recv() for remote in self.remotes]
+    hand_obs = self._recvResults(self._sendCommand('get_empty_in_hand'))
     hand_obs = np.stack(hand_obs)
     return hand_obs
 
@@ -328,8 +718,7 @@ class MultiRunner(object):
     Get the number of objects in the environment
     Returns: int: number of objects
     '''
-    self.remotes[0].send(('get_num_obj', None))
-    num_obj = self.remotes[0].recv()
+    num_obj = self._recvResults(self._sendCommand('get_num_obj', env_nums=[0]))[0]
     return num_obj
 
   def gatherDeconstructTransitions(self, planner_episode):
@@ -342,7 +731,7 @@ class MultiRunner(object):
     Returns: list of transitions. Each transition is in the form of
     ((state, in_hand, obs), action, reward, done, (next_state, next_in_hand, next_obs))
     '''
-    num_processes = self.num_processes
+    num_processes = self.num_envs
     num_objects = self.getNumObj()
     def states_valid(states_list):
       if len(states_list) < 2:
@@ -366,7 +755,8 @@ class MultiRunner(object):
         obss.append((o.squeeze(), in_hand[i].squeeze()))
       return obss
 
-    states, in_hands, obs = self.reset()
+    # with shared memory, the results of reset and step are views of the shared buffers that the next step overwrites
+    states, in_hands, obs = map(np.copy, self.reset())
     total = 0
     s = 0
     step_times = []
@@ -384,6 +774,7 @@ class MultiRunner(object):
       actions_star = np.concatenate((plan_actions, np.expand_dims(states, 1)), axis=1)
       t0 = time.time()
       (states_, in_hands_, obs_), rewards, dones = self.step(actions_star, auto_reset=False)
+      states_, in_hands_, obs_, dones = map(np.copy, (states_, in_hands_, obs_, dones))
       dones[states + states_ != 1] = 1
       t = time.time()-t0
       step_times.append(t)
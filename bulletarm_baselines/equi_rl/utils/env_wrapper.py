@@ -1,5 +1,16 @@
+import numpy as np
 import torch
 from bulletarm import env_factory
+from bulletarm.pybullet.utils.constants import OBS_DTYPE_SCALE
+
+def obsToTensor(obs):
+    '''
+    Convert the observations of the runner to a float tensor. The observations keep the obs_dtype of the env through
+    the runner, quantized observations are scaled back to meters here.
+    '''
+    if obs.dtype.name in OBS_DTYPE_SCALE:
+        return torch.from_numpy(obs.astype(np.float32) * np.float32(OBS_DTYPE_SCALE[obs.dtype.name]))
+    return torch.tensor(obs).float()
 
 class EnvWrapper:
     def __init__(self, num_processes, env, env_config, planner_config):
@@ -8,7 +19,7 @@ class EnvWrapper:
     def reset(self):
         (states, in_hands, obs) = self.envs.reset()
         states = torch.tensor(states).float()
-        obs = torch.tensor(obs).float()
+        obs = obsToTensor(obs)
         return states, obs
 
     def getNextAction(self):
@@ -18,30 +29,41 @@ class EnvWrapper:
         actions = actions.cpu().numpy()
         (states_, in_hands_, obs_), rewards, dones = self.envs.step(actions, auto_reset)
         states_ = torch.tensor(states_).float()
-        obs_ = torch.tensor(obs_).float()
+        obs_ = obsToTensor(obs_)
         rewards = torch.tensor(rewards).float()
         dones = torch.tensor(dones).float()
         return states_, obs_, rewards, dones
 
-    def stepAsync(self, actions, auto_reset=False):
+    def stepAsync(self, actions, auto_reset=False, env_nums=None):
         actions = actions.cpu().numpy()
-        self.envs.stepAsync(actions, auto_reset)
+        self.envs.stepAsync(actions, auto_reset, env_nums)
 
     def stepWait(self):
         (states_, in_hands_, obs_), rewards, dones = self.envs.stepWait()
         states_ = torch.tensor(states_).float()
-        obs_ = torch.tensor(obs_).float()
+        obs_ = obsToTensor(obs_)
         rewards = torch.tensor(rewards).float()
         dones = torch.tensor(dones).float()
         return states_, obs_, rewards, dones
 
+    def stepAny(self, timeout=None):
+        res = self.envs.stepAny(timeout)
+        if res is None:
+            return None
+        (states_, in_hands_, obs_), rewards, dones, env_nums = res
+        states_ = torch.tensor(states_).float()
+        obs_ = obsToTensor(obs_)
+        rewards = torch.tensor(rewards).float()
+        dones = torch.tensor(dones).float()
+        return states_, obs_, rewards, dones, env_nums
+
     def getStepLeft(self):
         return torch.tensor(self.envs.getStepsLeft()).float()
 
     def reset_envs(self, env_nums):
         states, in_hands, obs = self.envs.reset_envs(env_nums)
         states = torch.tensor(states).float()
-        obs = torch.tensor(obs).float()
+        obs = obsToTensor(obs)
         return states, obs
 
     def close(self):
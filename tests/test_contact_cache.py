@@ -0,0 +1,27 @@
+import unittest
+import pybullet as pb
+import pybullet_data
+
+from bulletarm.pybullet.utils import pybullet_util
+
+class TestContactCache(unittest.TestCase):
+  def testContactCache(self):
+    client_id = pb.connect(pb.DIRECT)
+    pb.setAdditionalSearchPath(pybullet_data.getDataPath(), physicsClientId=client_id)
+    pb.setGravity(0, 0, -10, physicsClientId=client_id)
+    plane_id = pb.loadURDF('plane.urdf', physicsClientId=client_id)
+    cube_id = pb.loadURDF('cube_small.urdf', [0, 0, 0.1], physicsClientId=client_id)
+    pybullet_util.stepSimulation(client_id)
+    contact_points = pybullet_util.getContactPoints(cube_id, client_id)
+    self.assertEqual(len(contact_points), 0)
+
+    for _ in range(200):
+      pybullet_util.stepSimulation(client_id)
+    contact_points = pybullet_util.getContactPoints(cube_id, client_id)
+    self.assertEqual(contact_points, pb.getContactPoints(bodyA=cube_id, physicsClientId=client_id))
+    self.assertTrue(contact_points and all(p[1] == cube_id and p[2] == plane_id for p in contact_points))
+    # Cached until the world changes
+    self.assertIs(pybullet_util.getContactPoints(cube_id, client_id), contact_points)
+    pybullet_util.markWorldChanged(client_id)
+    self.assertIsNot(pybullet_util.getContactPoints(cube_id, client_id), contact_points)
+    pb.disconnect(client_id)
@@ -0,0 +1,21 @@
+import unittest
+import numpy as np
+
+from bulletarm import env_factory
+from bulletarm.envs.close_loop_envs import close_loop_env
+
+class TestGripperMask(unittest.TestCase):
+  def testCachedMasks(self):
+    env = env_factory.createEnvs(0, 'close_loop_block_picking', {'seed': 0, 'view_type': 'camera_center_xyz'})
+    env.reset()
+    mask = env.env._getGripperMask(1, np.pi/4)
+    self.assertFalse(mask.flags.writeable)
+    # rotations within the same bin share the mask
+    self.assertIs(env.env._getGripperMask(1, np.pi/4 + 1e-4), mask)
+    self.assertIsNot(env.env._getGripperMask(0.5, np.pi/4), mask)
+    self.assertTrue(np.array_equal(env.env.getGripperImg(1, np.pi/4), mask.astype(float)))
+    # the fingers of an open gripper are further apart
+    self.assertGreater(np.ptp(np.nonzero(env.env._getGripperMask(1, 0))[0]),
+                       np.ptp(np.nonzero(env.env._getGripperMask(0, 0))[0]))
+    self.assertLessEqual(len(close_loop_env._gripper_masks), close_loop_env.GRIPPER_MASK_CACHE_SIZE)
+    env.close()
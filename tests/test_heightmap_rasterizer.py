@@ -0,0 +1,32 @@
+import unittest
+import numpy as np
+import pybullet as pb
+import pybullet_data
+
+from bulletarm import env_factory
+
+class TestHeightmapRasterizer(unittest.TestCase):
+  env_config = {'seed': 0, 'heightmap_backend': 'analytic'}
+
+  def testMatchCamera(self):
+    env = env_factory.createEnvs(0, 'house_building_3', self.env_config)
+    env.reset()
+    client_id = env.env.client_id
+    rasterizer = env.env.heightmap_rasterizer
+    for i in range(5):
+      for obj in env.env.objects:
+        pos = list(np.random.uniform(env.env.workspace[:2, 0] + 0.05, env.env.workspace[:2, 1] - 0.05)) + \
+              [np.random.uniform(0.02, 0.2)]
+        rot = pb.getQuaternionFromEuler(np.random.uniform(-np.pi, np.pi, 3))
+        pb.resetBasePositionAndOrientation(obj.object_id, pos, rot, physicsClientId=client_id)
+      self.assertTrue(rasterizer.canRasterize(env.env.objects, ignore_ids=[env.env.table_id]))
+      heightmap = rasterizer.getHeightmap(env.env.objects)
+      camera_heightmap = env.env.sensor.getHeightmap(env.env.heightmap_size)
+      self.assertLess(np.mean(np.abs(heightmap - camera_heightmap) > 0.005), 0.001)
+
+    # an unknown body in the view requires the camera
+    pb.setAdditionalSearchPath(pybullet_data.getDataPath(), physicsClientId=client_id)
+    pb.loadURDF('cube_small.urdf', [env.env.workspace[0].mean(), env.env.workspace[1].mean(), 0.3],
+                physicsClientId=client_id)
+    self.assertFalse(rasterizer.canRasterize(env.env.objects, ignore_ids=[env.env.table_id]))
+    env.close()
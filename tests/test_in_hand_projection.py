@@ -0,0 +1,41 @@
+import unittest
+import numpy as np
+from scipy.ndimage import median_filter
+
+from bulletarm.pybullet.utils import in_hand_projection
+from bulletarm.pybullet.utils.in_hand_projection import InHandProjector
+
+class TestInHandProjection(unittest.TestCase):
+  def testMedianFilter(self):
+    occupancy = np.random.rand(24, 24, 24) < 0.4
+    expected = np.ceil(median_filter(occupancy.astype(float), size=2))
+    self.assertTrue(np.array_equal(InHandProjector.medianFilter(occupancy), expected > 0))
+
+  def testRotationTables(self):
+    in_hand_projection._rotation_tables.clear()
+    projector = InHandProjector(24)
+    crop = np.zeros((24, 24))
+    crop[8:16, 10:14] = 0.05
+    # the identity rotation keeps the occupancy grid, except for the first slices which fall out of the grid
+    projection = projector.project(crop, 0.05, (0, 0, 0), 0.004)
+    occupancy = crop.reshape(24, 24, 1) > 0.05 + (np.arange(24) - 12) * 0.004
+    occupancy[0] = occupancy[:, 0] = occupancy[:, :, 0] = False
+    occupancy = InHandProjector.medianFilter(occupancy)
+    self.assertTrue(np.array_equal(projection, np.stack((occupancy.sum(0), occupancy.sum(1), occupancy.sum(2)))))
+
+    # a rotation by pi/2 around z only rotates the top-down projection
+    rotated = projector.project(crop, 0.05, (0, 0, np.pi/2), 0.004)
+    self.assertEqual(np.count_nonzero(rotated[2]), np.count_nonzero(projection[2]))
+    self.assertEqual(projector.misses, 2)
+
+    # rotations within the same bin share the table, which is shared with the other projectors of the same size
+    table = projector.getRotationTable((0, 0, np.pi/2))
+    self.assertEqual(table.dtype, np.int32)
+    self.assertFalse(table.flags.writeable)
+    self.assertIs(projector.getRotationTable((0, 0, np.pi/2 + 1e-3)), table)
+    self.assertEqual(projector.hits, 2)
+    self.assertIs(InHandProjector(24).getRotationTable((0, 0, np.pi/2)), table)
+    self.assertIsNot(InHandProjector(16).getRotationTable((0, 0, np.pi/2)), table)
+    self.assertIsNot(projector.getRotationTable((0, 0, np.pi/2 + np.deg2rad(in_hand_projection.ROTATION_TABLE_STEP))),
+                     table)
+    self.assertLessEqual(len(in_hand_projection._rotation_tables), in_hand_projection.ROTATION_TABLE_CACHE_SIZE)
@@ -0,0 +1,133 @@
+import unittest
+import numpy as np
+
+from bulletarm import env_factory
+from bulletarm.pybullet.utils.constants import OBS_DTYPE_SCALE
+
+class TestMultiRunner(unittest.TestCase):
+  env_config = {'num_objects': 3, 'render': False, 'seed': 0}
+  planner_config = {'random_orientation': True}
+
+  def runEpisodes(self, runner_config, num_processes=2, num_steps=8, env_config=None):
+    env_config = dict(self.env_config, **(env_config or {}))
+    env = env_factory.createEnvs(num_processes, 'block_stacking', env_config, self.planner_config, runner_config)
+    results = [env.reset()]
+    for _ in range(num_steps):
+      (states_, in_hands_, obs_), rewards, dones = env.step(env.getNextAction(), auto_reset=True)
+      results.append((np.copy(states_), np.copy(in_hands_), np.copy(obs_), np.copy(rewards), np.copy(dones)))
+    env.close()
+    return results
+
+  def testSharedMemory(self):
+    expected = self.runEpisodes({})
+    results = self.runEpisodes({'shared_memory': True})
+    for res, exp in zip(results, expected):
+      for r, e in zip(res, exp):
+        self.assertEqual(r.shape, e.shape)
+        self.assertTrue(np.allclose(r, e))
+
+  def testSimulateKeepsObservation(self):
+    env = env_factory.createEnvs(2, 'close_loop_block_picking', {'num_objects': 1, 'render': False, 'seed': 0},
+                                 self.planner_config, {'shared_memory': True})
+    env.reset()
+    (states_, in_hands_, obs_), rewards, dones = env.step(env.getNextAction())
+    expected = np.copy(obs_)
+    env.resetSimPose()
+    actions = env.getNextAction()
+    actions[:, 1:4] = 0.05
+    (sim_states, _, sim_obs), _, _ = env.simulate(actions)
+    self.assertEqual(sim_obs.shape, obs_.shape)
+    self.assertFalse(np.allclose(sim_obs, expected))
+    self.assertTrue(np.array_equal(obs_, expected))
+    env.close()
+
+  def testObsDtype(self):
+    expected = self.runEpisodes({})
+    for obs_dtype in ['float16', 'uint16', 'uint8']:
+      results = self.runEpisodes({'shared_memory': True}, env_config={'obs_dtype': obs_dtype})
+      scale = OBS_DTYPE_SCALE.get(obs_dtype, 1)
+      for res, exp in zip(results, expected):
+        self.assertEqual(res[2].dtype, np.dtype(obs_dtype))
+        tolerance = 1e-3 if obs_dtype == 'float16' else scale / 2 + 1e-9
+        self.assertTrue(np.all(np.abs(res[2] * scale - np.clip(exp[2], 0, None)) <= tolerance))
+    # the depths relative to the gripper can be negative
+    with self.assertRaises(AssertionError):
+      env_factory.createEnvs(0, 'close_loop_block_picking', dict(self.env_config, obs_dtype='uint8'))
+    env = env_factory.createEnvs(0, 'close_loop_block_picking', dict(self.env_config, obs_dtype='uint8',
+                                                                      view_type='camera_center_xyz_height'))
+    self.assertEqual(env.reset()[2].dtype, np.uint8)
+    env.close()
+
+  def testDeconstructTransitions(self):
+    transitions = []
+    for runner_config in [{}, {'shared_memory': True}]:
+      env = env_factory.createEnvs(2, 'block_stacking_deconstruct', self.env_config, self.planner_config, runner_config)
+      transitions.append(env.gatherDeconstructTransitions(2))
+      env.close()
+    expected, results = transitions
+    self.assertEqual(len(results), len(expected))
+    self.assertGreater(len(results), 0)
+    for res, exp in zip(results, expected):
+      for r, e in zip(res[0] + res[4] + res[1:4], exp[0] + exp[4] + exp[1:4]):
+        self.assertTrue(np.allclose(r, e))
+
+  def testEnvsPerWorker(self):
+    expected = self.runEpisodes({}, num_processes=4)
+    for runner_config in [{'envs_per_worker': 2}, {'envs_per_worker': 3, 'shared_memory': True}]:
+      results = self.runEpisodes(runner_config, num_processes=4)
+      for res, exp in zip(results, expected):
+        for r, e in zip(res, exp):
+          self.assertEqual(r.shape, e.shape)
+      # Envs in the same worker share the numpy random state so the episodes differ, but the planner should still
+      # complete them
+      self.assertGreater(sum(res[-1].sum() for res in results[1:]), 0)
+
+  def testStepAny(self):
+    for runner_config in [{}, {'envs_per_worker': 2, 'shared_memory': True}]:
+      env = env_factory.createEnvs(4, 'block_stacking', self.env_config, self.planner_config, runner_config)
+      env.reset()
+      with self.assertRaises(ValueError):
+        env.stepWait()
+      env.stepAsync(env.getNextAction(), auto_reset=True)
+      with self.assertRaises(ValueError):
+        env.stepAsync(env.getNextAction(), auto_reset=True, env_nums=[0])
+      with self.assertRaises(ValueError):
+        env.reset_envs([1])
+
+      num_steps = np.zeros(4)
+      while num_steps.sum() < 16:
+        (states_, in_hands_, obs_), rewards, dones, env_nums = env.stepAny()
+        self.assertEqual(obs_.shape[0], len(env_nums))
+        self.assertEqual(rewards.shape[0], len(env_nums))
+        num_steps[env_nums] += 1
+        env.stepAsync(env.getNextAction(env_nums), auto_reset=True, env_nums=env_nums)
+
+      (states_, in_hands_, obs_), rewards, dones = env.stepWait()
+      self.assertEqual(obs_.shape[0], 4)
+      self.assertEqual(env.poll(), [])
+      env.close()
+
+  def testResetAhead(self):
+    expected = self.runEpisodes({})
+    results = self.runEpisodes({'reset_ahead': True})
+    for res, exp in zip(results, expected):
+      for r, e in zip(res, exp):
+        self.assertEqual(r.shape, e.shape)
+    self.assertGreater(sum(res[-1].sum() for res in results[1:]), 0)
+
+    env = env_factory.createEnvs(2, 'block_stacking', self.env_config, self.planner_config, {'reset_ahead': True})
+    env.reset()
+    for _ in range(8):
+      (states_, in_hands_, obs_), rewards, dones = env.step(env.getNextAction())
+      done_idxes = np.nonzero(dones)[0]
+      if done_idxes.shape[0] != 0:
+        states_, in_hands_, obs_ = env.reset_envs(done_idxes)
+        self.assertTrue((states_ == 0).all())
+        self.assertEqual(env.getNumObj(), 3)
+    with self.assertRaises(ValueError):
+      env.save()
+    env.close()
+
+    with self.assertRaises(ValueError):
+      env_factory.createEnvs(2, 'block_stacking', dict(self.env_config, render=True), self.planner_config,
+                             {'reset_ahead': True})
@@ -0,0 +1,41 @@
+import unittest
+import pybullet as pb
+
+from bulletarm import env_factory
+
+class TestObjectPool(unittest.TestCase):
+  env_config = {'num_objects': 3, 'render': False, 'seed': 0, 'object_pool': True}
+  planner_config = {'random_orientation': True}
+
+  def testReuseBodies(self):
+    env = env_factory.createEnvs(0, 'block_stacking', self.env_config, self.planner_config)
+    env.reset()
+    object_ids = sorted(o.object_id for o in env.env.objects)
+    num_bodies = pb.getNumBodies(physicsClientId=env.env.client_id)
+
+    for _ in range(3):
+      env.step(env.getNextAction(), auto_reset=False)
+      env.reset()
+      # block stacking always generates cubes with the same scale, so no new body is needed
+      self.assertEqual(sorted(o.object_id for o in env.env.objects), object_ids)
+      self.assertEqual(pb.getNumBodies(physicsClientId=env.env.client_id), num_bodies)
+      for obj in env.env.objects:
+        self.assertTrue(env.env._isObjectWithinWorkspace(obj))
+
+    for _ in range(4):
+      (states_, in_hands_, obs_), rewards, dones = env.step(env.getNextAction(), auto_reset=False)
+    self.assertEqual(rewards, 1)
+    env.close()
+
+  def testRandomModels(self):
+    env_config = {**self.env_config, 'scene_template': True}
+    env = env_factory.createEnvs(0, 'random_block_picking_clutter', env_config, self.planner_config)
+    env.reset()
+    num_bodies = pb.getNumBodies(physicsClientId=env.env.client_id) - 3
+    for _ in range(20):
+      env.reset()
+      self.assertEqual(len(env.env.objects), 3)
+      # every generated object is either active or parked in the pool
+      self.assertEqual(pb.getNumBodies(physicsClientId=env.env.client_id), num_bodies + len(env.env.object_pool.bodies))
+    self.assertLess(len(env.env.object_pool.bodies), 3 * 21)
+    env.close()
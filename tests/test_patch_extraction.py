@@ -0,0 +1,25 @@
+import unittest
+import numpy as np
+import scipy.ndimage
+import skimage.transform
+
+from bulletarm.pybullet.utils.patch_extraction import PatchExtractor
+
+class TestPatchExtraction(unittest.TestCase):
+  def testCrop(self):
+    extractor = PatchExtractor(24)
+    heightmap = np.random.rand(128, 128)
+    padded = np.pad(heightmap, 12)
+    for x, y in [(0, 0), (5, 127), (64, 64), (128, 100)]:
+      self.assertTrue(np.array_equal(extractor.crop(heightmap, x, y), padded[x:x + 24, y:y + 24]))
+    self.assertFalse(extractor.crop(heightmap, 200, 64).any())
+
+  def testRotate(self):
+    extractor = PatchExtractor(24)
+    image = np.random.rand(24, 24)
+    for angle in [0, 17.3, -100]:
+      self.assertTrue(np.allclose(extractor.rotate(image, angle), skimage.transform.rotate(image, angle)))
+      # python slicing semantics for the computed window
+      expected = scipy.ndimage.rotate(image, angle, reshape=False)[-4:28, 8:16]
+      self.assertTrue(np.allclose(extractor.rotate(image, angle, order=3, rows=slice(-4, 28), cols=slice(8, 16)),
+                                  expected))
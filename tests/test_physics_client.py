@@ -0,0 +1,31 @@
+import unittest
+import numpy as np
+import pybullet as pb
+
+from bulletarm import env_factory
+
+class TestPhysicsClient(unittest.TestCase):
+  env_config = {'num_objects': 3, 'render': False, 'seed': 0}
+  planner_config = {'random_orientation': True}
+
+  def testIsolatedClients(self):
+    env_1 = env_factory.createEnvs(0, 'block_stacking', self.env_config, self.planner_config)
+    states, in_hands, obs = env_1.reset()
+
+    env_2 = env_factory.createEnvs(0, 'block_stacking', self.env_config, self.planner_config)
+    env_2.reset()
+    self.assertNotEqual(env_1.env.client_id, env_2.env.client_id)
+    self.assertEqual(pb.getNumBodies(physicsClientId=env_1.env.client_id),
+                     pb.getNumBodies(physicsClientId=env_2.env.client_id))
+
+    # Stepping the second env must not affect the first one
+    for _ in range(4):
+      env_2.step(env_2.getNextAction())
+    states_, in_hands_, obs_ = env_1.env._getObservation()
+    self.assertTrue(np.allclose(obs, obs_))
+
+    for _ in range(4):
+      (states_, in_hands_, obs_), rewards, dones = env_1.step(env_1.getNextAction())
+    self.assertEqual(rewards, 1)
+    env_1.close()
+    env_2.close()
@@ -0,0 +1,25 @@
+import unittest
+import numpy as np
+
+from bulletarm import env_factory
+
+class TestPoseSnapshot(unittest.TestCase):
+  env_config = {'num_objects': 3, 'render': False, 'seed': 0}
+
+  def testSnapshot(self):
+    env = env_factory.createEnvs(0, 'block_stacking', self.env_config).env
+    env.reset()
+    snapshot = env.getObjectPoseSnapshot()
+    self.assertEqual(snapshot.shape, (3, 7))
+    for obj, pose in zip(env.objects, snapshot):
+      self.assertTrue(np.allclose(sum(obj.getPose(), []), pose))
+    # Cached until the world changes
+    self.assertIs(env.getObjectPoseSnapshot(), snapshot)
+    self.assertTrue(np.allclose(env.getObjectPoseSnapshot(env.objects[::-1]), snapshot[::-1]))
+
+    obj = env.objects[0]
+    obj.resetPose([0.5, 0.1, 0.2], [0, 0, 0, 1])
+    self.assertTrue(np.allclose(env.getObjectPoseSnapshot()[0, :3], [0.5, 0.1, 0.2]))
+    env.wait(50)
+    self.assertTrue(np.allclose(env.getObjectPoseSnapshot()[0], sum(obj.getPose(), [])))
+    self.assertTrue(np.allclose(env.getObjectPositions(), np.array([o.getPosition() for o in env.objects])))
@@ -0,0 +1,77 @@
+import unittest
+import numpy as np
+import scipy.ndimage
+import pybullet as pb
+import pybullet_data
+
+from bulletarm.pybullet.utils.renderer import Renderer
+from bulletarm.pybullet.utils.sensor import Sensor
+
+class TestRenderer(unittest.TestCase):
+  workspace = np.asarray([[0.3, 0.7], [-0.2, 0.2], [0, 0.5]])
+
+  def testRasterizeNearest(self):
+    renderer = Renderer(self.workspace, sensors=[])
+    # two points on the same pixel, the one closest to the camera is kept
+    points = np.array([[0.5, 0., 0.1], [0.5, 0., 0.2], [0.55, 0., 0.]])
+    depth = renderer.rasterizeDepth(points, 16, [0.5, 0., 1.], [-1, 0, 0], [0.5, 0., 0.], 0.4)
+    self.assertEqual(np.count_nonzero(~np.isnan(depth)), 2)
+    self.assertAlmostEqual(np.nanmin(depth), 0.8)
+    self.assertAlmostEqual(np.nanmax(depth), 1.)
+
+  def testRasterizeManyPointsPerPixel(self):
+    renderer = Renderer(self.workspace, sensors=[])
+    size = 8
+    points = np.random.rand(5000, 3) * [0.4, 0.4, 0.3] + [0.3, -0.2, 0]
+    depth = renderer.rasterizeDepth(points, size, [0.5, 0., 1.], [-1, 0, 0], [0.5, 0., 0.], 0.4)
+
+    # brute force: the minimum depth of the points projected to each pixel
+    tran_world_pix = renderer._getWorldToPixelMatrix([0.5, 0., 1.], [-1, 0, 0], [0.5, 0., 0.], 0.4)
+    pts = np.matmul(points, tran_world_pix[:3, :3].T) + tran_world_pix[:3, 3]
+    pix_x = np.round((pts[:, 0] + 1) * size / 2)
+    pix_y = np.round((1 - pts[:, 1]) * size / 2)
+    expected = np.full((size, size), np.nan)
+    for x, y, z in zip(pix_x, pix_y, pts[:, 2]):
+      if 0 <= x < size and 0 < y < size:
+        y, x = int(y), int(x)
+        expected[y, x] = z if np.isnan(expected[y, x]) else min(expected[y, x], z)
+    self.assertGreater(np.count_nonzero(~np.isnan(expected)), size)
+    self.assertTrue(np.allclose(depth, expected, rtol=0, atol=1e-12, equal_nan=True))
+
+  def testHoleFilling(self):
+    depth = np.random.rand(32, 32)
+    holes = np.random.rand(32, 32) < 0.3
+    depth[holes] = np.nan
+    distance = scipy.ndimage.distance_transform_edt(holes)
+    ys, xs = np.nonzero(~holes)
+    for method in ('edt', 'nearest'):
+      filled = Renderer(self.workspace, sensors=[], hole_filling=method).interpolate(depth)
+      self.assertTrue(np.array_equal(filled[~holes], depth[~holes]))
+      # every hole gets the value of one of its nearest valid pixels
+      for y, x in zip(*np.nonzero(holes)):
+        source = (depth[ys, xs] == filled[y, x])
+        self.assertAlmostEqual(np.hypot(ys[source] - y, xs[source] - x).min(), distance[y, x])
+
+  def testIncrementalUpdate(self):
+    client_id = pb.connect(pb.DIRECT)
+    pb.setAdditionalSearchPath(pybullet_data.getDataPath(), physicsClientId=client_id)
+    pb.loadURDF('plane.urdf', physicsClientId=client_id)
+    cube_id = pb.loadURDF('cube_small.urdf', [0.5, 0, 0.025], physicsClientId=client_id)
+    ignored_id = pb.loadURDF('cube_small.urdf', [0.4, 0, 0.025], physicsClientId=client_id)
+    sensor = Sensor([1, 0, 0.6], [-1, 0, 0], [0.5, 0, 0], 0.7, 0.1, 3, client_id=client_id)
+    renderer = Renderer(self.workspace, [sensor], client_id=client_id, incremental=True)
+    renderer.ignore_body_ids = [ignored_id]
+
+    renderer.getTopDownDepth(0.4, 32, [0.5, 0, 0.2], 0)
+    num_points = renderer.points.shape[0]
+    self.assertGreater(num_points, 0)
+    # the points of the ignored body are left out
+    self.assertFalse(np.any(np.all(np.abs(renderer.points - [0.4, 0, 0.025]) < 0.02, 1)))
+
+    pb.resetBasePositionAndOrientation(ignored_id, [0.45, 0, 0.025], [0, 0, 0, 1], physicsClientId=client_id)
+    renderer.updatePoints()
+    self.assertEqual(renderer.points.shape[0], num_points)
+    pb.resetBasePositionAndOrientation(cube_id, [0.55, 0, 0.025], [0, 0, 0, 1], physicsClientId=client_id)
+    renderer.updatePoints()
+    self.assertEqual(renderer.points.shape[0], 0)
+    pb.disconnect(client_id)
@@ -0,0 +1,91 @@
+import unittest
+import numpy as np
+import pybullet as pb
+
+from bulletarm import env_factory
+
+class TestRobotMotion(unittest.TestCase):
+  env_config = {'num_objects': 1, 'render': False, 'seed': 0}
+
+  def testMotionChunk(self):
+    env = env_factory.createEnvs(0, 'block_stacking', self.env_config)
+    env.reset()
+    robot = env.env.robot
+    home = robot._getEndEffectorPosition()
+    rot = robot._getEndEffectorRotation()
+    for motion_chunk in [1, 4]:
+      robot.motion_chunk = motion_chunk
+      target = home + np.array([0.05, 0.05, -0.1])
+      n_it = robot.moveTo(target, rot)
+      self.assertGreater(n_it, 0)
+      self.assertEqual(n_it % motion_chunk, 0)
+      self.assertTrue(np.allclose(robot._getEndEffectorPosition(), target, atol=5e-3))
+      # the arm is already at the target
+      joint_pos = [s[0] for s in pb.getJointStates(robot.id, robot.arm_joint_indices, physicsClientId=robot.client_id)]
+      self.assertEqual(robot.moveToJ(joint_pos), 0)
+      robot.moveTo(home, rot)
+    env.close()
+
+  def testIKCache(self):
+    env = env_factory.createEnvs(0, 'block_stacking', dict(self.env_config, ik_cache_size=8))
+    env.reset()
+    robot = env.env.robot
+    home = robot._getEndEffectorPosition()
+    pos = home + np.array([0.05, 0.05, -0.1])
+    rot = np.array(robot._getEndEffectorRotation())
+    robot.moveTo(pos, rot, dynamic=False)
+    self.assertEqual((robot.ik_cache_hits, robot.ik_cache_misses, len(robot.ik_cache)), (0, 1, 1))
+    miss_iterations = robot.last_ik_iterations
+    self.assertGreater(miss_iterations, 1)
+    self.assertLess(miss_iterations, 10)
+    # -rot is the same orientation
+    robot.moveTo(pos, -rot, dynamic=False)
+    self.assertLess(robot.last_ik_iterations, 10)
+    robot.moveTo(home, rot, dynamic=False)
+    # the cached solution is close to the current joints, the arm moves to it without solving the IK again
+    robot.moveTo(pos, rot, dynamic=False)
+    self.assertEqual(robot.ik_cache_hits, 1)
+    self.assertEqual(robot.last_ik_iterations, 1)
+    self.assertTrue(np.allclose(robot._getEndEffectorPosition(), pos, atol=1e-3))
+    env.close()
+
+  def testKinematicPrimitives(self):
+    env = env_factory.createEnvs(0, 'block_stacking', dict(self.env_config, num_objects=2, simulate_grasp=False,
+                                                           primitive_mode='kinematic'))
+    env.reset()
+    base_env = env.env
+    robot = base_env.robot
+    bottom, top = base_env.objects
+    bottom_pos, top_pos = bottom.getPosition(), top.getPosition()
+    # picking next to an object grasps nothing
+    env.step(np.array([0, top_pos[0] + 0.05, top_pos[1] + 0.05, 0]))
+    self.assertIsNone(robot.holding_obj)
+    env.step(np.array([0, top_pos[0], top_pos[1], 0]))
+    self.assertEqual(robot.holding_obj, top)
+    self.assertIsNotNone(robot.grasp_constraint)
+    env.step(np.array([1, bottom_pos[0], bottom_pos[1], 0]))
+    self.assertIsNone(robot.holding_obj)
+    self.assertIsNone(robot.grasp_constraint)
+    self.assertTrue(base_env._checkOnTop(bottom, top))
+    env.close()
+
+  def testGripperActuation(self):
+    env = env_factory.createEnvs(0, 'block_stacking', self.env_config)
+    env.reset()
+    robot = env.env.robot
+    # the fingers slow down close to the target, so the movement may end by stalling
+    robot.closeGripper()
+    self.assertGreater(robot.last_gripper_steps, 0)
+    self.assertLess(robot.getGripperOpenRatio(), 0.05)
+    robot.gripper_chunk = 4
+    robot.controlGripper(0.5)
+    self.assertEqual(robot.last_gripper_steps % 4, 0)
+    self.assertLess(abs(robot.getGripperOpenRatio() - 0.5), 0.05)
+    # a movement takes at most max_it + 1 steps
+    self.assertFalse(robot.closeGripper(max_it=1))
+    self.assertEqual(robot.last_gripper_steps, 2)
+    robot.gripper_chunk = 1
+    robot.openGripper()
+    self.assertLessEqual(robot.last_gripper_steps, robot.gripper_max_it + 1)
+    self.assertGreater(robot.getGripperOpenRatio(), 0.95)
+    env.close()
@@ -0,0 +1,30 @@
+import unittest
+import numpy as np
+import pybullet as pb
+
+from bulletarm import env_factory
+
+class TestSceneTemplate(unittest.TestCase):
+  env_config = {'num_objects': 3, 'render': False, 'seed': 0, 'scene_template': True}
+  planner_config = {'random_orientation': True}
+
+  def testReset(self):
+    env = env_factory.createEnvs(0, 'block_stacking', self.env_config, self.planner_config)
+    env.reset()
+    template_state = env.env.template_state
+    self.assertIsNotNone(template_state)
+    home_pos = env.env.robot._getEndEffectorPosition()
+
+    for _ in range(3):
+      for _ in range(2):
+        env.step(env.getNextAction(), auto_reset=False)
+      env.reset()
+      self.assertEqual(env.env.template_state, template_state)
+      self.assertEqual(len(env.env.objects), 3)
+      self.assertEqual(pb.getNumBodies(physicsClientId=env.env.client_id), env.env.template_num_bodies + 3)
+      self.assertTrue(np.allclose(env.env.robot._getEndEffectorPosition(), home_pos, atol=1e-3))
+
+    for _ in range(4):
+      (states_, in_hands_, obs_), rewards, dones = env.step(env.getNextAction(), auto_reset=False)
+    self.assertEqual(rewards, 1)
+    env.close()
@@ -0,0 +1,27 @@
+import unittest
+import numpy as np
+import pybullet as pb
+import pybullet_data
+
+from bulletarm.pybullet.utils.sensor import Sensor
+
+class TestSensor(unittest.TestCase):
+  def testCapture(self):
+    client_id = pb.connect(pb.DIRECT)
+    pb.setAdditionalSearchPath(pybullet_data.getDataPath(), physicsClientId=client_id)
+    pb.loadURDF('plane.urdf', physicsClientId=client_id)
+    cube_id = pb.loadURDF('cube_small.urdf', [0.5, 0, 0.025], physicsClientId=client_id)
+    sensor = Sensor([1, 0, 0.6], [-1, 0, 0], [0.5, 0, 0], 0.7, 0.1, 3, client_id=client_id)
+
+    images = sensor.capture(64, ('rgb', 'depth', 'heightmap', 'seg', 'point_cloud'))
+    self.assertEqual(images['rgb'].shape, (3, 64, 64))
+    self.assertTrue(np.array_equal(images['rgb'], sensor.getRGBImg(64)))
+    self.assertTrue(np.array_equal(images['depth'], sensor.getDepthImg(64)))
+    self.assertTrue(np.array_equal(images['heightmap'], sensor.getHeightmap(64)))
+    self.assertTrue(np.allclose(images['point_cloud'], sensor.getPointCloud(64)))
+    self.assertIn(cube_id, images['seg'])
+
+    # the points on the cube lie on its surface
+    points = images['point_cloud'][images['seg'].reshape(-1) == cube_id]
+    self.assertTrue(np.all(np.abs(points - [0.5, 0, 0.025]) < 0.03))
+    pb.disconnect(client_id)
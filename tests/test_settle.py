@@ -0,0 +1,30 @@
+import unittest
+import numpy as np
+import pybullet as pb
+
+from bulletarm import env_factory
+
+class TestSettle(unittest.TestCase):
+  env_config = {'num_objects': 3, 'render': False, 'seed': 0, 'settle_mode': 'adaptive'}
+  planner_config = {'random_orientation': True}
+
+  def testAdaptiveSettle(self):
+    env = env_factory.createEnvs(0, 'block_stacking', self.env_config, self.planner_config)
+    env.reset()
+    # the objects are at rest after the reset, so the first chunk is enough
+    self.assertEqual(env.env.settle(100), env.env.settle_chunk)
+
+    obj = env.env.objects[0]
+    pos = obj.getPosition()
+    pb.resetBasePositionAndOrientation(obj.object_id, [pos[0], pos[1], 0.2], obj.getRotation(),
+                                       physicsClientId=env.env.client_id)
+    num_steps = env.env.settle(100)
+    self.assertGreater(num_steps, env.env.settle_chunk)
+    self.assertLessEqual(num_steps, 100)
+    velocity = np.array(pb.getBaseVelocity(obj.object_id, physicsClientId=env.env.client_id))
+    self.assertTrue(num_steps == 100 or np.all(np.abs(velocity) < env.env.settle_velocity_threshold))
+
+    for _ in range(4):
+      (states_, in_hands_, obs_), rewards, dones = env.step(env.getNextAction(), auto_reset=False)
+    self.assertEqual(rewards, 1)
+    env.close()
@@ -0,0 +1,31 @@
+import unittest
+import numpy as np
+import pybullet as pb
+
+from bulletarm.pybullet.objects.random_block import RandomBlock
+from bulletarm.pybullet.utils import shape_cache
+
+class TestShapeCache(unittest.TestCase):
+  def testSharedShapes(self):
+    client_id = pb.connect(pb.DIRECT)
+    obj_1 = RandomBlock([0, 0, 0], [0, 0, 0, 1], 0.6, client_id=client_id, index=0)
+    obj_2 = RandomBlock([0.2, 0, 0], [0, 0, 0, 1], 0.6, client_id=client_id, index=0)
+    num_shapes = len(shape_cache._mesh_shapes)
+    RandomBlock([0.4, 0, 0], [0, 0, 0, 1], 0.6, client_id=client_id, index=0)
+    self.assertEqual(len(shape_cache._mesh_shapes), num_shapes)
+
+    # Both bodies use the same collision shape but keep their own color
+    aabb_1 = np.array(pb.getAABB(obj_1.object_id, physicsClientId=client_id))
+    aabb_2 = np.array(pb.getAABB(obj_2.object_id, physicsClientId=client_id))
+    self.assertTrue(np.allclose(aabb_1[:, 1:], aabb_2[:, 1:]))
+    color_1 = pb.getVisualShapeData(obj_1.object_id, physicsClientId=client_id)[0][7]
+    color_2 = pb.getVisualShapeData(obj_2.object_id, physicsClientId=client_id)[0][7]
+    self.assertNotEqual(color_1, color_2)
+
+    pb.resetSimulation(physicsClientId=client_id)
+    shape_cache.clearShapeCache(client_id)
+    self.assertFalse(any(key[-1] == client_id for key in shape_cache._mesh_shapes))
+    obj_3 = RandomBlock([0, 0, 0], [0, 0, 0, 1], 0.6, client_id=client_id, index=0)
+    self.assertEqual(pb.getNumBodies(physicsClientId=client_id), 1)
+    self.assertTrue(np.allclose(np.array(pb.getAABB(obj_3.object_id, physicsClientId=client_id))[:, 1:], aabb_1[:, 1:]))
+    pb.disconnect(client_id)
@@ -0,0 +1,42 @@
+import unittest
+import numpy as np
+import numpy.random as npr
+
+from bulletarm import env_factory
+from bulletarm.pybullet.utils.constants import NoValidPositionException
+
+class TestValidPositions(unittest.TestCase):
+  env_config = {'num_objects': 3, 'render': False, 'seed': 0}
+
+  def testConstraints(self):
+    env = env_factory.createEnvs(0, 'block_stacking', self.env_config).env
+    workspace = env.getValidSpace()
+    existing = [[workspace[0].mean(), workspace[1].mean()]]
+    for _ in range(50):
+      positions = env._getValidPositions(0.1, 0.08, existing, 4)
+      self.assertEqual(len(positions), 4)
+      points = np.array(existing + positions)
+      distances = np.linalg.norm(points[:, None] - points[None], axis=2)
+      self.assertTrue(np.all(distances[~np.eye(len(points), dtype=bool)] > 0.08))
+      self.assertTrue(np.all(points[1:, 0] >= workspace[0][0] + 0.05) and np.all(points[1:, 0] <= workspace[0][1] - 0.05))
+      self.assertTrue(np.all(points[1:, 1] >= workspace[1][0] + 0.05) and np.all(points[1:, 1] <= workspace[1][1] - 0.05))
+
+    sample_range = [[existing[0][0] - 0.01, existing[0][0] + 0.01], [workspace[1][0], workspace[1][1]]]
+    for position in env._getValidPositions(0.1, 0.08, existing, 2, sample_range=sample_range):
+      self.assertTrue(existing[0][0] - 0.01 <= position[0] <= existing[0][0] + 0.01)
+
+    with self.assertRaises(NoValidPositionException):
+      env._getValidPositions(0.1, 1, existing, 1)
+
+  def testRandomState(self):
+    # Only the random draws of the accepted candidate are consumed
+    env = env_factory.createEnvs(0, 'block_stacking', self.env_config).env
+    workspace = env.getValidSpace()
+    npr.seed(1)
+    position = env._getValidPositions(0.1, 0, [], 1)[0]
+    next_sample = npr.random_sample()
+    npr.seed(1)
+    samples = npr.random_sample(3)
+    self.assertAlmostEqual(position[0], (workspace[0][1] - workspace[0][0] - 0.1) * samples[0] + workspace[0][0] + 0.05)
+    self.assertAlmostEqual(position[1], (workspace[1][1] - workspace[1][0] - 0.1) * samples[1] + workspace[1][0] + 0.05)
+    self.assertEqual(next_sample, samples[2])
@@ -0,0 +1,34 @@
+import time
+import numpy as np
+from bulletarm import env_factory
+
+def benchmarkHoleFilling(obs_sizes=(128, 256), num_frames=50):
+  '''
+  Measure the per-frame cost of the hole filling methods of the Renderer on the render_center observations of a
+  cluttered scene.
+  '''
+  for obs_size in obs_sizes:
+    env_config = {'render': False, 'view_type': 'render_center', 'obs_size': obs_size, 'num_objects': 5}
+    env = env_factory.createEnvs(0, 'close_loop_clutter_picking', env_config)
+    env.reset()
+    renderer = env.env.renderer
+    gripper_pos = env.env.robot._getEndEffectorPosition()
+    renderer.getNewPointCloud(512)
+    depths = list()
+    for i in range(num_frames):
+      # jitter the view to get different holes in every frame
+      pos = gripper_pos + np.random.uniform(-0.02, 0.02, 3)
+      depths.append(renderer.rasterizeDepth(renderer.points, obs_size, pos, [-1, 0, 0], [pos[0], pos[1], 0],
+                                            env.env.obs_size_m))
+    holes = np.mean([np.isnan(d).mean() for d in depths])
+    print('obs size {}, {:.1%} holes'.format(obs_size, holes))
+    for method in ('nearest', 'edt'):
+      renderer.hole_filling = method
+      t0 = time.time()
+      for depth in depths:
+        renderer.interpolate(depth)
+      print('  {:8s} {:.2f} ms/frame'.format(method, (time.time() - t0) / num_frames * 1000))
+    env.close()
+
+if __name__ == '__main__':
+  benchmarkHoleFilling()